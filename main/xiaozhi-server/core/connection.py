@@ -40,6 +40,13 @@ from config.logger import setup_logging, build_module_string, create_connection_
 from config.manage_api_client import DeviceNotFoundException, DeviceBindException
 from core.utils.prompt_manager import PromptManager
 from core.utils.voiceprint_provider import VoiceprintProvider
+from core.utils.pcm_ring_buffer import PCMRingBuffer
+from core.utils.mqtt_audio_header import parse_mqtt_audio_header
+from core.utils.jitter_buffer import AudioJitterBuffer
+from core.utils.cancel_token import CancellationToken
+from core.utils.filler_audio import FillerAudio
+from core.utils.write_backpressure import WriteBackpressure
+from core.handle.sendAudioHandle import get_write_outstanding
 from core.utils.util import get_system_error_response
 from core.utils import textUtils
 
@@ -91,6 +98,10 @@ class ConnectionHandler:
 
         # 客户端状态相关
         self.client_abort = False
+        # 当前轮对话的取消令牌，打断时取消并换新
+        self.turn_token = CancellationToken()
+        # 首句等待提示音状态与统计
+        self.filler_audio = FillerAudio()
         self.client_is_speaking = False
         self.client_listen_mode = "auto"
 
@@ -120,19 +131,26 @@ class ConnectionHandler:
         self.voiceprint_provider = None
 
         # vad相关变量
-        self.client_audio_buffer = bytearray()
+        self.client_audio_buffer = PCMRingBuffer()
         self.client_have_voice = False
         self.client_voice_window = deque(maxlen=5)
         self.first_activity_time = 0.0  # 记录首次活动的时间（毫秒）
         self.last_activity_time = 0.0  # 统一的活动时间戳（毫秒）
         self.client_voice_stop = False
         self.last_is_voice = False
+        # VAD使用的Opus解码器，每个连接独立持有，首次收到音频时由VAD创建
+        self.vad_decoder = None
+        # VAD模型的循环状态，每个连接独立，由VAD在推理时读写
+        self.vad_model_state = None
 
         # asr相关变量
         # 因为实际部署时可能会用到公共的本地ASR，不能把变量暴露给公共ASR
         # 所以涉及到ASR的变量，需要在这里定义，属于connection的私有变量
         self.asr_audio = []
-        self.asr_audio_queue = queue.Queue()
+        self.asr_audio_queue = asyncio.Queue()
+        self.asr_priority_task = None
+        # 带时间戳音频包（MQTT网关）的抖动缓冲
+        self.audio_jitter_buffer = AudioJitterBuffer()
         self.current_speaker = None  # 存储当前说话人
         self.current_language_tag = None  # 存储当前ASR识别的语言标签
 
@@ -162,9 +180,23 @@ class ConnectionHandler:
 
         # {"mcp":true} 表示启用MCP功能
         self.features = None
+        # 客户端在hello的features中声明audio_bundle后，多个音频包合并为一帧发送
+        self.audio_bundle_enabled = False
 
         # 标记连接是否来自MQTT
         self.conn_from_mqtt_gateway = False
+        # MQTT网关音频包头部打包器，首次发送音频时创建
+        self.mqtt_audio_packer = None
+        # 下行链路抖动估计，决定每句的预缓冲包数，首次发送音频时创建
+        self.delivery_jitter = None
+        # 下行写缓冲背压，慢速设备积压过多时暂停TTS
+        backpressure_config = self.config.get("tts_write_backpressure", {})
+        self.write_backpressure = WriteBackpressure(
+            high_water=int(backpressure_config.get("high_water_kb", 96)) * 1024,
+            low_water=int(backpressure_config.get("low_water_kb", 32)) * 1024,
+            # 暂停期间没有新的发送时，定时检查写缓冲是否已排空
+            probe=lambda: get_write_outstanding(self),
+        )
 
         # 初始化提示词管理器
         self.prompt_manager = PromptManager(self.config, self.logger)
@@ -321,7 +353,7 @@ class ConnectionHandler:
                     return
 
             # 不需要头部处理或没有头部时，直接处理原始消息
-            self.asr_audio_queue.put(message)
+            self.asr_audio_queue.put_nowait(message)
 
     async def _process_mqtt_audio_message(self, message):
         """
@@ -334,13 +366,12 @@ class ConnectionHandler:
             bool: 是否成功处理了消息
         """
         try:
-            # 提取头部信息
-            timestamp = int.from_bytes(message[8:12], "big")
-            audio_length = int.from_bytes(message[12:16], "big")
+            # 提取头部信息，直接在原消息上解析，不切片
+            timestamp, audio_length = parse_mqtt_audio_header(message)
 
             # 提取音频数据
             if audio_length > 0 and len(message) >= 16 + audio_length:
-                # 有指定长度，提取精确的音频数据
+                # 有指定长度，提取精确的音频数据（opus解码需要bytes，保留这一次切片）
                 audio_data = message[16 : 16 + audio_length]
                 # 基于时间戳进行排序处理
                 self._process_websocket_audio(audio_data, timestamp)
@@ -348,7 +379,7 @@ class ConnectionHandler:
             elif len(message) > 16:
                 # 没有指定长度或长度无效，去掉头部后处理剩余数据
                 audio_data = message[16:]
-                self.asr_audio_queue.put(audio_data)
+                self.asr_audio_queue.put_nowait(audio_data)
                 return True
         except Exception as e:
             self.logger.bind(tag=TAG).error(f"解析WebSocket音频包失败: {e}")
@@ -357,35 +388,9 @@ class ConnectionHandler:
         return False
 
     def _process_websocket_audio(self, audio_data, timestamp):
-        """处理WebSocket格式的音频包"""
-        # 初始化时间戳序列管理
-        if not hasattr(self, "audio_timestamp_buffer"):
-            self.audio_timestamp_buffer = {}
-            self.last_processed_timestamp = 0
-            self.max_timestamp_buffer_size = 20
-
-        # 如果时间戳是递增的，直接处理
-        if timestamp >= self.last_processed_timestamp:
-            self.asr_audio_queue.put(audio_data)
-            self.last_processed_timestamp = timestamp
-
-            # 处理缓冲区中的后续包
-            processed_any = True
-            while processed_any:
-                processed_any = False
-                for ts in sorted(self.audio_timestamp_buffer.keys()):
-                    if ts > self.last_processed_timestamp:
-                        buffered_audio = self.audio_timestamp_buffer.pop(ts)
-                        self.asr_audio_queue.put(buffered_audio)
-                        self.last_processed_timestamp = ts
-                        processed_any = True
-                        break
-        else:
-            # 乱序包，暂存
-            if len(self.audio_timestamp_buffer) < self.max_timestamp_buffer_size:
-                self.audio_timestamp_buffer[timestamp] = audio_data
-            else:
-                self.asr_audio_queue.put(audio_data)
+        """处理WebSocket格式的音频包，经抖动缓冲按时间戳顺序送入ASR队列"""
+        for audio in self.audio_jitter_buffer.push(timestamp, audio_data):
+            self.asr_audio_queue.put_nowait(audio)
 
     async def handle_restart(self, message):
         """处理服务器重启请求"""
@@ -837,6 +842,8 @@ class ConnectionHandler:
         ):
             functions = self.func_handler.get_functions()
         response_message = []
+        # 本轮对话的取消令牌，打断时关闭LLM流式响应
+        turn_token = self.turn_token
 
         try:
             # 使用带记忆的对话
@@ -856,6 +863,7 @@ class ConnectionHandler:
                         memory_str, self.config.get("voiceprint", {})
                     ),
                     functions=functions,
+                    cancel_token=turn_token,
                 )
             else:
                 llm_responses = self.llm.response(
@@ -863,6 +871,7 @@ class ConnectionHandler:
                     self.dialogue.get_llm_dialogue_with_memory(
                         memory_str, self.config.get("voiceprint", {})
                     ),
+                    cancel_token=turn_token,
                 )
         except Exception as e:
             self.logger.bind(tag=TAG).error(f"LLM 处理出错 {query}: {e}")
@@ -877,7 +886,9 @@ class ConnectionHandler:
         emotion_flag = True
         try:
             for response in llm_responses:
-                if self.client_abort:
+                if self.client_abort or turn_token.cancelled:
+                    # 关闭生成器，让LLM提供者立即释放上游流式连接
+                    llm_responses.close()
                     break
                 if self.intent_type == "function_call" and functions is not None:
                     content, tools_call = response
@@ -1145,6 +1156,29 @@ class ConnectionHandler:
             if self.stop_event:
                 self.stop_event.set()
 
+            # 关闭仍在进行的LLM和TTS上游请求
+            self.cancel_turn()
+
+            # 停止音频播放和音频识别任务
+            if self.tts:
+                self.tts.close_audio_channels()
+            if self.asr:
+                self.asr.close_audio_channels(self)
+
+            # 输出上行音频的网络质量统计
+            if self.audio_jitter_buffer.packets > 0:
+                self.logger.bind(tag=TAG).info(
+                    f"上行音频抖动缓冲统计: {self.audio_jitter_buffer.get_metrics()}"
+                )
+            if self.filler_audio.turns > 0:
+                self.logger.bind(tag=TAG).info(
+                    f"首句等待提示音统计: {self.filler_audio.get_metrics()}"
+                )
+            if self.tts and self.tts.tts_cache:
+                self.logger.bind(tag=TAG).info(
+                    f"TTS音频缓存统计: {self.tts.tts_cache.get_metrics()}"
+                )
+
             # 清空任务队列
             self.clear_queues()
 
@@ -1188,6 +1222,8 @@ class ConnectionHandler:
                 await self.tts.close()
             if self.asr:
                 await self.asr.close()
+            if self.vad:
+                self.vad.release_conn_resources(self)
 
             # 最后关闭线程池（避免阻塞）
             if self.executor:
@@ -1206,6 +1242,12 @@ class ConnectionHandler:
             if self.stop_event:
                 self.stop_event.set()
 
+    def cancel_turn(self):
+        """打断当前轮对话：取消令牌（关闭LLM流式响应、中止TTS上游请求），后续对话使用新令牌"""
+        turn_token = self.turn_token
+        self.turn_token = CancellationToken()
+        turn_token.cancel()
+
     def clear_queues(self):
         """清空所有任务队列"""
         if self.tts:
@@ -1232,6 +1274,9 @@ class ConnectionHandler:
                 self.audio_rate_controller.reset()
                 self.logger.bind(tag=TAG).debug("已重置音频流控器")
 
+            # 积压的音频已丢弃，解除背压
+            self.write_backpressure.release()
+
             self.logger.bind(tag=TAG).debug(
                 f"清理结束: TTS队列大小={self.tts.tts_text_queue.qsize()}, 音频队列大小={self.tts.tts_audio_queue.qsize()}"
             )
@@ -10,6 +10,8 @@ async def handleAbortMessage(conn: "ConnectionHandler"):
     conn.logger.bind(tag=TAG).info("Abort message received")
     # 设置成打断状态，会自动打断llm、tts任务
     conn.client_abort = True
+    # 立即关闭LLM流式响应和TTS上游请求，不等它们处理下一个数据块
+    conn.cancel_turn()
     conn.clear_queues()
     # 打断客户端说话状态
     await conn.websocket.send(
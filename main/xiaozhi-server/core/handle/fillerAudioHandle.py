@@ -0,0 +1,55 @@
+import random
+import asyncio
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from core.connection import ConnectionHandler
+from core.providers.tts.dto.dto import SentenceType
+from core.utils.filler_audio import filler_audio_cache
+from core.handle.sendAudioHandle import sendAudioMessage, AUDIO_FRAME_DURATION
+
+TAG = __name__
+
+
+def schedule_filler_audio(conn: "ConnectionHandler"):
+    """开始对话时调用：超过阈值仍没有首句语音时播放预编码的应答音"""
+    filler_config = conn.config.get("filler_audio", {})
+    if not filler_config.get("enable", False):
+        return
+    files = filler_config.get("files") or []
+    if not files:
+        return
+    threshold_ms = int(filler_config.get("threshold_ms", 800))
+    turn = conn.filler_audio.start_turn()
+    conn.filler_audio.task = asyncio.create_task(
+        _play_filler_audio(conn, turn, conn.turn_token, files, threshold_ms)
+    )
+
+
+async def _play_filler_audio(conn: "ConnectionHandler", turn, turn_token, files, threshold_ms):
+    filler_audio = conn.filler_audio
+    # 编码（仅首次）与等待同时进行
+    clips_future = asyncio.ensure_future(filler_audio_cache.get(files))
+    await asyncio.sleep(threshold_ms / 1000)
+    clips = await clips_future
+    if (
+        not clips
+        or not filler_audio.should_fire(turn)
+        or conn.client_abort
+        or turn_token.cancelled
+    ):
+        return
+
+    conn.logger.bind(tag=TAG).info(f"首句语音超过{threshold_ms}ms未到达，播放等待提示音")
+    filler_audio.on_filler_start()
+    try:
+        for packet in random.choice(clips):
+            # 真实语音到达或被打断时立即停止，不再送入任何提示音数据
+            if not filler_audio.should_fire(turn) or conn.client_abort:
+                break
+            await sendAudioMessage(conn, SentenceType.MIDDLE, packet, None)
+            # 按实时速度逐包送入，真实语音到达时流控队列中最多只剩一个提示音包
+            await asyncio.sleep(AUDIO_FRAME_DURATION / 1000)
+    finally:
+        filler_audio.on_filler_end()
+
@@ -56,8 +56,16 @@ async def handleHelloMessage(conn: "ConnectionHandler", msg_json):
             conn.mcp_client = MCPClient()
             # 发送初始化
             asyncio.create_task(send_mcp_initialize_message(conn))
-
-    await conn.websocket.send(json.dumps(conn.welcome_msg))
+        # MQTT网关有自己的音频帧格式，不支持合并发送
+        if features.get("audio_bundle") and not conn.conn_from_mqtt_gateway:
+            conn.logger.bind(tag=TAG).debug("客户端支持音频包合并发送")
+            conn.audio_bundle_enabled = True
+
+    welcome_msg = conn.welcome_msg
+    if conn.audio_bundle_enabled:
+        # 告知客户端服务端已启用合并发送（welcome_msg为共享配置，不直接修改）
+        welcome_msg = dict(welcome_msg, features={"audio_bundle": True})
+    await conn.websocket.send(json.dumps(welcome_msg))
 
 
 async def checkWakeupWords(conn: "ConnectionHandler", text):
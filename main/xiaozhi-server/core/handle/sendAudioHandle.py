@@ -9,15 +9,18 @@ from core.utils import textUtils
 from core.utils.util import audio_to_data
 from core.providers.tts.dto.dto import SentenceType
 from core.utils.audioRateController import AudioRateController
+from core.utils.mqtt_audio_header import MQTTAudioPacker
+from core.utils.delivery_jitter import DeliveryJitterEstimator
 
 TAG = __name__
 # 音频帧时长（毫秒）
 AUDIO_FRAME_DURATION = 60
-# 预缓冲包数量，直接发送以减少延迟
+# 默认预缓冲包数量，直接发送以减少延迟；测得链路抖动后按连接动态调整
 PRE_BUFFER_COUNT = 5
 
 
 async def sendAudioMessage(conn: "ConnectionHandler", sentenceType, audios, text):
+    _stop_filler_audio(conn)
     if conn.tts.tts_audio_first_sentence:
         conn.logger.bind(tag=TAG).info(f"发送第一段语音: {text}")
         conn.tts.tts_audio_first_sentence = False
@@ -51,6 +54,16 @@ async def sendAudioMessage(conn: "ConnectionHandler", sentenceType, audios, text
             await conn.close()
 
 
+def _stop_filler_audio(conn: "ConnectionHandler"):
+    """真实语音或句子消息到达，结束本轮首句等待提示音（提示音自身的发送除外）"""
+    filler_audio = getattr(conn, "filler_audio", None)
+    if filler_audio is None or not filler_audio.waiting:
+        return
+    if asyncio.current_task() is filler_audio.task:
+        return
+    filler_audio.on_real_audio()
+
+
 async def _wait_for_audio_completion(conn: "ConnectionHandler"):
     """
     等待音频队列清空并等待预缓冲包播放完成
@@ -68,7 +81,10 @@ async def _wait_for_audio_completion(conn: "ConnectionHandler"):
         # 等待预缓冲包播放完成
         # 前N个包直接发送，增加2个网络抖动包，需要额外等待它们在客户端播放完成
         frame_duration_ms = rate_controller.frame_duration
-        pre_buffer_playback_time = (PRE_BUFFER_COUNT + 2) * frame_duration_ms / 1000.0
+        pre_buffer_count = getattr(conn, "audio_flow_control", {}).get(
+            "pre_buffer_count", PRE_BUFFER_COUNT
+        )
+        pre_buffer_playback_time = (pre_buffer_count + 2) * frame_duration_ms / 1000.0
         await asyncio.sleep(pre_buffer_playback_time)
 
         conn.logger.bind(tag=TAG).debug("音频发送完成")
@@ -85,16 +101,12 @@ async def _send_to_mqtt_gateway(
         timestamp: 时间戳
         sequence: 序列号
     """
-    # 为opus数据包添加16字节头部
-    header = bytearray(16)
-    header[0] = 1  # type
-    header[2:4] = len(opus_packet).to_bytes(2, "big")  # payload length
-    header[4:8] = sequence.to_bytes(4, "big")  # sequence
-    header[8:12] = timestamp.to_bytes(4, "big")  # 时间戳
-    header[12:16] = len(opus_packet).to_bytes(4, "big")  # opus长度
+    # 为opus数据包添加16字节头部，复用连接自己的缓冲区
+    if conn.mqtt_audio_packer is None:
+        conn.mqtt_audio_packer = MQTTAudioPacker()
+    complete_packet = conn.mqtt_audio_packer.pack(opus_packet, sequence, timestamp)
 
     # 发送包含头部的完整数据包
-    complete_packet = bytes(header) + opus_packet
     await conn.websocket.send(complete_packet)
 
 
@@ -152,11 +164,8 @@ def _get_or_create_rate_controller(
     else:
         rate_controller = conn.audio_rate_controller
 
-        # 后台发送任务已停止, 则需要重置
-        if (
-            not rate_controller.pending_send_task
-            or rate_controller.pending_send_task.done()
-        ):
+        # 发送已停止（发送失败或被中止）, 则需要重置
+        if not rate_controller.is_sending():
             need_reset = True
         # 当sentence_id 变化，需要重置
         elif (
@@ -172,14 +181,19 @@ def _get_or_create_rate_controller(
         else:
             conn.audio_rate_controller.reset()
 
+        # 按连接的链路抖动确定本句的预缓冲包数，并在后台更新链路估计
+        delivery_jitter = _get_or_create_delivery_jitter(conn, frame_duration)
+        delivery_jitter.maybe_probe(conn.websocket)
+
         # 初始化 flow_control
         conn.audio_flow_control = {
             "packet_count": 0,
             "sequence": 0,
             "sentence_id": conn.sentence_id,
+            "pre_buffer_count": delivery_jitter.pre_buffer_count(),
         }
 
-        # 启动后台发送循环
+        # 启动发送，由共享调度器按时驱动
         _start_background_sender(
             conn, conn.audio_rate_controller, conn.audio_flow_control
         )
@@ -187,9 +201,22 @@ def _get_or_create_rate_controller(
     return conn.audio_rate_controller, conn.audio_flow_control
 
 
+def _get_or_create_delivery_jitter(conn: "ConnectionHandler", frame_duration):
+    """获取或创建连接的链路抖动估计器，预缓冲包数范围来自配置 tts_pre_buffer"""
+    if getattr(conn, "delivery_jitter", None) is None:
+        pre_buffer_config = conn.config.get("tts_pre_buffer", {})
+        conn.delivery_jitter = DeliveryJitterEstimator(
+            frame_duration=frame_duration,
+            default_count=int(pre_buffer_config.get("default", PRE_BUFFER_COUNT)),
+            min_count=int(pre_buffer_config.get("min", 2)),
+            max_count=int(pre_buffer_config.get("max", 10)),
+        )
+    return conn.delivery_jitter
+
+
 def _start_background_sender(conn: "ConnectionHandler", rate_controller, flow_control):
     """
-    启动后台发送循环任务
+    启动音频发送，队列中的音频包由共享调度器按时发送
 
     Args:
         conn: 连接对象
@@ -205,9 +232,18 @@ def _start_background_sender(conn: "ConnectionHandler", rate_controller, flow_co
         conn.last_activity_time = time.time() * 1000
         await _do_send_audio(conn, packet, flow_control)
         conn.client_is_speaking = True
+        update_write_backpressure(conn)
+
+    async def send_bundle_callback(packets):
+        if conn.client_abort:
+            raise asyncio.CancelledError("客户端已中止")
+
+        conn.last_activity_time = time.time() * 1000
+        await _do_send_audio_bundle(conn, packets, flow_control)
+        conn.client_is_speaking = True
+        update_write_backpressure(conn)
 
-    # 使用 start_sending 启动后台循环
-    rate_controller.start_sending(send_callback)
+    rate_controller.start_sending(send_callback, send_bundle_callback)
 
 
 async def _send_audio_with_rate_control(
@@ -223,25 +259,74 @@ async def _send_audio_with_rate_control(
         flow_control: 流控状态
         send_delay: 固定延迟（秒），-1表示使用动态流控
     """
+    pre_buffer = []
+    pre_buffer_count = flow_control.get("pre_buffer_count", PRE_BUFFER_COUNT)
     for packet in audio_list:
         if conn.client_abort:
             return
 
         conn.last_activity_time = time.time() * 1000
 
-        # 预缓冲：前N个包直接发送
-        if flow_control["packet_count"] < PRE_BUFFER_COUNT:
-            await _do_send_audio(conn, packet, flow_control)
+        # 预缓冲：前N个包直接发送，攒齐后一次发出
+        if flow_control["packet_count"] + len(pre_buffer) < pre_buffer_count:
+            pre_buffer.append(packet)
+            continue
+        if pre_buffer:
+            await _do_send_audio_bundle(conn, pre_buffer, flow_control)
             conn.client_is_speaking = True
-        elif send_delay > 0:
+            pre_buffer = []
+
+        if send_delay > 0:
             # 固定延迟模式
             await asyncio.sleep(send_delay)
             await _do_send_audio(conn, packet, flow_control)
             conn.client_is_speaking = True
         else:
-            # 动态流控模式：仅添加到队列，由后台循环负责发送
+            # 动态流控模式：仅添加到队列，由共享调度器负责按时发送
             rate_controller.add_audio(packet)
 
+    if pre_buffer and not conn.client_abort:
+        await _do_send_audio_bundle(conn, pre_buffer, flow_control)
+        conn.client_is_speaking = True
+
+    update_write_backpressure(conn)
+
+
+def update_write_backpressure(conn: "ConnectionHandler"):
+    """按流控队列和websocket写缓冲中未发送的字节数更新背压状态"""
+    write_backpressure = getattr(conn, "write_backpressure", None)
+    if write_backpressure is None:
+        return
+    write_backpressure.update(get_write_outstanding(conn))
+
+
+def get_write_outstanding(conn: "ConnectionHandler"):
+    """流控队列和websocket写缓冲中未发送的字节数"""
+    outstanding = 0
+    rate_controller = getattr(conn, "audio_rate_controller", None)
+    if rate_controller:
+        outstanding += rate_controller.queued_bytes
+    transport = getattr(conn.websocket, "transport", None)
+    if transport is not None:
+        outstanding += transport.get_write_buffer_size()
+    return outstanding
+
+
+def _pack_audio_bundle(opus_packets):
+    """多个opus包打包为一帧：每个包前加2字节大端长度"""
+    bundle = bytearray()
+    for opus_packet in opus_packets:
+        bundle += len(opus_packet).to_bytes(2, "big")
+        bundle += opus_packet
+    return bundle
+
+
+def _record_send_stall(conn: "ConnectionHandler", send_start):
+    """记录发送耗时，写缓冲积压时send会等待排空"""
+    delivery_jitter = getattr(conn, "delivery_jitter", None)
+    if delivery_jitter is not None:
+        delivery_jitter.add_send_stall(time.perf_counter() - send_start)
+
 
 async def _do_send_audio(conn: "ConnectionHandler", opus_packet, flow_control):
     """
@@ -250,20 +335,43 @@ async def _do_send_audio(conn: "ConnectionHandler", opus_packet, flow_control):
     packet_index = flow_control.get("packet_count", 0)
     sequence = flow_control.get("sequence", 0)
 
+    send_start = time.perf_counter()
     if conn.conn_from_mqtt_gateway:
         # 计算时间戳（基于播放位置）
         start_time = time.time()
         timestamp = int(start_time * 1000) % (2**32)
         await _send_to_mqtt_gateway(conn, opus_packet, timestamp, sequence)
+    elif conn.audio_bundle_enabled:
+        # 已协商合并发送，单个包也使用带长度前缀的格式
+        await conn.websocket.send(_pack_audio_bundle([opus_packet]))
     else:
         # 直接发送opus数据包
         await conn.websocket.send(opus_packet)
+    _record_send_stall(conn, send_start)
 
     # 更新流控状态
     flow_control["packet_count"] = packet_index + 1
     flow_control["sequence"] = sequence + 1
 
 
+async def _do_send_audio_bundle(conn: "ConnectionHandler", opus_packets, flow_control):
+    """
+    发送多个连续的音频包，已协商合并发送时只发一帧，否则逐包发送
+    """
+    if len(opus_packets) == 1 or not conn.audio_bundle_enabled:
+        for opus_packet in opus_packets:
+            await _do_send_audio(conn, opus_packet, flow_control)
+        return
+
+    send_start = time.perf_counter()
+    await conn.websocket.send(_pack_audio_bundle(opus_packets))
+    _record_send_stall(conn, send_start)
+
+    # 更新流控状态
+    flow_control["packet_count"] = flow_control.get("packet_count", 0) + len(opus_packets)
+    flow_control["sequence"] = flow_control.get("sequence", 0) + len(opus_packets)
+
+
 async def send_tts_message(conn: "ConnectionHandler", state, text=None):
     """发送 TTS 状态消息"""
     if text is None and state == "sentence_start":
@@ -4,13 +4,9 @@ import wave
 import uuid
 import json
 import time
-import queue
-import shutil
 import asyncio
 import tempfile
 import traceback
-import threading
-import opuslib_next
 
 from abc import ABC, abstractmethod
 from config.logger import setup_logging
@@ -18,6 +14,8 @@ from core.providers.asr.dto.dto import InterfaceType
 from core.handle.receiveAudioHandle import startToChat
 from core.handle.reportHandle import enqueue_asr_report
 from core.utils.util import remove_punctuation_and_length
+from core.utils.disk_watchdog import disk_space_watchdog
+from core.utils.opus_decoder_pool import decode_opus_packets
 from core.handle.receiveAudioHandle import handleAudioMessage
 from typing import Optional, Tuple, List, NamedTuple, TYPE_CHECKING
 
@@ -35,23 +33,28 @@ class ASRProviderBase(ABC):
 
     # 打开音频通道
     async def open_audio_channels(self, conn: "ConnectionHandler"):
-        conn.asr_priority_thread = threading.Thread(
-            target=self.asr_text_priority_thread, args=(conn,), daemon=True
+        # 音频由 _route_message 直接放入队列，在连接的事件循环中按顺序处理
+        conn.asr_priority_task = conn.loop.create_task(
+            self.asr_text_priority_task(conn)
         )
-        conn.asr_priority_thread.start()
+
+    # 关闭音频通道
+    def close_audio_channels(self, conn: "ConnectionHandler"):
+        task = conn.asr_priority_task
+        conn.asr_priority_task = None
+        # 处理音频时触发关闭连接的情况下不能取消自己，由stop_event结束循环
+        if task and not task.done() and task is not asyncio.current_task():
+            task.cancel()
 
     # 有序处理ASR音频
-    def asr_text_priority_thread(self, conn: "ConnectionHandler"):
+    async def asr_text_priority_task(self, conn: "ConnectionHandler"):
         while not conn.stop_event.is_set():
             try:
-                message = conn.asr_audio_queue.get(timeout=1)
-                future = asyncio.run_coroutine_threadsafe(
-                    handleAudioMessage(conn, message),
-                    conn.loop,
-                )
-                future.result()
-            except queue.Empty:
-                continue
+                message = await conn.asr_audio_queue.get()
+                await handleAudioMessage(conn, message)
+            except asyncio.CancelledError:
+                logger.bind(tag=TAG).debug("ASR音频处理任务已停止")
+                break
             except Exception as e:
                 logger.bind(tag=TAG).error(
                     f"处理ASR文本失败: {str(e)}, 类型: {type(e).__name__}, 堆栈: {traceback.format_exc()}"
@@ -229,6 +232,8 @@ class ASRProviderBase(ABC):
         """WAV文件路径"""
         temp_path: Optional[str]
         """临时WAV文件路径"""
+        wav_bytes: Optional[bytes] = None
+        """内存中的WAV数据，仅在accepts_wav_bytes()为True时生成"""
 
     def get_current_artifacts(self) -> Optional["ASRProviderBase.AudioArtifacts"]:
         return self._current_artifacts
@@ -241,6 +246,21 @@ class ASRProviderBase(ABC):
         """是否优先使用临时文件"""
         return False
 
+    def accepts_wav_bytes(self) -> bool:
+        """是否支持直接使用内存中的WAV数据，支持时无需写入任何文件"""
+        return False
+
+    @staticmethod
+    def build_wav_bytes(pcm_bytes: bytes) -> bytes:
+        """PCM数据在内存中封装为WAV格式"""
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(16000)
+            wav_file.writeframes(pcm_bytes)
+        return buffer.getvalue()
+
     def build_temp_file(self, pcm_bytes: bytes) -> Optional[str]:
         try:
             with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
@@ -281,18 +301,27 @@ class ASRProviderBase(ABC):
                 pcm_data = self.decode_opus(opus_data)
             combined_pcm_data = b"".join(pcm_data)
 
-            free_space = shutil.disk_usage(self.output_dir).free
-            if free_space < len(combined_pcm_data) * 2:
-                raise OSError("磁盘空间不足")
+            need_temp_file = self.requires_file() and self.prefers_temp_file()
+            need_file = (
+                hasattr(self, "delete_audio_file") and not self.delete_audio_file
+            ) or (self.requires_file() and not self.prefers_temp_file())
 
-            if self.requires_file() and self.prefers_temp_file():
+            # 只有需要落盘时才检查磁盘空间，剩余空间由后台线程定期刷新
+            if need_temp_file or need_file:
+                free_space = disk_space_watchdog.get_free(self.output_dir)
+                if free_space < len(combined_pcm_data) * 2:
+                    raise OSError("磁盘空间不足")
+
+            if need_temp_file:
                 temp_path = self.build_temp_file(combined_pcm_data)
 
-            if (hasattr(self, "delete_audio_file") and not self.delete_audio_file) or (
-                self.requires_file() and not self.prefers_temp_file()
-            ):
+            if need_file:
                 file_path = self.save_audio_to_file(pcm_data, session_id)
 
+            wav_bytes = None
+            if self.accepts_wav_bytes():
+                wav_bytes = self.build_wav_bytes(combined_pcm_data)
+
             if len(combined_pcm_data) == 0:
                 artifacts = None
             else:
@@ -301,6 +330,7 @@ class ASRProviderBase(ABC):
                     pcm_bytes=combined_pcm_data,
                     file_path=file_path,
                     temp_path=temp_path,
+                    wav_bytes=wav_bytes,
                 )
 
             text, _ = await self.speech_to_text(
@@ -347,35 +377,13 @@ class ASRProviderBase(ABC):
 
     @staticmethod
     def decode_opus(opus_data: List[bytes]) -> List[bytes]:
-        """将Opus音频数据解码为PCM数据"""
-        decoder = None
-        try:
-            decoder = opuslib_next.Decoder(16000, 1)
-            pcm_data = []
-            buffer_size = 960  # 每次处理960个采样点 (60ms at 16kHz)
-
-            for i, opus_packet in enumerate(opus_data):
-                try:
-                    if not opus_packet or len(opus_packet) == 0:
-                        continue
-
-                    pcm_frame = decoder.decode(opus_packet, buffer_size)
-                    if pcm_frame and len(pcm_frame) > 0:
-                        pcm_data.append(pcm_frame)
-
-                except opuslib_next.OpusError as e:
-                    logger.bind(tag=TAG).warning(f"Opus解码错误，跳过数据包 {i}: {e}")
-                except Exception as e:
-                    logger.bind(tag=TAG).error(f"音频处理错误，数据包 {i}: {e}")
-
-            return pcm_data
+        """将Opus音频数据解码为PCM数据
 
+        使用共享解码器池整段解码（60ms at 16kHz），返回的列表只包含一段连续PCM
+        """
+        try:
+            pcm = decode_opus_packets(opus_data, sample_rate=16000, channels=1)
+            return [pcm.tobytes()] if len(pcm) > 0 else []
         except Exception as e:
             logger.bind(tag=TAG).error(f"音频解码过程发生错误: {e}")
             return []
-        finally:
-            if decoder is not None:
-                try:
-                    del decoder
-                except Exception as e:
-                    logger.bind(tag=TAG).debug(f"释放decoder资源时出错: {e}")
@@ -4,7 +4,6 @@ import sys
 import time
 import shutil
 import psutil
-import asyncio
 
 from funasr import AutoModel
 from config.logger import setup_logging
@@ -12,6 +11,7 @@ from typing import Optional, Tuple, List
 from core.providers.asr.utils import lang_tag_filter
 from core.providers.asr.base import ASRProviderBase
 from core.providers.asr.dto.dto import InterfaceType
+from core.utils.micro_batch import MicroBatchQueue
 
 TAG = __name__
 logger = setup_logging()
@@ -63,6 +63,24 @@ class ASRProvider(ASRProviderBase):
                 # device="cuda:0",  # 启用GPU加速
             )
 
+        # 所有连接共用的推理队列，窗口期内到达的语音合并为一次generate调用
+        self.batch_queue = MicroBatchQueue(
+            self._generate_batch,
+            batch_window_ms=int(config.get("batch_window_ms", 30)),
+            max_batch_size=int(config.get("max_batch_size", 8)),
+            name="funasr-batch",
+        )
+
+    def _generate_batch(self, pcm_list: List[bytes]) -> List[dict]:
+        """批量识别，结果顺序与输入一致"""
+        return self.model.generate(
+            input=pcm_list,
+            cache={},
+            language="auto",
+            use_itn=True,
+            batch_size=len(pcm_list),
+        )
+
     async def speech_to_text(
         self, opus_data: List[bytes], session_id: str, audio_format="opus", artifacts=None
     ) -> Tuple[Optional[str], Optional[str]]:
@@ -74,19 +92,15 @@ class ASRProvider(ASRProviderBase):
                 if artifacts is None:
                     return "", None
 
-                # 语音识别 - 使用线程池避免阻塞事件循环
+                # 语音识别 - 提交到共享推理队列，在独立线程中批量执行
                 start_time = time.time()
-                result = await asyncio.to_thread(
-                    self.model.generate,
-                    input=artifacts.pcm_bytes,
-                    cache={},
-                    language="auto",
-                    use_itn=True,
-                    batch_size_s=60,
-                )
-                text = lang_tag_filter(result[0]["text"])
+                result = await self.batch_queue.submit(artifacts.pcm_bytes)
+                text = lang_tag_filter(result["text"])
+                metrics = self.batch_queue.get_metrics()
                 logger.bind(tag=TAG).debug(
-                    f"语音识别耗时: {time.time() - start_time:.3f}s | 结果: {text['content']}"
+                    f"语音识别耗时: {time.time() - start_time:.3f}s | "
+                    f"批大小: {metrics['last_batch_size']} | "
+                    f"队列深度: {metrics['queue_depth']} | 结果: {text['content']}"
                 )
 
                 return text, artifacts.file_path
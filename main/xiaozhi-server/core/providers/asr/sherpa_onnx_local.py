@@ -1,5 +1,4 @@
 import time
-import wave
 import os
 import sys
 import io
@@ -7,6 +6,7 @@ from config.logger import setup_logging
 from typing import Optional, Tuple, List
 from core.providers.asr.dto.dto import InterfaceType
 from core.providers.asr.base import ASRProviderBase
+from core.utils.micro_batch import MicroBatchQueue
 
 import numpy as np
 import sherpa_onnx
@@ -42,6 +42,7 @@ class ASRProvider(ASRProviderBase):
         self.output_dir = config.get("output_dir")
         self.model_type = config.get("model_type", "sense_voice")  # 支持 paraformer
         self.delete_audio_file = delete_audio_file
+        num_threads = int(config.get("num_threads", 2))
 
         # 确保输出目录存在
         os.makedirs(self.output_dir, exist_ok=True)
@@ -78,7 +79,7 @@ class ASRProvider(ASRProviderBase):
                 self.model = sherpa_onnx.OfflineRecognizer.from_paraformer(
                     paraformer=self.model_path,
                     tokens=self.tokens_path,
-                    num_threads=2,
+                    num_threads=num_threads,
                     sample_rate=16000,
                     feature_dim=80,
                     decoding_method="greedy_search",
@@ -88,7 +89,7 @@ class ASRProvider(ASRProviderBase):
                 self.model = sherpa_onnx.OfflineRecognizer.from_sense_voice(
                     model=self.model_path,
                     tokens=self.tokens_path,
-                    num_threads=2,
+                    num_threads=num_threads,
                     sample_rate=16000,
                     feature_dim=80,
                     decoding_method="greedy_search",
@@ -96,32 +97,26 @@ class ASRProvider(ASRProviderBase):
                     use_itn=True,
                 )
 
-    def read_wave(self, wave_filename: str) -> Tuple[np.ndarray, int]:
-        """
-        Args:
-        wave_filename:
-            Path to a wave file. It should be single channel and each sample should
-            be 16-bit. Its sample rate does not need to be 16kHz.
-        Returns:
-        Return a tuple containing:
-        - A 1-D array of dtype np.float32 containing the samples, which are
-        normalized to the range [-1, 1].
-        - sample rate of the wave file
-        """
-
-        with wave.open(wave_filename) as f:
-            assert f.getnchannels() == 1, f.getnchannels()
-            assert f.getsampwidth() == 2, f.getsampwidth()  # it is in bytes
-            num_samples = f.getnframes()
-            samples = f.readframes(num_samples)
-            samples_int16 = np.frombuffer(samples, dtype=np.int16)
-            samples_float32 = samples_int16.astype(np.float32)
-
-            samples_float32 = samples_float32 / 32768
-            return samples_float32, f.getframerate()
+        # 同一时间窗口内多个连接的语音合并为一次 decode_streams 调用
+        self.batch_queue = MicroBatchQueue(
+            self._decode_batch,
+            batch_window_ms=int(config.get("batch_window_ms", 20)),
+            max_batch_size=int(config.get("max_batch_size", 8)),
+            name="sherpa-asr-batch",
+        )
 
     def requires_file(self) -> bool:
-        return True
+        return False
+
+    def _decode_batch(self, samples_list: List[np.ndarray]) -> List[str]:
+        """批量识别，每段语音一个stream，一次调用完成解码"""
+        streams = []
+        for samples in samples_list:
+            s = self.model.create_stream()
+            s.accept_waveform(16000, samples)
+            streams.append(s)
+        self.model.decode_streams(streams)
+        return [s.result.text for s in streams]
 
     async def speech_to_text(
         self, opus_data: List[bytes], session_id: str, audio_format="opus", artifacts=None
@@ -134,11 +129,10 @@ class ASRProvider(ASRProviderBase):
             file_path = artifacts.file_path
 
             start_time = time.time()
-            s = self.model.create_stream()
-            samples, sample_rate = self.read_wave(file_path)
-            s.accept_waveform(sample_rate, samples)
-            self.model.decode_stream(s)
-            text = s.result.text
+            # 直接使用内存中的PCM数据，无需读写wav文件
+            samples = np.frombuffer(artifacts.pcm_bytes, dtype=np.int16)
+            samples = samples.astype(np.float32) / 32768
+            text = await self.batch_queue.submit(samples)
             logger.bind(tag=TAG).debug(
                 f"语音识别耗时: {time.time() - start_time:.3f}s | 结果: {text}"
             )
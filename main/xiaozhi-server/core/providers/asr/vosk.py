@@ -1,6 +1,8 @@
 import os
 import json
 import time
+import queue
+import asyncio
 from typing import Optional, Tuple, List
 from .base import ASRProviderBase
 from config.logger import setup_logging
@@ -17,10 +19,12 @@ class ASRProvider(ASRProviderBase):
         self.model_path = config.get("model_path")
         self.output_dir = config.get("output_dir", "tmp/")
         self.delete_audio_file = delete_audio_file
-        
-        # 初始化VOSK模型
+        # 识别器池中最多保留的空闲识别器数量
+        self.pool_size = int(config.get("pool_size", 4))
+
+        # 初始化VOSK模型，模型只加载一次，识别器按语音借出
         self.model = None
-        self.recognizer = None
+        self.recognizer_pool = queue.Queue()
         self._load_model()
         
         # 确保输出目录存在
@@ -35,14 +39,53 @@ class ASRProvider(ASRProviderBase):
             logger.bind(tag=TAG).info(f"正在加载VOSK模型: {self.model_path}")
             self.model = vosk.Model(self.model_path)
 
-            # 初始化VOSK识别器（采样率必须为16kHz）
-            self.recognizer = vosk.KaldiRecognizer(self.model, 16000)
+            # 预先创建一个识别器，避免首次识别时再初始化
+            self._release_recognizer(self._acquire_recognizer())
 
             logger.bind(tag=TAG).info("VOSK模型加载成功")
         except Exception as e:
             logger.bind(tag=TAG).error(f"加载VOSK模型失败: {e}")
             raise
 
+    def _acquire_recognizer(self):
+        """借出一个识别器，池中没有空闲识别器时新建"""
+        try:
+            return self.recognizer_pool.get_nowait()
+        except queue.Empty:
+            # 识别器带有解码状态，不能被多条语音同时使用（采样率必须为16kHz）
+            return vosk.KaldiRecognizer(self.model, 16000)
+
+    def _release_recognizer(self, recognizer):
+        """归还识别器，重置状态后放回池中，超出池大小则直接丢弃"""
+        recognizer.Reset()
+        if self.recognizer_pool.qsize() < self.pool_size:
+            self.recognizer_pool.put_nowait(recognizer)
+
+    def _recognize(self, pcm_bytes: bytes) -> str:
+        """使用独占的识别器完成一条语音的识别"""
+        recognizer = self._acquire_recognizer()
+        try:
+            # 进行识别（VOSK推荐每次送入2000字节的数据）
+            chunk_size = 2000
+            text_result = ""
+
+            for i in range(0, len(pcm_bytes), chunk_size):
+                chunk = pcm_bytes[i : i + chunk_size]
+                if recognizer.AcceptWaveform(chunk):
+                    result = json.loads(recognizer.Result())
+                    text = result.get("text", "")
+                    if text:
+                        text_result += text + " "
+
+            # 获取最终结果
+            final_result = json.loads(recognizer.FinalResult())
+            final_text = final_result.get("text", "")
+            if final_text:
+                text_result += final_text
+            return text_result.strip()
+        finally:
+            self._release_recognizer(recognizer)
+
     async def speech_to_text(
         self, opus_data: List[bytes], session_id: str, audio_format="opus", artifacts=None
     ) -> Tuple[Optional[str], Optional[str]]:
@@ -60,31 +103,17 @@ class ASRProvider(ASRProviderBase):
                 return "", None
 
             start_time = time.time()
-            
-            
-            # 进行识别（VOSK推荐每次送入2000字节的数据）
-            chunk_size = 2000
-            text_result = ""
-            
-            for i in range(0, len(artifacts.pcm_bytes), chunk_size):
-                chunk = artifacts.pcm_bytes[i:i+chunk_size]
-                if self.recognizer.AcceptWaveform(chunk):
-                    result = json.loads(self.recognizer.Result())
-                    text = result.get('text', '')
-                    if text:
-                        text_result += text + " "
-            
-            # 获取最终结果
-            final_result = json.loads(self.recognizer.FinalResult())
-            final_text = final_result.get('text', '')
-            if final_text:
-                text_result += final_text
-            
+
+            # 在线程中识别，多条语音可以并行解码
+            text_result = await asyncio.to_thread(
+                self._recognize, artifacts.pcm_bytes
+            )
+
             logger.bind(tag=TAG).debug(
-                f"VOSK语音识别耗时: {time.time() - start_time:.3f}s | 结果: {text_result.strip()}"
+                f"VOSK语音识别耗时: {time.time() - start_time:.3f}s | 结果: {text_result}"
             )
-            
-            return text_result.strip(), artifacts.file_path
+
+            return text_result, artifacts.file_path
             
         except Exception as e:
             logger.bind(tag=TAG).error(f"VOSK语音识别失败: {e}")
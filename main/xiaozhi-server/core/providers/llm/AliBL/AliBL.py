@@ -20,7 +20,7 @@ class LLMProvider(LLMProviderBase):
         self.streaming_chunk_size = config.get("streaming_chunk_size", 3)  # 每次流式返回的字符数
         check_model_key("AliBLLLM", self.api_key)
 
-    def response(self, session_id, dialogue):
+    def response(self, session_id, dialogue, **kwargs):
         # 处理dialogue
         if self.is_No_prompt:
             dialogue.pop(0)
@@ -94,7 +94,7 @@ class LLMProvider(LLMProviderBase):
                     if chunk:
                         yield chunk
 
-    def response_with_functions(self, session_id, dialogue, functions=None):
+    def response_with_functions(self, session_id, dialogue, functions=None, **kwargs):
         # 阿里百练当前未支持原生的 function call。为保持兼容，这里回退到普通文本流式输出。
         # 上层会按 (content, tool_calls) 的形式消费，这里始终返回 (token, None)
         logger.bind(tag=TAG).warning(
@@ -6,7 +6,7 @@ logger = setup_logging()
 
 class LLMProviderBase(ABC):
     @abstractmethod
-    def response(self, session_id, dialogue):
+    def response(self, session_id, dialogue, **kwargs):
         """LLM response generator"""
         pass
 
@@ -21,7 +21,7 @@ class LLMProviderBase(ABC):
             result += part
         return result
     
-    def response_with_functions(self, session_id, dialogue, functions=None):
+    def response_with_functions(self, session_id, dialogue, functions=None, **kwargs):
         """
         Default implementation for function calling (streaming)
         This should be overridden by providers that support function calls
@@ -59,7 +59,7 @@ class LLMProvider(LLMProviderBase):
         else:
             logger.bind(tag=TAG).warning("API 返回数据中没有 speech 内容")
 
-    def response_with_functions(self, session_id, dialogue, functions=None):
+    def response_with_functions(self, session_id, dialogue, functions=None, **kwargs):
         logger.bind(tag=TAG).error(
             f"homeassistant不支持（function call），建议使用其他意图识别"
         )
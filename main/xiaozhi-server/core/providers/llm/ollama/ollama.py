@@ -88,7 +88,7 @@ class LLMProvider(LLMProviderBase):
             except Exception as e:
                 logger.bind(tag=TAG).error(f"Error processing chunk: {e}")
 
-    def response_with_functions(self, session_id, dialogue, functions=None):
+    def response_with_functions(self, session_id, dialogue, functions=None, **kwargs):
         # 如果是qwen3模型，在用户最后一条消息中添加/no_think指令
         if self.is_qwen3:
             # 复制对话列表，避免修改原始对话
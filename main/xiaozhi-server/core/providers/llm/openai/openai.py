@@ -1,5 +1,6 @@
 import httpx
 import openai
+from contextlib import contextmanager
 from openai.types import CompletionUsage
 from config.logger import setup_logging
 from core.utils.util import check_model_key
@@ -55,6 +56,24 @@ class LLMProvider(LLMProviderBase):
                 msg["content"] = ""
         return dialogue
 
+    @staticmethod
+    @contextmanager
+    def _close_on_cancel(stream, cancel_token):
+        """对话被打断时立即关闭流式响应，停止接收（和计费）剩余的token"""
+        if cancel_token:
+            cancel_token.register(stream.close)
+        try:
+            yield
+        except Exception:
+            # 从其他线程关闭连接后，读取会抛出连接错误，属于正常打断
+            if not (cancel_token and cancel_token.cancelled):
+                raise
+            logger.bind(tag=TAG).debug("对话已打断，LLM流式响应已关闭")
+        finally:
+            if cancel_token:
+                cancel_token.unregister(stream.close)
+            stream.close()
+
     def response(self, session_id, dialogue, **kwargs):
         dialogue = self.normalize_dialogue(dialogue)
 
@@ -79,21 +98,22 @@ class LLMProvider(LLMProviderBase):
         responses = self.client.chat.completions.create(**request_params)
 
         is_active = True
-        for chunk in responses:
-            try:
-                delta = chunk.choices[0].delta if getattr(chunk, "choices", None) else None
-                content = getattr(delta, "content", "") if delta else ""
-            except IndexError:
-                content = ""
-            if content:
-                if "<think>" in content:
-                    is_active = False
-                    content = content.split("<think>")[0]
-                if "</think>" in content:
-                    is_active = True
-                    content = content.split("</think>")[-1]
-                if is_active:
-                    yield content
+        with self._close_on_cancel(responses, kwargs.get("cancel_token")):
+            for chunk in responses:
+                try:
+                    delta = chunk.choices[0].delta if getattr(chunk, "choices", None) else None
+                    content = getattr(delta, "content", "") if delta else ""
+                except IndexError:
+                    content = ""
+                if content:
+                    if "<think>" in content:
+                        is_active = False
+                        content = content.split("<think>")[0]
+                    if "</think>" in content:
+                        is_active = True
+                        content = content.split("</think>")[-1]
+                    if is_active:
+                        yield content
 
     def response_with_functions(self, session_id, dialogue, functions=None, **kwargs):
         dialogue = self.normalize_dialogue(dialogue)
@@ -118,16 +138,17 @@ class LLMProvider(LLMProviderBase):
 
         stream = self.client.chat.completions.create(**request_params)
 
-        for chunk in stream:
-            if getattr(chunk, "choices", None):
-                delta = chunk.choices[0].delta
-                content = getattr(delta, "content", "")
-                tool_calls = getattr(delta, "tool_calls", None)
-                yield content, tool_calls
-            elif isinstance(getattr(chunk, "usage", None), CompletionUsage):
-                usage_info = getattr(chunk, "usage", None)
-                logger.bind(tag=TAG).info(
-                    f"Token 消耗：输入 {getattr(usage_info, 'prompt_tokens', '未知')}，"
-                    f"输出 {getattr(usage_info, 'completion_tokens', '未知')}，"
-                    f"共计 {getattr(usage_info, 'total_tokens', '未知')}"
-                )
+        with self._close_on_cancel(stream, kwargs.get("cancel_token")):
+            for chunk in stream:
+                if getattr(chunk, "choices", None):
+                    delta = chunk.choices[0].delta
+                    content = getattr(delta, "content", "")
+                    tool_calls = getattr(delta, "tool_calls", None)
+                    yield content, tool_calls
+                elif isinstance(getattr(chunk, "usage", None), CompletionUsage):
+                    usage_info = getattr(chunk, "usage", None)
+                    logger.bind(tag=TAG).info(
+                        f"Token 消耗：输入 {getattr(usage_info, 'prompt_tokens', '未知')}，"
+                        f"输出 {getattr(usage_info, 'completion_tokens', '未知')}，"
+                        f"共计 {getattr(usage_info, 'total_tokens', '未知')}"
+                    )
@@ -58,7 +58,7 @@ class LLMProvider(LLMProviderBase):
             except Exception as e:
                 logger.bind(tag=TAG).error(f"Error processing chunk: {e}")
 
-    def response_with_functions(self, session_id, dialogue, functions=None):
+    def response_with_functions(self, session_id, dialogue, functions=None, **kwargs):
         logger.bind(tag=TAG).debug(
             f"Sending function call request to Xinference with model: {self.model_name}, dialogue length: {len(dialogue)}"
         )
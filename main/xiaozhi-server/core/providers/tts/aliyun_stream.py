@@ -203,6 +203,8 @@ class TTSProvider(TTSProviderBase):
         """流式文本处理线程"""
         while not self.conn.stop_event.is_set():
             try:
+                # 设备接收过慢时暂停合成
+                self.wait_for_write_backpressure()
                 message = self.tts_text_queue.get(timeout=1)
                 logger.bind(tag=TAG).debug(
                     f"收到TTS任务｜{message.sentence_type.name} ｜ {message.content_type.name} | 会话ID: {self.conn.sentence_id}"
@@ -324,6 +326,9 @@ class TTSProvider(TTSProviderBase):
             # 启动监听任务
             self._monitor_task = asyncio.create_task(self._start_monitor_tts_response())
 
+            # 本轮对话被打断时立即中止上游会话
+            self.conn.turn_token.register(self.abort_session)
+
             start_request = {
                 "header": {
                     "message_id": uuid.uuid4().hex,
@@ -382,6 +387,10 @@ class TTSProvider(TTSProviderBase):
             await self.close()
             raise
 
+    def abort_session(self):
+        """打断时立即关闭上游连接，不再接收本轮剩余音频，下次会话重新建连"""
+        asyncio.run_coroutine_threadsafe(self.close(), loop=self.conn.loop)
+
     async def close(self):
         """资源清理"""
         if self._monitor_task:
@@ -5,6 +5,7 @@ import queue
 import asyncio
 import threading
 import traceback
+import concurrent.futures
 
 from core.utils import p3
 from datetime import datetime
@@ -14,6 +15,14 @@ from abc import ABC, abstractmethod
 from config.logger import setup_logging
 from core.utils import opus_encoder_utils
 from core.utils.tts import MarkdownCleaner
+from core.utils.loop_queue import LoopQueue
+from core.utils.text_segmenter import TextSegmenter
+from core.utils.tts_cache import TTSCacheRecorder, get_tts_cache
+from core.utils.http_pool import (
+    create_aiohttp_session,
+    get_http_session,
+    get_http_timeout,
+)
 from core.utils.output_counter import add_device_output
 from core.handle.reportHandle import enqueue_tts_report
 from core.handle.sendAudioHandle import sendAudioMessage
@@ -37,11 +46,11 @@ class TTSProviderBase(ABC):
         self.audio_file_type = "wav"
         self.output_file = config.get("output_dir", "tmp/")
         self.tts_text_queue = queue.Queue()
-        self.tts_audio_queue = queue.Queue()
+        self.tts_audio_queue = LoopQueue()
+        self.audio_play_task = None
         self.tts_audio_first_sentence = True
         self.before_stop_play_files = []
 
-        self.tts_text_buff = []
         self.punctuations = (
             "。",
             "？",
@@ -66,9 +75,21 @@ class TTSProviderBase(ABC):
             ";",
             "：",
         )
+        # 增量分句缓冲，跟踪首句与非首句的全部标点
+        self.text_segmenter = TextSegmenter(
+            self.punctuations + self.first_sentence_punctuations
+        )
         self.tts_stop_request = False
-        self.processed_chars = 0
         self.is_first_sentence = True
+        # 常驻的TTS事件循环，见 _get_tts_loop
+        self._tts_loop = None
+        self._tts_loop_closed = False
+        self._tts_loop_lock = threading.Lock()
+        self._aiohttp_session = None  # 常驻事件循环上的aiohttp会话，见 get_aiohttp_session
+        self._aiohttp_loop = None
+        # TTS音频缓存，开启时在 open_audio_channels 中获取；提供者配置（含音色）参与缓存键
+        self.tts_cache = None
+        self.tts_cache_params = [type(self).__module__, config]
 
     def generate_filename(self, extension=".wav"):
         return os.path.join(
@@ -83,14 +104,144 @@ class TTSProviderBase(ABC):
     def handle_audio_file(self, file_audio: bytes, text):
         self.before_stop_play_files.append((file_audio, text))
 
+    def _get_tts_loop(self):
+        """
+        TTS合成使用的常驻事件循环，首次使用时在独立线程中启动，连接关闭时停止
+        整个连接期间复用，避免每句话都创建和销毁事件循环；连接关闭后返回None
+        """
+        with self._tts_loop_lock:
+            if self._tts_loop is None and not self._tts_loop_closed:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._run_tts_loop, args=(loop,), daemon=True
+                ).start()
+                self._tts_loop = loop
+            return self._tts_loop
+
+    def _run_tts_loop(self, loop):
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+        finally:
+            # 与 asyncio.run 退出时一致：取消未完成的任务后关闭事件循环
+            try:
+                tasks = asyncio.all_tasks(loop)
+                for task in tasks:
+                    task.cancel()
+                loop.run_until_complete(
+                    asyncio.gather(*tasks, return_exceptions=True)
+                )
+                # 关闭跨句复用的HTTP连接
+                session = self._aiohttp_session
+                if session is not None and self._aiohttp_loop is loop:
+                    self._aiohttp_session = None
+                    loop.run_until_complete(session.close())
+                loop.run_until_complete(loop.shutdown_asyncgens())
+            finally:
+                loop.close()
+
+    def _stop_tts_loop(self):
+        with self._tts_loop_lock:
+            loop = self._tts_loop
+            self._tts_loop = None
+            self._tts_loop_closed = True
+        if loop and not loop.is_closed():
+            loop.call_soon_threadsafe(loop.stop)
+
+    @property
+    def http_session(self):
+        """进程内共享的keep-alive requests会话，同步发起HTTP请求的提供者使用"""
+        return get_http_session(self.conn.config if self.conn else None)
+
+    @property
+    def http_timeout(self):
+        """共享会话上同步请求的超时时间（秒）"""
+        return get_http_timeout(self.conn.config if self.conn else None)
+
+    async def get_aiohttp_session(self):
+        """
+        返回当前事件循环上的keep-alive aiohttp会话，整个连接期间跨句复用，
+        TTS常驻事件循环停止时关闭；调用方不要关闭它
+        """
+        loop = asyncio.get_running_loop()
+        session = self._aiohttp_session
+        if session is None or session.closed or self._aiohttp_loop is not loop:
+            session = create_aiohttp_session(self.conn.config if self.conn else None)
+            self._aiohttp_session = session
+            self._aiohttp_loop = loop
+        return session
+
+    def _run_on_tts_loop(self, coro):
+        """在常驻事件循环中执行协程并阻塞等待结果"""
+        loop = self._get_tts_loop()
+        if loop is None:
+            # 连接已关闭，退回到临时事件循环
+            return asyncio.run(coro)
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    def _run_tts_coroutine(self, coro):
+        """
+        在TTS线程中执行合成协程，并登记到本轮对话的取消令牌上，
+        打断时立即取消协程，中止进行中的上游请求；被取消时抛出 asyncio.CancelledError
+        """
+        turn_token = self.conn.turn_token
+        loop = self._get_tts_loop()
+        if loop is None:
+            coro.close()
+            raise asyncio.CancelledError()
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+
+        def cancel():
+            future.cancel()
+
+        turn_token.register(cancel)
+        try:
+            return future.result()
+        except concurrent.futures.CancelledError:
+            raise asyncio.CancelledError()
+        finally:
+            turn_token.unregister(cancel)
+
+    def abort_session(self):
+        """
+        本轮对话被打断时由取消令牌回调，可能在任意线程中执行
+        双流式TTS在子类中重写，立即中止上游会话，不再接收本轮剩余音频
+        """
+        pass
+
+    def _get_tts_cache_key(self, text):
+        """返回句子的缓存键，未开启缓存或句子不宜缓存时返回None"""
+        if self.tts_cache is None or not self.tts_cache.cacheable(text):
+            return None
+        return self.tts_cache.make_key(
+            text,
+            *self.tts_cache_params,
+            self.conn.sample_rate,
+            self.conn.audio_format,
+        )
+
     def to_tts_stream(self, text, opus_handler: Callable[[bytes], None] = None) -> None:
         text = MarkdownCleaner.clean_markdown(text)
+        cache_key = self._get_tts_cache_key(text)
+        cache_recorder = None
+        if cache_key:
+            packets = self.tts_cache.get(cache_key)
+            if packets is not None:
+                # 命中缓存，跳过上游合成和解码
+                logger.bind(tag=TAG).info(f"语音命中缓存: {text}")
+                self.tts_audio_queue.put((SentenceType.FIRST, None, text))
+                if opus_handler:
+                    for packet in packets:
+                        opus_handler(packet)
+                return None
+            cache_recorder = TTSCacheRecorder(self.tts_cache, cache_key, opus_handler)
+            opus_handler = cache_recorder
         max_repeat_time = 5
         if self.delete_audio_file:
             # 需要删除文件的直接转为音频数据
             while max_repeat_time > 0:
                 try:
-                    audio_bytes = asyncio.run(self.text_to_speak(text, None))
+                    audio_bytes = self._run_tts_coroutine(self.text_to_speak(text, None))
                     if audio_bytes:
                         self.tts_audio_queue.put((SentenceType.FIRST, None, text))
                         audio_bytes_to_data_stream(
@@ -104,6 +255,9 @@ class TTSProviderBase(ABC):
                         break
                     else:
                         max_repeat_time -= 1
+                except asyncio.CancelledError:
+                    logger.bind(tag=TAG).info(f"对话已打断，中止语音生成: {text}")
+                    return None
                 except Exception as e:
                     logger.bind(tag=TAG).warning(
                         f"语音生成失败{5 - max_repeat_time + 1}次: {text}，错误: {e}"
@@ -113,6 +267,8 @@ class TTSProviderBase(ABC):
                 logger.bind(tag=TAG).info(
                     f"语音生成成功: {text}，重试{5 - max_repeat_time}次"
                 )
+                if cache_recorder:
+                    cache_recorder.commit()
             else:
                 logger.bind(tag=TAG).error(
                     f"语音生成失败: {text}，请检查网络或服务是否正常"
@@ -123,7 +279,12 @@ class TTSProviderBase(ABC):
             try:
                 while not os.path.exists(tmp_file) and max_repeat_time > 0:
                     try:
-                        asyncio.run(self.text_to_speak(text, tmp_file))
+                        self._run_tts_coroutine(self.text_to_speak(text, tmp_file))
+                    except asyncio.CancelledError:
+                        logger.bind(tag=TAG).info(f"对话已打断，中止语音生成: {text}")
+                        if os.path.exists(tmp_file):
+                            os.remove(tmp_file)
+                        return None
                     except Exception as e:
                         logger.bind(tag=TAG).warning(
                             f"语音生成失败{5 - max_repeat_time + 1}次: {text}，错误: {e}"
@@ -143,6 +304,8 @@ class TTSProviderBase(ABC):
                     )
                 self.tts_audio_queue.put((SentenceType.FIRST, None, text))
                 self._process_audio_file_stream(tmp_file, callback=opus_handler)
+                if max_repeat_time > 0 and cache_recorder:
+                    cache_recorder.commit()
             except Exception as e:
                 logger.bind(tag=TAG).error(f"Failed to generate TTS file: {e}")
                 return None
@@ -154,7 +317,7 @@ class TTSProviderBase(ABC):
             # 需要删除文件的直接转为音频数据
             while max_repeat_time > 0:
                 try:
-                    audio_bytes = asyncio.run(self.text_to_speak(text, None))
+                    audio_bytes = self._run_on_tts_loop(self.text_to_speak(text, None))
                     if audio_bytes:
                         audio_datas = []
                         audio_bytes_to_data_stream(
@@ -186,7 +349,7 @@ class TTSProviderBase(ABC):
             try:
                 while not os.path.exists(tmp_file) and max_repeat_time > 0:
                     try:
-                        asyncio.run(self.text_to_speak(text, tmp_file))
+                        self._run_on_tts_loop(self.text_to_speak(text, tmp_file))
                     except Exception as e:
                         logger.bind(tag=TAG).warning(
                             f"语音生成失败{5 - max_repeat_time + 1}次: {text}，错误: {e}"
@@ -269,17 +432,35 @@ class TTSProviderBase(ABC):
         )
         self.tts_priority_thread.start()
 
-        # 音频播放 消化线程
-        self.audio_play_priority_thread = threading.Thread(
-            target=self._audio_play_priority_thread, daemon=True
-        )
-        self.audio_play_priority_thread.start()
+        # 音频播放 消化任务，直接运行在连接的事件循环中
+        self.tts_audio_queue.bind(conn.loop)
+        self.audio_play_task = conn.loop.create_task(self._audio_play_priority_task())
+
+        self.tts_cache = get_tts_cache(conn.config)
+
+    def close_audio_channels(self):
+        """停止音频播放任务"""
+        task = self.audio_play_task
+        self.audio_play_task = None
+        # 播放任务自身触发关闭连接时（close_after_chat）不能取消自己，由stop_event结束循环
+        if task and not task.done() and task is not asyncio.current_task():
+            task.cancel()
+        self._stop_tts_loop()
+
+    def wait_for_write_backpressure(self):
+        """下行积压超过高水位时阻塞，直到降到低水位以下、被打断或连接关闭"""
+        write_backpressure = self.conn.write_backpressure
+        while not write_backpressure.wait_writable_blocking(timeout=1):
+            if self.conn.stop_event.is_set() or self.conn.client_abort:
+                return
 
     # 这里默认是非流式的处理方式
     # 流式处理方式请在子类中重写
     def tts_text_priority_thread(self):
         while not self.conn.stop_event.is_set():
             try:
+                # 设备接收过慢时暂停合成
+                self.wait_for_write_backpressure()
                 message = self.tts_text_queue.get(timeout=1)
                 if message.sentence_type == SentenceType.FIRST:
                     self.conn.client_abort = False
@@ -289,12 +470,11 @@ class TTSProviderBase(ABC):
                 if message.sentence_type == SentenceType.FIRST:
                     # 初始化参数
                     self.tts_stop_request = False
-                    self.processed_chars = 0
-                    self.tts_text_buff = []
+                    self.text_segmenter.reset()
                     self.is_first_sentence = True
                     self.tts_audio_first_sentence = True
                 elif ContentType.TEXT == message.content_type:
-                    self.tts_text_buff.append(message.content_detail)
+                    self.text_segmenter.feed(message.content_detail)
                     segment_text = self._get_segment_text()
                     if segment_text:
                         self.to_tts_stream(segment_text, opus_handler=self.handle_opus)
@@ -319,21 +499,16 @@ class TTSProviderBase(ABC):
                 )
                 continue
 
-    def _audio_play_priority_thread(self):
+    async def _audio_play_priority_task(self):
         # 需要上报的文本和音频列表
         enqueue_text = None
         enqueue_audio = None
         while not self.conn.stop_event.is_set():
             text = None
             try:
-                try:
-                    sentence_type, audio_datas, text = self.tts_audio_queue.get(
-                        timeout=0.1
-                    )
-                except queue.Empty:
-                    if self.conn.stop_event.is_set():
-                        break
-                    continue
+                # 设备接收过慢时暂停消费，音频留在队列中
+                await self.conn.write_backpressure.wait_writable()
+                sentence_type, audio_datas, text = await self.tts_audio_queue.get()
 
                 if self.conn.client_abort:
                     logger.bind(tag=TAG).debug("收到打断信号，跳过当前音频数据")
@@ -353,18 +528,17 @@ class TTSProviderBase(ABC):
                     enqueue_audio.append(audio_datas)
 
                 # 发送音频
-                future = asyncio.run_coroutine_threadsafe(
-                    sendAudioMessage(self.conn, sentence_type, audio_datas, text),
-                    self.conn.loop,
-                )
-                future.result()
+                await sendAudioMessage(self.conn, sentence_type, audio_datas, text)
 
                 # 记录输出和报告
                 if self.conn.max_output_size > 0 and text:
                     add_device_output(self.conn.headers.get("device-id"), len(text))
 
+            except asyncio.CancelledError:
+                logger.bind(tag=TAG).debug("音频播放任务已停止")
+                break
             except Exception as e:
-                logger.bind(tag=TAG).error(f"audio_play_priority_thread: {text} {e}")
+                logger.bind(tag=TAG).error(f"audio_play_priority_task: {text} {e}")
 
     async def start_session(self, session_id):
         pass
@@ -378,10 +552,8 @@ class TTSProviderBase(ABC):
             await self.ws.close()
 
     def _get_segment_text(self):
-        # 合并当前全部文本并处理未分割部分
-        full_text = "".join(self.tts_text_buff)
-        current_text = full_text[self.processed_chars :]  # 从未处理的位置开始
-        last_punct_pos = -1
+        # 在未处理的文本中查找断句位置，新文本在送入分句缓冲时已扫描过
+        text_segmenter = self.text_segmenter
 
         # 根据是否是第一句话选择不同的标点符号集合
         punctuations_to_use = (
@@ -389,28 +561,21 @@ class TTSProviderBase(ABC):
             if self.is_first_sentence
             else self.punctuations
         )
-
-        for punct in punctuations_to_use:
-            pos = current_text.rfind(punct)
-            if (pos != -1 and last_punct_pos == -1) or (
-                pos != -1 and pos < last_punct_pos
-            ):
-                last_punct_pos = pos
+        last_punct_pos = text_segmenter.find_boundary(punctuations_to_use)
 
         if last_punct_pos != -1:
-            segment_text_raw = current_text[: last_punct_pos + 1]
+            segment_text_raw = text_segmenter.consume(last_punct_pos + 1)
             segment_text = textUtils.get_string_no_punctuation_or_emoji(
                 segment_text_raw
             )
-            self.processed_chars += len(segment_text_raw)  # 更新已处理字符位置
 
             # 如果是第一句话，在找到第一个逗号后，将标志设置为False
             if self.is_first_sentence:
                 self.is_first_sentence = False
 
             return segment_text
-        elif self.tts_stop_request and current_text:
-            segment_text = current_text
+        elif self.tts_stop_request and text_segmenter.pending_len:
+            segment_text = text_segmenter.text()
             self.is_first_sentence = True  # 重置标志
             return segment_text
         else:
@@ -454,12 +619,11 @@ class TTSProviderBase(ABC):
         Returns:
             bool: 是否成功处理了文本
         """
-        full_text = "".join(self.tts_text_buff)
-        remaining_text = full_text[self.processed_chars :]
+        remaining_text = self.text_segmenter.text()
         if remaining_text:
             segment_text = textUtils.get_string_no_punctuation_or_emoji(remaining_text)
             if segment_text:
                 self.to_tts_stream(segment_text, opus_handler=opus_handler)
-                self.processed_chars += len(full_text)
+                self.text_segmenter.consume(self.text_segmenter.total_len)
                 return True
         return False
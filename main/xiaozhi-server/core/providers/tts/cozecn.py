@@ -1,4 +1,3 @@
-import requests
 from core.providers.tts.base import TTSProviderBase
 
 
@@ -29,8 +28,12 @@ class TTSProvider(TTSProviderBase):
         }
 
         try:
-            response = requests.request(
-                "POST", self.api_url, json=request_json, headers=headers
+            response = self.http_session.request(
+                "POST",
+                self.api_url,
+                json=request_json,
+                headers=headers,
+                timeout=self.http_timeout,
             )
             data = response.content
             if output_file:
@@ -1,7 +1,6 @@
 import os
 import json
 import uuid
-import requests
 from config.logger import setup_logging
 from datetime import datetime
 from core.providers.tts.base import TTSProviderBase
@@ -39,9 +38,13 @@ class TTSProvider(TTSProviderBase):
             request_params[k] = v
 
         if self.method.upper() == "POST":
-            resp = requests.post(self.url, json=request_params, headers=self.headers)
+            resp = self.http_session.post(
+                self.url, json=request_params, headers=self.headers, timeout=self.http_timeout
+            )
         else:
-            resp = requests.get(self.url, params=request_params, headers=self.headers)
+            resp = self.http_session.get(
+                self.url, params=request_params, headers=self.headers, timeout=self.http_timeout
+            )
         if resp.status_code == 200:
             if output_file:
                 with open(output_file, "wb") as file:
@@ -1,5 +1,4 @@
 import base64
-import requests
 import ormsgpack
 from pathlib import Path
 from pydantic import BaseModel, Field, conint, model_validator
@@ -161,7 +160,7 @@ class TTSProvider(TTSProviderBase):
 
         pydantic_data = ServeTTSRequest(**data)
 
-        response = requests.post(
+        response = self.http_session.post(
             self.api_url,
             data=ormsgpack.packb(
                 pydantic_data, option=ormsgpack.OPT_SERIALIZE_PYDANTIC
@@ -170,6 +169,7 @@ class TTSProvider(TTSProviderBase):
                 "Authorization": f"Bearer {self.api_key}",
                 "Content-Type": "application/msgpack",
             },
+            timeout=self.http_timeout,
         )
 
         if response.status_code == 200:
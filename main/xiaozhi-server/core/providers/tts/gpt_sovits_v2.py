@@ -1,4 +1,3 @@
-import requests
 from config.logger import setup_logging
 from core.providers.tts.base import TTSProviderBase
 from core.utils.util import parse_string_to_list
@@ -90,7 +89,9 @@ class TTSProvider(TTSProviderBase):
             "repetition_penalty": self.repetition_penalty,
         }
 
-        resp = requests.post(self.url, json=request_json)
+        resp = self.http_session.post(
+            self.url, json=request_json, timeout=self.http_timeout
+        )
         if resp.status_code == 200:
             if output_file:
                 with open(output_file, "wb") as file:
@@ -1,4 +1,3 @@
-import requests
 from config.logger import setup_logging
 from core.providers.tts.base import TTSProviderBase
 from core.utils.util import parse_string_to_list
@@ -51,7 +50,9 @@ class TTSProvider(TTSProviderBase):
             "if_sr": self.if_sr,
         }
 
-        resp = requests.get(self.url, params=request_params)
+        resp = self.http_session.get(
+            self.url, params=request_params, timeout=self.http_timeout
+        )
         if resp.status_code == 200:
             if output_file:
                 with open(output_file, "wb") as file:
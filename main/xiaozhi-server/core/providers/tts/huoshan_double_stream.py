@@ -4,6 +4,7 @@ import json
 import queue
 import asyncio
 import traceback
+import functools
 import websockets
 
 from typing import Callable, Any
@@ -11,6 +12,7 @@ from core.utils.tts import MarkdownCleaner
 from config.logger import setup_logging
 from core.utils import opus_encoder_utils
 from core.utils.util import check_model_key
+from core.utils.ws_pool import get_ws_pool
 from core.providers.tts.base import TTSProviderBase
 from core.providers.tts.dto.dto import SentenceType, ContentType, InterfaceType
 
@@ -139,17 +141,32 @@ class Response:
         return super().__str__()
 
 
+async def _open_ws(ws_url, app_id, access_token, resource_id):
+    """建立一条新的WebSocket连接（鉴权信息放在握手请求头中）"""
+    ws_header = {
+        "X-Api-App-Key": app_id,
+        "X-Api-Access-Key": access_token,
+        "X-Api-Resource-Id": resource_id,
+        "X-Api-Connect-Id": uuid.uuid4(),
+    }
+    return await websockets.connect(
+        ws_url, additional_headers=ws_header, max_size=1000000000
+    )
+
+
 class TTSProvider(TTSProviderBase):
     def __init__(self, config, delete_audio_file):
         super().__init__(config, delete_audio_file)
         self.ws = None
         self.interface_type = InterfaceType.DUAL_STREAM
         self._monitor_task = None  # 监听任务引用
+        self._activate_session = False
+        self._session_idle = asyncio.Event()  # 没有进行中的会话时置位
+        self._session_idle.set()
         self.appId = config.get("appid")
         self.access_token = config.get("access_token")
         self.cluster = config.get("cluster")
         self.resource_id = config.get("resource_id")
-        self.activate_session = False
         if config.get("private_voice"):
             self.voice = config.get("private_voice")
         else:
@@ -185,6 +202,22 @@ class TTSProvider(TTSProviderBase):
         self.enable_ws_reuse = False if str(enable_ws_reuse_value).lower() == 'false' else True
         self.tts_text = ""
 
+        # 进程级连接池：每个会话借出一条预热好的连接，会话结束后归还
+        self.ws_pool = None
+        if str(config.get("enable_ws_pool", False)).lower() == "true":
+            # 连接池模式下会话结束后连接归还给连接池，打断时取消会话而不是关闭连接
+            self.enable_ws_reuse = True
+            # 连接池由多个连接共用，建连函数只绑定地址和鉴权信息，不持有提供者实例
+            pool_key = (self.ws_url, self.appId, self.access_token, self.resource_id)
+            self.ws_pool = get_ws_pool(
+                pool_key,
+                functools.partial(_open_ws, *pool_key),
+                min_idle=int(config.get("ws_pool_min_idle", 2)),
+                max_idle=int(config.get("ws_pool_max_idle", 8)),
+                max_age=float(config.get("ws_pool_max_age", 300)),
+                ping_interval=float(config.get("ws_pool_ping_interval", 20)),
+            )
+
         model_key_msg = check_model_key("TTS", self.access_token)
         if model_key_msg:
             logger.bind(tag=TAG).error(model_key_msg)
@@ -194,11 +227,37 @@ class TTSProvider(TTSProviderBase):
             await super().open_audio_channels(conn)
             # 更新 audio_params 中的采样率为实际的 conn.sample_rate
             self.audio_params["sample_rate"] = conn.sample_rate
+            if self.ws_pool:
+                # 设备连上后即开始预热，首次对话时连接已就绪
+                self.ws_pool.start()
         except Exception as e:
             logger.bind(tag=TAG).error(f"Failed to open audio channels: {str(e)}")
             self.ws = None
             raise
 
+    @property
+    def activate_session(self):
+        return self._activate_session
+
+    @activate_session.setter
+    def activate_session(self, value):
+        self._activate_session = value
+        if value:
+            self._session_idle.clear()
+        else:
+            self._session_idle.set()
+
+    async def _connect(self):
+        return await _open_ws(
+            self.ws_url, self.appId, self.access_token, self.resource_id
+        )
+
+    def _release_to_pool(self):
+        """会话结束，把连接归还给连接池"""
+        ws = self.ws
+        self.ws = None
+        self.ws_pool.release(ws)
+
     async def _ensure_connection(self):
         """建立新的WebSocket连接，并启动监听任务（仅第一次）"""
         try:
@@ -211,16 +270,12 @@ class TTSProvider(TTSProviderBase):
                         await self.finish_connection()
                     except:
                         pass
-            logger.bind(tag=TAG).debug("开始建立新连接...")
-            ws_header = {
-                "X-Api-App-Key": self.appId,
-                "X-Api-Access-Key": self.access_token,
-                "X-Api-Resource-Id": self.resource_id,
-                "X-Api-Connect-Id": uuid.uuid4(),
-            }
-            self.ws = await websockets.connect(
-                self.ws_url, additional_headers=ws_header, max_size=1000000000
-            )
+            if self.ws_pool:
+                logger.bind(tag=TAG).debug("从连接池借出连接...")
+                self.ws = await self.ws_pool.acquire()
+            else:
+                logger.bind(tag=TAG).debug("开始建立新连接...")
+                self.ws = await self._connect()
             logger.bind(tag=TAG).debug("WebSocket连接建立成功")
             
             # 连接建立成功后，启动监听任务
@@ -254,6 +309,8 @@ class TTSProvider(TTSProviderBase):
         """火山引擎双流式TTS的文本处理线程"""
         while not self.conn.stop_event.is_set():
             try:
+                # 设备接收过慢时暂停合成
+                self.wait_for_write_backpressure()
                 message = self.tts_text_queue.get(timeout=1)
                 logger.bind(tag=TAG).debug(
                     f"收到TTS任务｜{message.sentence_type.name} ｜ {message.content_type.name} | 会话ID: {self.conn.sentence_id}"
@@ -359,27 +416,25 @@ class TTSProvider(TTSProviderBase):
             return
         except Exception as e:
             logger.bind(tag=TAG).error(f"发送TTS文本失败: {str(e)}")
-            if self.ws:
-                try:
-                    await self.ws.close()
-                except:
-                    pass
-                self.ws = None
+            await self._close_ws()
             raise
 
     async def start_session(self, session_id):
         logger.bind(tag=TAG).debug(f"开始会话～～{session_id}")
-        try:       
-            # 等待上一个会话结束，最多等待3次
-            for _ in range(3):
-                if not self.activate_session:
-                    break
-                logger.bind(tag=TAG).debug(f"等待上一个会话结束...")
-                await asyncio.sleep(0.1)
-            else:
-                # 等待超时，强制清除连接状态
-                logger.bind(tag=TAG).debug("等待上一个会话超时，清除连接状态...")
+        try:
+            if self.activate_session and self.ws_pool:
+                # 上一个会话仍未结束（如打断后还在等待取消确认），直接丢弃该连接，另借一条
+                logger.bind(tag=TAG).debug("上一个会话未结束，更换连接...")
                 await self.close()
+            elif self.activate_session:
+                # 等待上一个会话结束，最多等待0.3秒
+                logger.bind(tag=TAG).debug(f"等待上一个会话结束...")
+                try:
+                    await asyncio.wait_for(self._session_idle.wait(), timeout=0.3)
+                except asyncio.TimeoutError:
+                    # 等待超时，强制清除连接状态
+                    logger.bind(tag=TAG).debug("等待上一个会话超时，清除连接状态...")
+                    await self.close()
             
             # 设置会话激活标志
             self.activate_session = True
@@ -387,6 +442,9 @@ class TTSProvider(TTSProviderBase):
             # 确保连接建立
             await self._ensure_connection()
 
+            # 本轮对话被打断时立即中止上游会话
+            self.conn.turn_token.register(self.abort_session)
+
             header = Header(
                 message_type=FULL_CLIENT_REQUEST,
                 message_type_specific_flags=MsgTypeFlagWithEvent,
@@ -449,6 +507,14 @@ class TTSProvider(TTSProviderBase):
             await self.close()
             raise
 
+    def abort_session(self):
+        """打断时立即取消上游会话；未开启连接复用时直接关闭连接"""
+        if self.enable_ws_reuse:
+            coro = self.cancel_session(self.conn.sentence_id)
+        else:
+            coro = self.close()
+        asyncio.run_coroutine_threadsafe(coro, loop=self.conn.loop)
+
     async def close(self):
         """资源清理方法"""
         self.activate_session = False
@@ -463,12 +529,21 @@ class TTSProvider(TTSProviderBase):
                 logger.bind(tag=TAG).warning(f"关闭时取消监听任务错误: {e}")
             self._monitor_task = None
 
-        if self.ws:
-            try:
-                await self.ws.close()
-            except:
-                pass
-            self.ws = None
+        await self._close_ws()
+
+    async def _close_ws(self):
+        """关闭当前连接；连接池模式下会话状态不确定，连接不再放回连接池"""
+        ws = self.ws
+        self.ws = None
+        if ws is None:
+            return
+        if self.ws_pool:
+            self.ws_pool.release(ws, reusable=False)
+            return
+        try:
+            await ws.close()
+        except:
+            pass
 
     async def _start_monitor_tts_response(self):
         """监听TTS响应 - 长期运行"""
@@ -496,6 +571,9 @@ class TTSProvider(TTSProviderBase):
                     if res.optional.event == EVENT_SessionCanceled:
                         logger.bind(tag=TAG).debug(f"释放服务端资源成功～～")
                         self.activate_session = False
+                        if self.ws_pool:
+                            self._release_to_pool()
+                            break
                     elif res.optional.event == EVENT_TTSSentenceStart:
                         json_data = json.loads(res.payload.decode("utf-8"))
                         self.tts_text = json_data.get("text", "")
@@ -514,6 +592,9 @@ class TTSProvider(TTSProviderBase):
                         logger.bind(tag=TAG).debug(f"会话结束～～")
                         self.activate_session = False
                         self._process_before_stop_play_files()
+                        if self.ws_pool:
+                            self._release_to_pool()
+                            break
                         # 非复用模式下，会话结束后发送 FinishConnection
                         if not self.enable_ws_reuse:
                             await self.finish_connection()
@@ -527,12 +608,7 @@ class TTSProvider(TTSProviderBase):
                     traceback.print_exc()
                     break
             # 连接异常时关闭WebSocket
-            if self.ws:
-                try:
-                    await self.ws.close()
-                except:
-                    pass
-                self.ws = None
+            await self._close_ws()
         # 监听任务退出时清理引用
         finally:
             self.activate_session = False
@@ -694,9 +770,10 @@ class TTSProvider(TTSProviderBase):
             list: 音频数据列表
         """
         try:
-            # 创建事件循环
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+            # 连接池绑定在连接的事件循环上，在该循环中执行才能借用预热的连接
+            pool_loop = None
+            if self.ws_pool and self.conn and self.conn.loop.is_running():
+                pool_loop = self.conn.loop
 
             # 生成会话ID
             session_id = uuid.uuid4().__str__().replace("-", "")
@@ -705,16 +782,12 @@ class TTSProvider(TTSProviderBase):
             audio_data = []
 
             async def _generate_audio():
-                # 创建新的WebSocket连接
-                ws_header = {
-                    "X-Api-App-Key": self.appId,
-                    "X-Api-Access-Key": self.access_token,
-                    "X-Api-Resource-Id": self.resource_id,
-                    "X-Api-Connect-Id": uuid.uuid4(),
-                }
-                ws = await websockets.connect(
-                    self.ws_url, additional_headers=ws_header, max_size=1000000000
-                )
+                if pool_loop:
+                    ws = await self.ws_pool.acquire()
+                else:
+                    # 创建新的WebSocket连接
+                    ws = await self._connect()
+                session_finished = False
 
                 try:
                     # 启动会话
@@ -768,18 +841,30 @@ class TTSProvider(TTSProviderBase):
                         ):
                             self.wav_to_opus_data_audio_raw_stream(res.payload, callback=lambda opus_frame: audio_data.append(opus_frame))
                         elif res.optional.event == EVENT_SessionFinished:
+                            session_finished = True
                             break
 
                 finally:
-                    # 清理资源
-                    try:
-                        await ws.close()
-                    except:
-                        pass
+                    if pool_loop:
+                        # 会话正常结束的连接归还给连接池
+                        self.ws_pool.release(ws, reusable=session_finished)
+                    else:
+                        # 清理资源
+                        try:
+                            await ws.close()
+                        except:
+                            pass
+
+            if pool_loop:
+                asyncio.run_coroutine_threadsafe(_generate_audio(), pool_loop).result()
+            else:
+                # 创建事件循环
+                loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(loop)
 
-            # 运行异步任务
-            loop.run_until_complete(_generate_audio())
-            loop.close()
+                # 运行异步任务
+                loop.run_until_complete(_generate_audio())
+                loop.close()
 
             return audio_data
 
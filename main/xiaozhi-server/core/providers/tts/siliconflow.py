@@ -1,4 +1,3 @@
-import requests
 from core.providers.tts.base import TTSProviderBase
 
 
@@ -31,8 +30,12 @@ class TTSProvider(TTSProviderBase):
             "Content-Type": "application/json",
         }
         try:
-            response = requests.request(
-                "POST", self.api_url, json=request_json, headers=headers
+            response = self.http_session.request(
+                "POST",
+                self.api_url,
+                json=request_json,
+                headers=headers,
+                timeout=self.http_timeout,
             )
             data = response.content
             if output_file:
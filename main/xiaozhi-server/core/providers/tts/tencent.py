@@ -4,7 +4,6 @@ import time
 import uuid
 import json
 import base64
-import requests
 from datetime import datetime, timezone
 from core.providers.tts.base import TTSProviderBase
 
@@ -134,8 +133,11 @@ class TTSProvider(TTSProviderBase):
             headers = self._get_auth_headers(request_json)
 
             # 发送请求
-            resp = requests.post(
-                self.api_url, json.dumps(request_json), headers=headers
+            resp = self.http_session.post(
+                self.api_url,
+                json.dumps(request_json),
+                headers=headers,
+                timeout=self.http_timeout,
             )
 
             # 检查响应
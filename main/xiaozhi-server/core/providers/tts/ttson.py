@@ -1,7 +1,6 @@
 import os
 import uuid
 import json
-import requests
 import shutil
 from datetime import datetime
 from core.providers.tts.base import TTSProviderBase
@@ -57,7 +56,9 @@ class TTSProvider(TTSProviderBase):
             }
         )
 
-        resp = requests.request("POST", url, data=payload)
+        resp = self.http_session.request(
+            "POST", url, data=payload, timeout=self.http_timeout
+        )
         if resp.status_code != 200:
             logger.bind(tag=TAG).error(f"TTSON 请求失败: {resp.text}")
             raise Exception(f"{__name__}: TTS请求失败")
@@ -73,7 +74,7 @@ class TTSProvider(TTSProviderBase):
                 + resp_json["voice_path"]
             )
 
-            audio_content = requests.get(result)
+            audio_content = self.http_session.get(result, timeout=self.http_timeout)
             if output_file:
                 with open(output_file, "wb") as f:
                     f.write(audio_content.content)
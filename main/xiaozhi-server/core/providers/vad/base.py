@@ -1,5 +1,17 @@
+import time
+import numpy as np
+import opuslib_next
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, List
+from config.logger import setup_logging
+from core.providers.vad.batch_scheduler import VADBatchScheduler
+
+TAG = __name__
+logger = setup_logging()
+
+# Silero模型每次推理的采样点数（16kHz）及上下文长度
+CHUNK_SAMPLES = 512
+CONTEXT_SAMPLES = 64
 
 
 class VADProviderBase(ABC):
@@ -7,3 +19,157 @@ class VADProviderBase(ABC):
     def is_vad(self, conn, data) -> bool:
         """检测音频数据中的语音活动"""
         pass
+
+    async def is_vad_async(self, conn, data) -> bool:
+        """异步检测接口，支持批量推理的实现可重写，默认直接调用is_vad"""
+        return self.is_vad(conn, data)
+
+    def release_conn_resources(self, conn):
+        """释放连接私有的VAD资源（解码器等），在连接关闭时调用"""
+        conn.vad_decoder = None
+        conn.vad_model_state = None
+
+
+class SileroVADProviderBase(VADProviderBase):
+    """Silero系列VAD的公共流程：Opus解码、512采样点分块、双阈值判断、可选批量推理
+
+    子类只需加载模型并实现 _infer_batch
+    """
+
+    def __init__(self, config):
+        # 处理空字符串的情况
+        threshold = config.get("threshold", "0.5")
+        threshold_low = config.get("threshold_low", "0.2")
+        min_silence_duration_ms = config.get("min_silence_duration_ms", "1000")
+
+        self.vad_threshold = float(threshold) if threshold else 0.5
+        self.vad_threshold_low = float(threshold_low) if threshold_low else 0.2
+
+        self.silence_threshold_ms = (
+            int(min_silence_duration_ms) if min_silence_duration_ms else 1000
+        )
+
+        # 至少要多少帧才算有语音
+        self.frame_window_threshold = 3
+
+        # 跨连接批量推理（可选）
+        self.batch_scheduler = None
+        if config.get("batch_inference", False):
+            self.batch_scheduler = VADBatchScheduler(
+                self._infer_batch,
+                batch_window_ms=int(config.get("batch_window_ms", 10)),
+                max_batch_size=int(config.get("max_batch_size", 64)),
+            )
+
+    @abstractmethod
+    def _infer_batch(self, conns, chunks: List[np.ndarray]) -> List[float]:
+        """批量推理，每个连接使用自己的循环状态（conn.vad_model_state）
+
+        Args:
+            conns: 连接列表，同一批次内不重复
+            chunks: 与连接一一对应的float32音频块（512个采样点）
+
+        Returns:
+            List[float]: 每个音频块的语音概率
+        """
+        pass
+
+    def _get_decoder(self, conn):
+        """获取连接私有的Opus解码器，首次收到音频时创建
+
+        Opus解码器带有预测状态，不能在多个连接之间共享，
+        模型本身仍由所有连接共用
+        """
+        if conn.vad_decoder is None:
+            conn.vad_decoder = opuslib_next.Decoder(16000, 1)
+        return conn.vad_decoder
+
+    def _next_chunk(self, conn) -> Optional[np.ndarray]:
+        """从缓冲区取出下一块512采样点的音频，不足时返回None"""
+        if len(conn.client_audio_buffer) < CHUNK_SAMPLES:
+            return None
+        # 提取前512个采样点，环形缓冲区只移动读指针，不拷贝剩余数据
+        audio_int16 = conn.client_audio_buffer.read(CHUNK_SAMPLES)
+
+        # 转换为模型需要的格式
+        return np.divide(audio_int16, 32768.0, dtype=np.float32)
+
+    def _update_voice_state(self, conn, speech_prob) -> bool:
+        """根据语音概率更新连接的VAD状态，返回滑动窗口内是否有声音"""
+        # 双阈值判断
+        if speech_prob >= self.vad_threshold:
+            is_voice = True
+        elif speech_prob <= self.vad_threshold_low:
+            is_voice = False
+        else:
+            is_voice = conn.last_is_voice
+
+        # 声音没低于最低值则延续前一个状态，判断为有声音
+        conn.last_is_voice = is_voice
+
+        # 更新滑动窗口
+        conn.client_voice_window.append(is_voice)
+        client_have_voice = (
+            conn.client_voice_window.count(True) >= self.frame_window_threshold
+        )
+
+        # 如果之前有声音，但本次没有声音，且与上次有声音的时间差已经超过了静默阈值，则认为已经说完一句话
+        if conn.client_have_voice and not client_have_voice:
+            stop_duration = time.time() * 1000 - conn.last_activity_time
+            if stop_duration >= self.silence_threshold_ms:
+                conn.client_voice_stop = True
+        if client_have_voice:
+            conn.client_have_voice = True
+            conn.last_activity_time = time.time() * 1000
+
+        return client_have_voice
+
+    def is_vad(self, conn, opus_packet):
+        # 手动模式：直接返回True，不进行实时VAD检测，所有音频都缓存
+        if conn.client_listen_mode == "manual":
+            return True
+
+        try:
+            pcm_frame = self._get_decoder(conn).decode(opus_packet, 960)
+            conn.client_audio_buffer.extend(pcm_frame)  # 将新数据加入缓冲区
+
+            # 处理缓冲区中的完整帧（每次处理512采样点）
+            client_have_voice = False
+            while True:
+                chunk = self._next_chunk(conn)
+                if chunk is None:
+                    break
+                speech_prob = self._infer_batch([conn], [chunk])[0]
+                client_have_voice = self._update_voice_state(conn, speech_prob)
+
+            return client_have_voice
+        except opuslib_next.OpusError as e:
+            logger.bind(tag=TAG).info(f"解码错误: {e}")
+        except Exception as e:
+            logger.bind(tag=TAG).error(f"Error processing audio packet: {e}")
+
+    async def is_vad_async(self, conn, opus_packet):
+        if self.batch_scheduler is None:
+            return self.is_vad(conn, opus_packet)
+
+        if conn.client_listen_mode == "manual":
+            return True
+
+        try:
+            pcm_frame = self._get_decoder(conn).decode(opus_packet, 960)
+            conn.client_audio_buffer.extend(pcm_frame)
+
+            # 音频块交给调度器，与其他连接的音频块合并推理
+            client_have_voice = False
+            while True:
+                chunk = self._next_chunk(conn)
+                if chunk is None:
+                    break
+                speech_prob = await self.batch_scheduler.submit(conn, chunk)
+                client_have_voice = self._update_voice_state(conn, speech_prob)
+
+            return client_have_voice
+        except opuslib_next.OpusError as e:
+            logger.bind(tag=TAG).info(f"解码错误: {e}")
+        except Exception as e:
+            logger.bind(tag=TAG).error(f"Error processing audio packet: {e}")
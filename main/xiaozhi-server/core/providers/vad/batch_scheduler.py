@@ -0,0 +1,49 @@
+"""
+VAD批量推理调度器
+收集同一时间窗口内所有连接待推理的音频块，合并为一次批量前向计算，
+每个连接的循环状态由推理函数自行读写，调度器只负责攒批和结果分发
+"""
+
+from core.utils.micro_batch import MicroBatchQueue
+
+
+class VADBatchScheduler(MicroBatchQueue):
+    """跨连接的VAD批量推理调度器"""
+
+    def __init__(self, infer_batch, batch_window_ms=10, max_batch_size=64):
+        """
+        Args:
+            infer_batch: 批量推理函数 def(conns, chunks) -> List[float]，
+                         同一批次内每个连接最多出现一次
+            batch_window_ms: 攒批等待时间（毫秒）
+            max_batch_size: 单次前向的最大批大小
+        """
+        self.infer_batch = infer_batch
+        super().__init__(
+            self._process_batch,
+            batch_window_ms=batch_window_ms,
+            max_batch_size=max_batch_size,
+            name="vad-batch",
+        )
+
+    def _process_batch(self, items):
+        conns = [conn for conn, _ in items]
+        chunks = [chunk for _, chunk in items]
+        return self.infer_batch(conns, chunks)
+
+    async def submit(self, conn, chunk) -> float:
+        """提交一个音频块，等待批量推理完成后返回语音概率"""
+        return await super().submit((conn, chunk))
+
+    def _take_batch(self):
+        """同一连接的后续音频块留到下一批（循环状态需要顺序更新）"""
+        batch, rest, seen = [], [], set()
+        for pending_item in self.pending:
+            conn_id = id(pending_item[0][0])
+            if len(batch) < self.max_batch_size and conn_id not in seen:
+                seen.add(conn_id)
+                batch.append(pending_item)
+            else:
+                rest.append(pending_item)
+        self.pending = rest
+        return batch
@@ -0,0 +1,59 @@
+import os
+import numpy as np
+import onnxruntime
+from config.logger import setup_logging
+from core.providers.vad.base import SileroVADProviderBase, CONTEXT_SAMPLES
+
+TAG = __name__
+logger = setup_logging()
+
+
+class VADProvider(SileroVADProviderBase):
+    """使用onnxruntime在CPU上运行Silero VAD，不依赖torch"""
+
+    def __init__(self, config):
+        logger.bind(tag=TAG).info("SileroVAD(ONNX)", config)
+        model_path = config.get("model_path") or os.path.join(
+            config["model_dir"], "src", "silero_vad", "data", "silero_vad.onnx"
+        )
+
+        opts = onnxruntime.SessionOptions()
+        opts.inter_op_num_threads = 1
+        opts.intra_op_num_threads = int(config.get("num_threads", 1))
+        self.session = onnxruntime.InferenceSession(
+            model_path, sess_options=opts, providers=["CPUExecutionProvider"]
+        )
+        self.sample_rate = np.array(16000, dtype=np.int64)
+        super().__init__(config)
+
+    def _infer_batch(self, conns, chunks):
+        states, contexts = [], []
+        for conn in conns:
+            if conn.vad_model_state is None:
+                conn.vad_model_state = (
+                    np.zeros((2, 1, 128), dtype=np.float32),
+                    np.zeros((1, CONTEXT_SAMPLES), dtype=np.float32),
+                )
+            state, context = conn.vad_model_state
+            states.append(state)
+            contexts.append(context)
+
+        # 输入需要带上每个连接上一块音频的最后64个采样点作为上下文
+        audio = np.concatenate(
+            [np.concatenate(contexts, axis=0), np.stack(chunks)], axis=1
+        )
+        out, new_state = self.session.run(
+            None,
+            {
+                "input": audio,
+                "state": np.concatenate(states, axis=1),
+                "sr": self.sample_rate,
+            },
+        )
+
+        for i, conn in enumerate(conns):
+            conn.vad_model_state = (
+                new_state[:, i : i + 1].copy(),
+                audio[i : i + 1, -CONTEXT_SAMPLES:].copy(),
+            )
+        return out[:, 0].tolist()
@@ -7,22 +7,106 @@ TAG = __name__
 logger = setup_logging()
 
 
+class AudioPacingScheduler:
+    """
+    进程级音频发送调度器（哈希时间轮）
+    所有连接共用一个定时器，每个tick统一唤醒到期的速率控制器，
+    避免每个连接为每个音频包各自注册定时器
+    """
+
+    def __init__(self, tick_ms=5, slot_count=256):
+        """
+        Args:
+            tick_ms: 时间轮刻度（毫秒）
+            slot_count: 时间轮槽位数量
+        """
+        self.tick = tick_ms / 1000
+        # 按最近的tick唤醒，允许提前半个tick发送
+        self.tolerance = self.tick / 2
+        self.slot_count = slot_count
+        self.slots = [[] for _ in range(slot_count)]
+        self.scheduled_count = 0
+        self.origin = time.monotonic()  # 第0个tick对应的时间
+        self.current_tick = 0  # 已处理到的tick
+        self.run_task = None
+
+    def schedule(self, controller, due_time):
+        """在离 due_time（time.monotonic 时间）最近的tick唤醒控制器"""
+        tick_index = round((due_time - self.origin) / self.tick)
+        tick_index = max(tick_index, self.current_tick + 1)
+        self.slots[tick_index % self.slot_count].append(
+            (tick_index, controller, controller.generation)
+        )
+        self.scheduled_count += 1
+        if self.run_task is None or self.run_task.done():
+            self.run_task = asyncio.get_running_loop().create_task(self._run())
+
+    def _advance(self, now_tick):
+        """处理 current_tick 到 now_tick 之间的所有槽位，返回到期的条目"""
+        due = []
+        # 落后超过一圈时只需要完整扫描一圈
+        last_tick = min(now_tick, self.current_tick + self.slot_count)
+        for tick_index in range(self.current_tick + 1, last_tick + 1):
+            slot = self.slots[tick_index % self.slot_count]
+            if not slot:
+                continue
+            remaining = []
+            for entry in slot:
+                if entry[0] <= now_tick:
+                    due.append(entry)
+                else:
+                    # 还要再转几圈才到期
+                    remaining.append(entry)
+            self.slots[tick_index % self.slot_count] = remaining
+        self.current_tick = now_tick
+        self.scheduled_count -= len(due)
+        return due
+
+    async def _run(self):
+        try:
+            while self.scheduled_count > 0:
+                next_tick_time = self.origin + (self.current_tick + 1) * self.tick
+                delay = next_tick_time - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                now_tick = int((time.monotonic() - self.origin) / self.tick)
+                for _, controller, generation in self._advance(now_tick):
+                    controller._on_due(generation)
+        except asyncio.CancelledError:
+            logger.bind(tag=TAG).debug("音频发送调度器已停止")
+        except Exception as e:
+            logger.bind(tag=TAG).error(f"音频发送调度器异常: {e}")
+
+
+# 所有连接共享的调度器
+pacing_scheduler = AudioPacingScheduler()
+
+
 class AudioRateController:
     """
     音频速率控制器 - 按照60ms帧时长精确控制音频发送
     解决高并发下的时间累积误差问题
+    发送时间由进程级调度器统一驱动，连接本身不再常驻后台任务
     """
 
-    def __init__(self, frame_duration=60):
+    def __init__(self, frame_duration=60, scheduler=None):
         """
         Args:
             frame_duration: 单个音频帧时长（毫秒），默认60ms
+            scheduler: 发送调度器，默认使用进程级共享调度器
         """
         self.frame_duration = frame_duration
+        self.scheduler = scheduler or pacing_scheduler
         self.queue = deque()
+        self.queued_bytes = 0  # 队列中音频包的总字节数，用于背压判断
         self.play_position = 0  # 虚拟播放位置（毫秒）
         self.start_timestamp = None  # 开始时间戳（只读，不修改）
-        self.pending_send_task = None
+        self.send_audio_callback = None
+        self.send_bundle_callback = None  # 同一时刻到期的多个音频包一次发送
+        self.sending = False  # 是否处于发送状态，发送失败或被中止后变为False
+        self.drain_task = None  # 正在执行的发送任务
+        self.scheduled = False  # 是否已在调度器中等待
+        self.generation = 0  # 重置后递增，使调度器中的旧条目失效
         self.logger = logger
         self.queue_empty_event = asyncio.Event()  # 队列清空事件
         self.queue_empty_event.set()  # 初始为空状态
@@ -30,11 +114,10 @@ class AudioRateController:
 
     def reset(self):
         """重置控制器状态"""
-        if self.pending_send_task and not self.pending_send_task.done():
-            self.pending_send_task.cancel()
-            # 取消任务后，任务会在下次事件循环时清理，无需阻塞等待
+        self._stop()
 
         self.queue.clear()
+        self.queued_bytes = 0
         self.play_position = 0
         self.start_timestamp = None  # 由首个音频包设置
         # 相关事件处理
@@ -44,9 +127,11 @@ class AudioRateController:
     def add_audio(self, opus_packet):
         """添加音频包到队列"""
         self.queue.append(("audio", opus_packet))
+        self.queued_bytes += len(opus_packet)
         # 相关事件处理
         self.queue_empty_event.clear()
         self.queue_has_data_event.set()
+        self._kick()
 
     def add_message(self, message_callback):
         """
@@ -59,6 +144,7 @@ class AudioRateController:
         # 相关事件处理
         self.queue_empty_event.clear()
         self.queue_has_data_event.set()
+        self._kick()
 
     def _get_elapsed_ms(self):
         """获取已经过的时间（毫秒）"""
@@ -66,9 +152,57 @@ class AudioRateController:
             return 0
         return (time.monotonic() - self.start_timestamp) * 1000
 
+    def _head_due_time(self):
+        """队首条目的发送时间（time.monotonic 时间），消息和首个音频包立即发送"""
+        if self.queue[0][0] == "message" or self.start_timestamp is None:
+            return time.monotonic()
+        return self.start_timestamp + self.play_position / 1000
+
+    def _kick(self):
+        """队首到期则立即发送，否则交给调度器在到期时唤醒"""
+        if not self.sending or self.scheduled or not self.queue:
+            return
+        if self.drain_task and not self.drain_task.done():
+            return
+        due_time = self._head_due_time()
+        if due_time <= time.monotonic() + self.scheduler.tolerance:
+            self.drain_task = asyncio.create_task(self._drain())
+        else:
+            self.scheduled = True
+            self.scheduler.schedule(self, due_time)
+
+    def _on_due(self, generation):
+        """调度器回调：队首已到发送时间"""
+        if generation != self.generation:
+            return
+        self.scheduled = False
+        self._kick()
+
+    async def _drain(self):
+        """发送所有已到期的消息和音频包，保持队列顺序"""
+        try:
+            await self.check_queue(self.send_audio_callback)
+        except asyncio.CancelledError:
+            self.logger.bind(tag=TAG).debug("音频发送任务被取消")
+            self.sending = False
+            return
+        except Exception as e:
+            self.logger.bind(tag=TAG).error(f"音频发送循环异常: {e}")
+            self.sending = False
+            return
+
+        if self.queue:
+            # 队首还没到时间，等待调度器唤醒
+            self.scheduled = True
+            self.scheduler.schedule(self, self._head_due_time())
+        else:
+            # 队列处理完后清除事件
+            self.queue_empty_event.set()
+            self.queue_has_data_event.clear()
+
     async def check_queue(self, send_audio_callback):
         """
-        检查队列并按时发送音频/消息
+        按顺序发送队列中已到期的音频/消息，遇到未到期的音频包即返回
 
         Args:
             send_audio_callback: 发送音频的回调函数 async def(opus_packet)
@@ -91,70 +225,62 @@ class AudioRateController:
                 if self.start_timestamp is None:
                     self.start_timestamp = time.monotonic()
 
-                _, opus_packet = item
-
-                # 循环等待直到时间到达
-                while True:
-                    # 计算时间差
-                    elapsed_ms = self._get_elapsed_ms()
-                    output_ms = self.play_position
-
-                    if elapsed_ms < output_ms:
-                        # 还不到发送时间，计算等待时长
-                        wait_ms = output_ms - elapsed_ms
-
-                        # 等待后继续检查（允许被中断）
-                        try:
-                            await asyncio.sleep(wait_ms / 1000)
-                        except asyncio.CancelledError:
-                            self.logger.bind(tag=TAG).debug("音频发送任务被取消")
-                            raise
-                        # 等待结束后重新检查时间（循环回到 while True）
-                    else:
-                        # 时间已到，跳出等待循环
-                        break
+                # 取出所有已到期的连续音频包（允许调度器半个tick的提前量）
+                tolerance_ms = self.scheduler.tolerance * 1000
+                opus_packets = []
+                while (
+                    self.queue
+                    and self.queue[0][0] == "audio"
+                    and self._get_elapsed_ms() + tolerance_ms >= self.play_position
+                ):
+                    opus_packet = self.queue.popleft()[1]
+                    self.queued_bytes -= len(opus_packet)
+                    opus_packets.append(opus_packet)
+                    self.play_position += self.frame_duration
+
+                # 还不到发送时间，交还给调度器
+                if not opus_packets:
+                    return
 
-                # 时间已到，从队列移除并发送
-                self.queue.popleft()
-                self.play_position += self.frame_duration
                 try:
-                    await send_audio_callback(opus_packet)
+                    if self.send_bundle_callback and len(opus_packets) > 1:
+                        await self.send_bundle_callback(opus_packets)
+                    else:
+                        for opus_packet in opus_packets:
+                            await send_audio_callback(opus_packet)
                 except Exception as e:
                     self.logger.bind(tag=TAG).error(f"发送音频失败: {e}")
                     raise
 
-        # 队列处理完后清除事件
-        self.queue_empty_event.set()
-        self.queue_has_data_event.clear()
+    def is_sending(self):
+        """发送是否在进行中（发送失败或被中止、重置后为False）"""
+        return self.sending
 
-    def start_sending(self, send_audio_callback):
+    def start_sending(self, send_audio_callback, send_bundle_callback=None):
         """
-        启动异步发送任务
+        启动发送，之后加入队列的数据由调度器按时发送
 
         Args:
             send_audio_callback: 发送音频的回调函数
-
-        Returns:
-            asyncio.Task: 发送任务
+            send_bundle_callback: 一次发送多个音频包的回调函数 async def(opus_packets)，可选
         """
+        self.send_audio_callback = send_audio_callback
+        self.send_bundle_callback = send_bundle_callback
+        self.sending = True
+        self._kick()
 
-        async def _send_loop():
-            try:
-                while True:
-                    # 等待队列数据事件，不轮询等待占用CPU
-                    await self.queue_has_data_event.wait()
-
-                    await self.check_queue(send_audio_callback)
-            except asyncio.CancelledError:
-                self.logger.bind(tag=TAG).debug("音频发送循环已停止")
-            except Exception as e:
-                self.logger.bind(tag=TAG).error(f"音频发送循环异常: {e}")
-
-        self.pending_send_task = asyncio.create_task(_send_loop())
-        return self.pending_send_task
+    def _stop(self):
+        self.sending = False
+        self.scheduled = False
+        # 调度器中的旧条目随之失效
+        self.generation += 1
+        if self.drain_task and not self.drain_task.done():
+            self.drain_task.cancel()
+            # 取消任务后，任务会在下次事件循环时清理，无需阻塞等待
+        self.drain_task = None
 
     def stop_sending(self):
-        """停止发送任务"""
-        if self.pending_send_task and not self.pending_send_task.done():
-            self.pending_send_task.cancel()
-            self.logger.bind(tag=TAG).debug("已取消音频发送任务")
+        """停止发送"""
+        if self.sending:
+            self._stop()
+            self.logger.bind(tag=TAG).debug("已停止音频发送")
@@ -0,0 +1,50 @@
+import threading
+from config.logger import setup_logging
+
+TAG = __name__
+logger = setup_logging()
+
+
+class CancellationToken:
+    """
+    一轮对话的取消令牌
+    LLM流式响应、TTS上游请求等在开始时登记取消回调，打断时 cancel() 依次执行，
+    不必等到处理下一个数据块时才发现打断标志
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._callbacks = []
+        self.cancelled = False
+
+    def register(self, callback):
+        """登记取消回调，同一回调只登记一次；令牌已取消时立即执行"""
+        with self._lock:
+            if not self.cancelled:
+                if callback not in self._callbacks:
+                    self._callbacks.append(callback)
+                return
+        self._invoke(callback)
+
+    def unregister(self, callback):
+        """请求正常结束后注销回调"""
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def cancel(self):
+        """取消本轮对话，可在任意线程中调用"""
+        with self._lock:
+            if self.cancelled:
+                return
+            self.cancelled = True
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            self._invoke(callback)
+
+    @staticmethod
+    def _invoke(callback):
+        try:
+            callback()
+        except Exception as e:
+            logger.bind(tag=TAG).warning(f"执行取消回调失败: {e}")
@@ -0,0 +1,97 @@
+import math
+import time
+import asyncio
+from collections import deque
+from config.logger import setup_logging
+
+TAG = __name__
+logger = setup_logging()
+
+
+class DeliveryJitterEstimator:
+    """
+    连接下行链路的投递抖动估计，用于确定每句开头直接发送的预缓冲包数量
+    抖动来自三方面：websocket ping 往返时间的变化（RFC 3550 方式平滑），
+    最近若干次往返时间超出最小值的最大值（捕捉偶发的重传卡顿），
+    以及发送音频时等待写缓冲排空的时间
+    """
+
+    def __init__(
+        self,
+        frame_duration=60,
+        default_count=5,
+        min_count=2,
+        max_count=10,
+        probe_interval=2.0,
+        probe_timeout=2.0,
+        window=20,
+    ):
+        """
+        Args:
+            frame_duration: 音频帧时长（毫秒）
+            default_count: 尚未测得链路状况时的预缓冲包数
+            min_count: 预缓冲包数下限
+            max_count: 预缓冲包数上限
+            probe_interval: 两次ping探测的最小间隔（秒）
+            probe_timeout: ping超时时间（秒），超时按该值记为一次往返
+            window: 计算往返时间峰值时保留的最近样本数
+        """
+        self.frame_duration = frame_duration
+        self.default_count = default_count
+        self.min_count = min_count
+        self.max_count = max_count
+        self.probe_interval = probe_interval
+        self.probe_timeout = probe_timeout
+        self.rtt = None  # 最近一次往返时间（秒）
+        self.min_rtt = None  # 最小往返时间（秒），视为链路基础时延
+        self.jitter = 0.0  # 往返时间平滑抖动（秒）
+        self.excess_samples = deque(maxlen=window)  # 最近的往返时间超出最小值的部分（秒）
+        self.send_stall = 0.0  # 发送等待写缓冲排空的平滑时间（秒）
+        self.last_probe_time = 0.0
+        self.probe_task = None
+
+    def add_rtt(self, rtt):
+        """记录一次往返时间"""
+        if self.rtt is None:
+            # 首个样本：没有可比较的前值，保守地按单程时延估计
+            self.jitter = rtt / 2
+            self.min_rtt = rtt
+        else:
+            self.jitter += (abs(rtt - self.rtt) - self.jitter) / 8
+            self.min_rtt = min(self.min_rtt, rtt)
+        self.excess_samples.append(rtt - self.min_rtt)
+        self.rtt = rtt
+
+    def add_send_stall(self, seconds):
+        """记录一次发送耗时，只有写缓冲积压时才会明显大于0"""
+        self.send_stall += (seconds - self.send_stall) / 8
+
+    def pre_buffer_count(self):
+        """按当前估计的抖动计算预缓冲包数，覆盖4倍平滑抖动与2倍峰值中的较大者，再加上写缓冲等待"""
+        if self.rtt is None:
+            return self.default_count
+        # ping落在卡顿中时只能测到卡顿剩余的部分，平均约为一半，因此按两倍峰值覆盖
+        peak_excess = max(self.excess_samples)
+        cover_ms = (max(4 * self.jitter, 2 * peak_excess) + self.send_stall) * 1000
+        count = math.ceil(cover_ms / self.frame_duration) + 1
+        return min(max(count, self.min_count), self.max_count)
+
+    def maybe_probe(self, websocket):
+        """距上次探测超过间隔时，在后台发送一次ping"""
+        if self.probe_task and not self.probe_task.done():
+            return
+        now = time.monotonic()
+        if now - self.last_probe_time < self.probe_interval:
+            return
+        self.last_probe_time = now
+        self.probe_task = asyncio.create_task(self._probe(websocket))
+
+    async def _probe(self, websocket):
+        try:
+            pong_waiter = await websocket.ping()
+            rtt = await asyncio.wait_for(pong_waiter, self.probe_timeout)
+            self.add_rtt(rtt)
+        except asyncio.TimeoutError:
+            self.add_rtt(self.probe_timeout)
+        except Exception as e:
+            logger.bind(tag=TAG).debug(f"链路探测失败: {e}")
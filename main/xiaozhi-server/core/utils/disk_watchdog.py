@@ -0,0 +1,66 @@
+"""
+磁盘空间看门狗
+后台线程定期刷新各目录的剩余空间，业务代码直接读取缓存值，
+避免每次识别都调用 shutil.disk_usage
+"""
+
+import os
+import shutil
+import threading
+from typing import Dict
+from config.logger import setup_logging
+
+TAG = __name__
+logger = setup_logging()
+
+
+class DiskSpaceWatchdog:
+    """定期刷新被监控目录剩余空间的后台线程"""
+
+    def __init__(self, interval=5):
+        self.interval = interval
+        self._free_space: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def _refresh(self, path):
+        try:
+            free = shutil.disk_usage(path).free
+        except OSError as e:
+            logger.bind(tag=TAG).warning(f"获取磁盘空间失败: {path}, {e}")
+            return
+        with self._lock:
+            self._free_space[path] = free
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            with self._lock:
+                paths = list(self._free_space.keys())
+            for path in paths:
+                self._refresh(path)
+
+    def get_free(self, path) -> int:
+        """返回目录剩余空间（字节），首次查询的目录会同步获取一次并加入监控"""
+        path = os.path.abspath(path)
+        with self._lock:
+            free = self._free_space.get(path)
+        if free is not None:
+            return free
+
+        self._refresh(path)
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="disk-watchdog", daemon=True
+                )
+                self._thread.start()
+            # 获取失败时不阻止写入，交给实际的文件操作报错
+            return self._free_space.get(path, float("inf"))
+
+    def stop(self):
+        self._stop_event.set()
+
+
+# 进程内共享的看门狗实例
+disk_space_watchdog = DiskSpaceWatchdog()
@@ -0,0 +1,96 @@
+import time
+import asyncio
+from config.logger import setup_logging
+from core.utils.util import audio_to_data
+
+TAG = __name__
+logger = setup_logging()
+
+
+class FillerAudioCache:
+    """首句等待提示音的opus缓存，每个文件只编码一次，常驻内存供所有连接共用"""
+
+    def __init__(self):
+        self.clips = {}
+        self._lock = asyncio.Lock()
+
+    async def get(self, files):
+        """返回文件列表对应的opus包列表，未编码的文件在此编码"""
+        missing = [path for path in files if path not in self.clips]
+        if missing:
+            async with self._lock:
+                for path in missing:
+                    if path in self.clips:
+                        continue
+                    try:
+                        self.clips[path] = await audio_to_data(path, use_cache=False)
+                    except Exception as e:
+                        logger.bind(tag=TAG).error(f"加载首句等待提示音失败 {path}: {e}")
+                        self.clips[path] = []
+        return [self.clips[path] for path in files if self.clips[path]]
+
+
+filler_audio_cache = FillerAudioCache()
+
+
+class FillerAudio:
+    """
+    连接的首句等待提示音状态
+    每轮对话开始时 start_turn()，任意真实语音（或句子消息）到达时 on_real_audio()，
+    提示音只在阈值到期且本轮仍未有真实语音时播放，真实语音到达后立即停止
+    """
+
+    def __init__(self):
+        self.turn = 0
+        self.task = None
+        self.turn_start = None
+        self.filler_start = None
+        self.waiting = False  # 本轮是否仍在等待首句语音
+        self.playing = False
+        # 统计
+        self.turns = 0
+        self.fired = 0
+        self.truncated = 0
+        self.saved_ms = 0.0
+
+    def start_turn(self):
+        """开始新一轮对话，返回本轮编号"""
+        self.turn += 1
+        self.turns += 1
+        self.turn_start = time.monotonic()
+        self.filler_start = None
+        self.waiting = True
+        self.playing = False
+        return self.turn
+
+    def should_fire(self, turn):
+        return self.waiting and turn == self.turn
+
+    def on_filler_start(self):
+        self.fired += 1
+        self.playing = True
+        self.filler_start = time.monotonic()
+
+    def on_filler_end(self):
+        self.playing = False
+
+    def on_real_audio(self):
+        """本轮首个真实语音到达，记录提示音节省的感知时延"""
+        if not self.waiting:
+            return
+        self.waiting = False
+        if self.filler_start is not None:
+            # 没有提示音时用户要多等这一段静音
+            self.saved_ms += (time.monotonic() - self.filler_start) * 1000
+            if self.playing:
+                self.truncated += 1
+
+    def get_metrics(self):
+        return {
+            "turns": self.turns,
+            "fired": self.fired,
+            "fire_rate": round(self.fired / self.turns, 3) if self.turns else 0.0,
+            "truncated": self.truncated,
+            "saved_ms_total": round(self.saved_ms),
+            "saved_ms_avg": round(self.saved_ms / self.fired) if self.fired else 0,
+        }
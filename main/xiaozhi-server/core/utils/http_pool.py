@@ -0,0 +1,68 @@
+"""
+TTS共用的HTTP连接池
+同步请求（requests）使用进程内共享的keep-alive会话，按主机限制保留的空闲连接数；
+异步请求（aiohttp）的会话绑定在事件循环上，由每个TTS提供者在自己的常驻事件循环中创建并跨句复用
+"""
+
+import threading
+import aiohttp
+import requests
+from http.cookiejar import DefaultCookiePolicy
+from requests.adapters import HTTPAdapter
+
+DEFAULT_MAX_CONNECTIONS_PER_HOST = 16
+DEFAULT_KEEPALIVE_TIMEOUT = 60
+DEFAULT_REQUEST_TIMEOUT = 30
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _pool_options(config):
+    pool_config = (config or {}).get("tts_http_pool") or {}
+    return (
+        int(pool_config.get("max_connections_per_host", DEFAULT_MAX_CONNECTIONS_PER_HOST)),
+        float(pool_config.get("keepalive_timeout", DEFAULT_KEEPALIVE_TIMEOUT)),
+        float(pool_config.get("request_timeout", DEFAULT_REQUEST_TIMEOUT)),
+    )
+
+
+def get_http_session(config=None) -> requests.Session:
+    """
+    返回进程内共享的requests会话，首次调用时按配置创建
+    每个主机最多保留 max_connections_per_host 条keep-alive连接；并发超出时临时新建连接，
+    用完即关闭，不排队等待，个别上游请求卡住不会阻塞其他设备
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                max_connections, _, _ = _pool_options(config)
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=32,  # 缓存的主机连接池个数
+                    pool_maxsize=max_connections,
+                    pool_block=False,
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                # 不同设备、不同密钥共用会话，不保存cookie
+                session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+                _session = session
+    return _session
+
+
+def create_aiohttp_session(config=None) -> aiohttp.ClientSession:
+    """在当前事件循环中创建keep-alive的aiohttp会话，调用方负责在该事件循环中关闭"""
+    max_connections, keepalive_timeout, _ = _pool_options(config)
+    connector = aiohttp.TCPConnector(
+        limit_per_host=max_connections, keepalive_timeout=keepalive_timeout
+    )
+    return aiohttp.ClientSession(
+        connector=connector, cookie_jar=aiohttp.DummyCookieJar()
+    )
+
+
+def get_http_timeout(config=None) -> float:
+    """同步HTTP请求的超时时间（秒），共享会话上的请求都要显式传入"""
+    return _pool_options(config)[2]
@@ -0,0 +1,178 @@
+import heapq
+from config.logger import setup_logging
+
+TAG = __name__
+logger = setup_logging()
+
+
+class AudioJitterBuffer:
+    """
+    带时间戳音频包的抖动缓冲区（按时间戳的最小堆）
+    连续到达的包立即放行，不增加延迟；出现缺口时最多暂存 target_depth 个包等待缺失的包，
+    超过后跳过缺口继续放行。target_depth 根据观察到的乱序程度自适应调整
+    """
+
+    def __init__(
+        self,
+        frame_duration=60,
+        min_depth=0,
+        max_depth=5,
+        decay_packets=50,
+        resync_ms=2000,
+    ):
+        """
+        Args:
+            frame_duration: 单个音频包时长（毫秒）
+            min_depth: 最小目标深度（包数）
+            max_depth: 最大目标深度（包数），即出现缺口时最多等待的包数
+            decay_packets: 连续这么多包没有乱序后，目标深度减一
+            resync_ms: 时间戳跳变超过该值时认为时间线重置，清空缓冲重新开始
+        """
+        self.frame_duration = frame_duration
+        self.min_depth = min_depth
+        self.max_depth = max_depth
+        self.decay_packets = decay_packets
+        self.resync_ms = resync_ms
+        # 相邻包时间戳允许半帧误差
+        self.max_step = frame_duration * 1.5
+        self.target_depth = min_depth
+        self.heap = []
+        self.buffered = set()  # 缓冲中的时间戳，用于识别重复包
+        self.push_count = 0  # 相同时间戳时保持到达顺序
+        self.last_released = None  # 最后放行的时间戳
+        self.max_seen = None  # 已到达的最大时间戳
+        self.in_order_streak = 0
+        self.reset_metrics()
+
+    def reset_metrics(self):
+        self.packets = 0  # 收到的包数
+        self.reorders = 0  # 乱序到达的包数
+        self.late_drops = 0  # 到达时已经错过放行时机而丢弃的包数
+        self.duplicates = 0  # 重复的包数
+        self.gaps = 0  # 等待超时后跳过的缺失包数
+        self.resyncs = 0  # 时间线重置次数
+
+    def get_metrics(self):
+        return {
+            "packets": self.packets,
+            "reorders": self.reorders,
+            "late_drops": self.late_drops,
+            "duplicates": self.duplicates,
+            "gaps": self.gaps,
+            "resyncs": self.resyncs,
+            "target_depth": self.target_depth,
+            "buffered": len(self.heap),
+        }
+
+    def push(self, timestamp, audio_data):
+        """
+        放入一个音频包，返回按时间戳顺序可以放行的音频数据列表
+
+        Args:
+            timestamp: 时间戳（毫秒）
+            audio_data: 音频数据
+        """
+        self.packets += 1
+
+        if self._need_resync(timestamp):
+            # 时间线重置：先按顺序放行缓冲中的包，再从新时间戳开始
+            released = self.flush()
+            self.resyncs += 1
+            self.last_released = None
+            self.max_seen = None
+            self._push(timestamp, audio_data)
+            released.extend(self._release())
+            return released
+
+        if timestamp == self.last_released or timestamp in self.buffered:
+            self.duplicates += 1
+            return []
+
+        if self.max_seen is not None and timestamp < self.max_seen:
+            self.reorders += 1
+            self._on_reorder(timestamp)
+        else:
+            self._on_in_order()
+
+        if self.last_released is not None and timestamp < self.last_released:
+            # 缺口已经被跳过，丢弃以保持顺序（目标深度已随之调高）
+            self.late_drops += 1
+            return []
+
+        if not self.heap and (
+            self.last_released is None
+            or timestamp - self.last_released <= self.max_step
+        ):
+            # 常见情况：缓冲为空且与上一个包连续，直接放行
+            self.last_released = timestamp
+            self.max_seen = timestamp
+            return [audio_data]
+
+        self._push(timestamp, audio_data)
+        return self._release()
+
+    def flush(self):
+        """按时间戳顺序放行缓冲中的所有包"""
+        released = []
+        while self.heap:
+            timestamp, _, audio_data = heapq.heappop(self.heap)
+            self.last_released = timestamp
+            released.append(audio_data)
+        self.buffered.clear()
+        return released
+
+    def _need_resync(self, timestamp):
+        reference = self.max_seen if self.max_seen is not None else self.last_released
+        if reference is None:
+            return False
+        return abs(timestamp - reference) > self.resync_ms
+
+    def _push(self, timestamp, audio_data):
+        self.push_count += 1
+        heapq.heappush(self.heap, (timestamp, self.push_count, audio_data))
+        self.buffered.add(timestamp)
+        if self.max_seen is None or timestamp > self.max_seen:
+            self.max_seen = timestamp
+
+    def _on_reorder(self, timestamp):
+        """乱序包到达：按它落后的包数调高目标深度"""
+        self.in_order_streak = 0
+        displacement = round((self.max_seen - timestamp) / self.frame_duration)
+        needed = min(max(displacement, 1), self.max_depth)
+        if needed > self.target_depth:
+            self.target_depth = needed
+            logger.bind(tag=TAG).debug(f"音频抖动缓冲目标深度调整为 {needed}")
+
+    def _on_in_order(self):
+        """顺序到达：长时间没有乱序时逐步降低目标深度"""
+        self.in_order_streak += 1
+        if (
+            self.in_order_streak >= self.decay_packets
+            and self.target_depth > self.min_depth
+        ):
+            self.target_depth -= 1
+            self.in_order_streak = 0
+
+    def _release(self):
+        released = []
+        while self.heap:
+            timestamp = self.heap[0][0]
+            if (
+                self.last_released is None
+                or timestamp - self.last_released <= self.max_step
+            ):
+                # 首包或与上一个包连续
+                pass
+            elif len(self.heap) > self.target_depth:
+                # 等待的包已超过目标深度，跳过缺口
+                self.gaps += max(
+                    round((timestamp - self.last_released) / self.frame_duration) - 1,
+                    1,
+                )
+            else:
+                break
+            _, _, audio_data = heapq.heappop(self.heap)
+            self.buffered.discard(timestamp)
+            self.last_released = timestamp
+            released.append(audio_data)
+        return released
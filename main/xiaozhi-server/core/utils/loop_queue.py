@@ -0,0 +1,47 @@
+import queue
+import asyncio
+
+
+class LoopQueue:
+    """
+    绑定到连接事件循环的asyncio.Queue
+    消费者在事件循环中 await get()；生产者可以在任意线程调用 put()，
+    只有在其他线程调用时才通过 call_soon_threadsafe 切换到事件循环
+    接口与 queue.Queue 保持一致（put/get_nowait/qsize/empty），原有生产者无需修改
+    """
+
+    def __init__(self):
+        self.queue = asyncio.Queue()
+        self.loop = None
+
+    def bind(self, loop):
+        """绑定消费者所在的事件循环"""
+        self.loop = loop
+
+    def _in_loop(self):
+        try:
+            return asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            return False
+
+    def put(self, item):
+        if self.loop is None or self._in_loop():
+            self.queue.put_nowait(item)
+        else:
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, item)
+
+    async def get(self):
+        return await self.queue.get()
+
+    def get_nowait(self):
+        """只能在事件循环中调用，队列为空时抛出 queue.Empty"""
+        try:
+            return self.queue.get_nowait()
+        except asyncio.QueueEmpty:
+            raise queue.Empty
+
+    def qsize(self):
+        return self.queue.qsize()
+
+    def empty(self):
+        return self.queue.empty()
@@ -0,0 +1,116 @@
+"""
+微批处理队列
+把一小段时间窗口内来自不同连接的推理请求合并为一次批量调用，
+批量函数在独立线程中串行执行，结果按提交顺序分发回各个等待者
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List
+from config.logger import setup_logging
+
+TAG = __name__
+logger = setup_logging()
+
+
+class MicroBatchQueue:
+    """跨连接的微批处理队列"""
+
+    def __init__(
+        self,
+        process_batch: Callable[[List[Any]], List[Any]],
+        batch_window_ms=10,
+        max_batch_size=64,
+        name="micro-batch",
+    ):
+        """
+        Args:
+            process_batch: 批量处理函数 def(items) -> results，结果与输入一一对应
+            batch_window_ms: 攒批等待时间（毫秒）
+            max_batch_size: 单次批量调用的最大条数
+            name: 名称，用于线程名和日志
+        """
+        self.process_batch = process_batch
+        self.batch_window = batch_window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self.name = name
+        self.pending = []  # [(item, future)]
+        self.tick_task = None
+        # 推理放在单独的线程中串行执行，不阻塞事件循环
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+
+        # 统计信息
+        self.total_batches = 0
+        self.total_items = 0
+        self.last_batch_size = 0
+        self.max_queue_depth = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """当前等待处理的请求数"""
+        return len(self.pending)
+
+    @property
+    def average_batch_size(self) -> float:
+        if self.total_batches == 0:
+            return 0.0
+        return self.total_items / self.total_batches
+
+    def get_metrics(self) -> dict:
+        return {
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "total_batches": self.total_batches,
+            "total_items": self.total_items,
+            "last_batch_size": self.last_batch_size,
+            "average_batch_size": self.average_batch_size,
+        }
+
+    def reset_metrics(self):
+        self.total_batches = 0
+        self.total_items = 0
+        self.last_batch_size = 0
+        self.max_queue_depth = 0
+
+    async def submit(self, item) -> Any:
+        """提交一条请求，等待所在批次处理完成后返回对应结果"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.append((item, future))
+        self.max_queue_depth = max(self.max_queue_depth, len(self.pending))
+        if self.tick_task is None or self.tick_task.done():
+            self.tick_task = loop.create_task(self._tick())
+        return await future
+
+    def _take_batch(self):
+        """取出一批待处理请求，子类可重写以控制组批规则"""
+        batch = self.pending[: self.max_batch_size]
+        self.pending = self.pending[self.max_batch_size :]
+        return batch
+
+    async def _tick(self):
+        loop = asyncio.get_running_loop()
+        await asyncio.sleep(self.batch_window)
+        while self.pending:
+            batch = self._take_batch()
+            items = [item for item, _ in batch]
+            try:
+                results = await loop.run_in_executor(
+                    self.executor, self.process_batch, items
+                )
+                for (_, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+                self.total_batches += 1
+                self.total_items += len(batch)
+                self.last_batch_size = len(batch)
+            except Exception as e:
+                logger.bind(tag=TAG).error(f"{self.name}批量处理失败: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def close(self):
+        if self.tick_task and not self.tick_task.done():
+            self.tick_task.cancel()
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,53 @@
+"""
+MQTT网关音频包头部
+每个opus包前带16字节大端头部：
+type(1) + 保留(1) + payload长度(2) + 序列号(4) + 时间戳(4) + opus长度(4)
+"""
+
+import struct
+
+MQTT_AUDIO_HEADER = struct.Struct(">BxHIII")
+MQTT_AUDIO_HEADER_SIZE = MQTT_AUDIO_HEADER.size
+# 音频包类型
+MQTT_AUDIO_TYPE = 1
+
+
+class MQTTAudioPacker:
+    """复用同一块缓冲区为opus包加上头部，每个连接一个"""
+
+    def __init__(self, capacity=4096):
+        """
+        Args:
+            capacity: 预分配的opus包最大长度，超出时自动扩容
+        """
+        self.buffer = bytearray(MQTT_AUDIO_HEADER_SIZE + capacity)
+        self.view = memoryview(self.buffer)
+
+    def pack(self, opus_packet, sequence, timestamp) -> memoryview:
+        """写入头部和opus数据，返回指向缓冲区的视图
+
+        返回的视图在下次调用pack前有效，websocket.send在首次让出前就完成了序列化，
+        因此发送完即可复用
+        """
+        opus_length = len(opus_packet)
+        total = MQTT_AUDIO_HEADER_SIZE + opus_length
+        if total > len(self.buffer):
+            self.buffer = bytearray(total)
+            self.view = memoryview(self.buffer)
+        MQTT_AUDIO_HEADER.pack_into(
+            self.buffer,
+            0,
+            MQTT_AUDIO_TYPE,
+            opus_length,  # payload length
+            sequence,
+            timestamp,
+            opus_length,  # opus长度
+        )
+        self.view[MQTT_AUDIO_HEADER_SIZE:total] = opus_packet
+        return self.view[:total]
+
+
+def parse_mqtt_audio_header(message):
+    """解析头部，返回 (时间戳, opus长度)"""
+    _, _, _, timestamp, audio_length = MQTT_AUDIO_HEADER.unpack_from(message, 0)
+    return timestamp, audio_length
@@ -0,0 +1,107 @@
+"""
+Opus解码器池
+整段音频（一句话、上报音频、声纹音频）解码时复用解码器，
+归还时重置状态，并直接解码到预分配的int16数组中
+"""
+
+import queue
+import ctypes
+import numpy as np
+import opuslib_next
+from typing import Dict, List, Tuple
+from config.logger import setup_logging
+
+TAG = __name__
+logger = setup_logging()
+
+
+class OpusDecoderPool:
+    """同一采样率、通道数的Opus解码器池"""
+
+    def __init__(self, sample_rate=16000, channels=1, max_idle=8):
+        """
+        Args:
+            sample_rate: 采样率
+            channels: 通道数
+            max_idle: 池中最多保留的空闲解码器数量
+        """
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.max_idle = max_idle
+        self.idle = queue.Queue()
+
+    def acquire(self) -> opuslib_next.Decoder:
+        """借出一个解码器，没有空闲解码器时新建"""
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            return opuslib_next.Decoder(self.sample_rate, self.channels)
+
+    def release(self, decoder: opuslib_next.Decoder):
+        """归还解码器，重置预测状态后放回池中，超出上限则直接丢弃"""
+        decoder.reset_state()
+        if self.idle.qsize() < self.max_idle:
+            self.idle.put_nowait(decoder)
+
+    def decode(self, opus_packets: List[bytes], frame_size: int) -> np.ndarray:
+        """把一组连续的Opus包解码为一段int16 PCM
+
+        Args:
+            opus_packets: Opus数据包列表，空包和解码失败的包会被跳过
+            frame_size: 每包最大采样点数（单通道）
+
+        Returns:
+            np.ndarray: int16的PCM数据，多通道时为交错排列
+        """
+        samples_per_packet = frame_size * self.channels
+        pcm = np.empty(len(opus_packets) * samples_per_packet, dtype=np.int16)
+        base_address = pcm.ctypes.data
+        written = 0
+
+        decoder = self.acquire()
+        try:
+            for i, opus_packet in enumerate(opus_packets):
+                if not opus_packet:
+                    continue
+                # 直接解码到结果数组的对应位置，不产生中间bytes
+                pcm_pointer = ctypes.cast(
+                    base_address + written * 2, opuslib_next.api.c_int16_pointer
+                )
+                result = opuslib_next.api.decoder.libopus_decode(
+                    decoder.decoder_state,
+                    opus_packet,
+                    len(opus_packet),
+                    pcm_pointer,
+                    frame_size,
+                    0,
+                )
+                if result < 0:
+                    logger.bind(tag=TAG).warning(
+                        f"Opus解码错误，跳过数据包 {i}: {opuslib_next.OpusError(result)}"
+                    )
+                    continue
+                written += result * self.channels
+        finally:
+            self.release(decoder)
+
+        return pcm[:written]
+
+
+_pools: Dict[Tuple[int, int], OpusDecoderPool] = {}
+
+
+def get_decoder_pool(sample_rate=16000, channels=1) -> OpusDecoderPool:
+    """获取进程内共享的解码器池"""
+    key = (sample_rate, channels)
+    pool = _pools.get(key)
+    if pool is None:
+        pool = _pools.setdefault(key, OpusDecoderPool(sample_rate, channels))
+    return pool
+
+
+def decode_opus_packets(
+    opus_packets: List[bytes], sample_rate=16000, channels=1, frame_duration=60
+) -> np.ndarray:
+    """使用共享解码器池解码一组Opus包，返回int16的PCM数据"""
+    frame_size = sample_rate * frame_duration // 1000
+    return get_decoder_pool(sample_rate, channels).decode(opus_packets, frame_size)
@@ -3,13 +3,17 @@ Opus编码工具类
 将PCM音频数据编码为Opus格式
 """
 
+import ctypes
 import logging
 import traceback
-import numpy as np
+import opuslib_next
 from opuslib_next import Encoder
 from opuslib_next import constants
 from typing import Optional, Callable, Any
 
+# 单个Opus包的最大字节数（libopus推荐值）
+MAX_PACKET_BYTES = 4000
+
 class OpusEncoderUtils:
     """PCM到Opus的编码器"""
 
@@ -34,8 +38,17 @@ class OpusEncoderUtils:
         self.bitrate = 24000  # bps
         self.complexity = 10  # 最高质量
 
-        # 缓冲区初始化为空
-        self.buffer = np.array([], dtype=np.int16)
+        # 预分配一帧大小的暂存区，输入数据按帧拷入后直接交给libopus编码
+        self.frame_bytes = self.total_frame_size * 2
+        self.staging = bytearray(self.frame_bytes)
+        self.staging_view = memoryview(self.staging)
+        self.staged_bytes = 0  # 暂存区中已有的字节数
+        self.silence = memoryview(bytes(self.frame_bytes))  # 末帧补零用
+        self.pcm_pointer = ctypes.cast(
+            (ctypes.c_int16 * self.total_frame_size).from_buffer(self.staging),
+            opuslib_next.api.c_int16_pointer,
+        )
+        self.packet_buffer = (ctypes.c_char * MAX_PACKET_BYTES)()
 
         try:
             # 创建Opus编码器
@@ -52,7 +65,7 @@ class OpusEncoderUtils:
     def reset_state(self):
         """重置编码器状态"""
         self.encoder.reset_state()
-        self.buffer = np.array([], dtype=np.int16)
+        self.staged_bytes = 0
 
     def encode_pcm_to_opus_stream(self, pcm_data: bytes, end_of_stream: bool, callback: Callable[[Any], Any]):
         """
@@ -66,69 +79,54 @@ class OpusEncoderUtils:
         Returns:
             Opus数据包列表
         """
-        # 将字节数据转换为short数组
-        new_samples = self._convert_bytes_to_shorts(pcm_data)
-
-        # 校验PCM数据
-        self._validate_pcm_data(new_samples)
-
-        # 将新数据追加到缓冲区
-        self.buffer = np.append(self.buffer, new_samples)
-
+        data = memoryview(pcm_data).cast("B")
+        total = len(data)
         offset = 0
 
-        # 处理所有完整帧
-        while offset <= len(self.buffer) - self.total_frame_size:
-            frame = self.buffer[offset : offset + self.total_frame_size]
-            output = self._encode(frame)
-            if output:
-                callback(output)
-            offset += self.total_frame_size
-
-        # 保留未处理的样本
-        self.buffer = self.buffer[offset:]
+        # 按帧拷入暂存区，凑满一帧立即编码
+        while offset < total:
+            count = min(self.frame_bytes - self.staged_bytes, total - offset)
+            self.staging_view[self.staged_bytes : self.staged_bytes + count] = data[
+                offset : offset + count
+            ]
+            self.staged_bytes += count
+            offset += count
+            if self.staged_bytes == self.frame_bytes:
+                output = self._encode()
+                if output:
+                    callback(output)
+                self.staged_bytes = 0
 
         # 流结束时处理剩余数据
-        if end_of_stream and len(self.buffer) > 0:
-            # 创建最后一帧并用0填充
-            last_frame = np.zeros(self.total_frame_size, dtype=np.int16)
-            last_frame[: len(self.buffer)] = self.buffer
-
-            output = self._encode(last_frame)
+        if end_of_stream and self.staged_bytes > 0:
+            # 最后一帧用0填充
+            self.staging_view[self.staged_bytes :] = self.silence[self.staged_bytes :]
+            output = self._encode()
             if output:
                 callback(output)
-            self.buffer = np.array([], dtype=np.int16)
+            self.staged_bytes = 0
 
-    def _encode(self, frame: np.ndarray) -> Optional[bytes]:
-        """编码一帧音频数据"""
+    def _encode(self) -> Optional[bytes]:
+        """编码暂存区中的一帧音频数据"""
         try:
             # 编码器已释放，跳过编码
             if not hasattr(self, 'encoder') or self.encoder is None:
                 return None
-            # 将numpy数组转换为bytes
-            frame_bytes = frame.tobytes()
-            # opuslib要求输入字节数必须是channels*2的倍数
-            encoded = self.encoder.encode(frame_bytes, self.frame_size)
-            return encoded
+            length = opuslib_next.api.encoder.libopus_encode(
+                self.encoder.encoder_state,
+                self.pcm_pointer,
+                self.frame_size,
+                self.packet_buffer,
+                MAX_PACKET_BYTES,
+            )
+            if length < 0:
+                raise opuslib_next.OpusError(length)
+            return ctypes.string_at(self.packet_buffer, length)
         except Exception as e:
             logging.error(f"Opus编码失败: {e}")
             traceback.print_exc()
             return None
 
-    def _convert_bytes_to_shorts(self, bytes_data: bytes) -> np.ndarray:
-        """将字节数组转换为short数组 (16位PCM)"""
-        # 假设输入是小端字节序的16位PCM
-        return np.frombuffer(bytes_data, dtype=np.int16)
-
-    def _validate_pcm_data(self, pcm_shorts: np.ndarray) -> None:
-        """验证PCM数据是否有效"""
-        # 16位PCM数据范围是 -32768 到 32767
-        if np.any((pcm_shorts < -32768) | (pcm_shorts > 32767)):
-            invalid_samples = pcm_shorts[(pcm_shorts < -32768) | (pcm_shorts > 32767)]
-            logging.warning(f"发现无效PCM样本: {invalid_samples[:5]}...")
-            # 在实际应用中可以选择裁剪而不是抛出异常
-            # np.clip(pcm_shorts, -32768, 32767, out=pcm_shorts)
-
     def close(self):
         """关闭编码器并释放资源"""
         if hasattr(self, 'encoder') and self.encoder:
@@ -0,0 +1,86 @@
+"""
+PCM环形缓冲区
+定长int16存储，写入时覆盖最旧数据，读取只移动读指针，不产生新的分配
+"""
+
+import numpy as np
+
+
+class PCMRingBuffer:
+    """16位PCM环形缓冲区"""
+
+    def __init__(self, capacity_samples: int = 4096):
+        """
+        Args:
+            capacity_samples: 缓冲区容量（采样点数），默认4096（16kHz下256ms）
+        """
+        self.capacity = capacity_samples
+        self._bytes = bytearray(capacity_samples * 2)
+        # 写入按字节拷贝，读取通过int16视图返回，两者共享同一块内存
+        self._view = memoryview(self._bytes)
+        self._samples = np.frombuffer(self._bytes, dtype=np.int16)
+        self.read_pos = 0
+        self.size = 0
+        # 读取跨越缓冲区末尾时使用的暂存区，按读取长度复用
+        self._scratch = np.zeros(0, dtype=np.int16)
+
+    def __len__(self):
+        """缓冲区中可读的采样点数"""
+        return self.size
+
+    def clear(self):
+        self.read_pos = 0
+        self.size = 0
+
+    def extend(self, pcm_data: bytes):
+        """写入PCM字节数据，超出容量时丢弃最旧的数据"""
+        count = len(pcm_data) // 2
+        if count == 0:
+            return
+        data = memoryview(pcm_data)[: count * 2]
+        capacity = self.capacity
+        if count >= capacity:
+            # 写入数据比整个缓冲区还大，只保留最新的部分
+            self._view[:] = data[-capacity * 2 :]
+            self.read_pos = 0
+            self.size = capacity
+            return
+
+        overflow = self.size + count - capacity
+        if overflow > 0:
+            self.read_pos = (self.read_pos + overflow) % capacity
+            self.size -= overflow
+
+        write_pos = (self.read_pos + self.size) % capacity
+        first = capacity - write_pos
+        if count <= first:
+            self._view[write_pos * 2 : (write_pos + count) * 2] = data
+        else:
+            self._view[write_pos * 2 :] = data[: first * 2]
+            self._view[: (count - first) * 2] = data[first * 2 :]
+        self.size += count
+
+    def read(self, count: int) -> np.ndarray:
+        """读取count个采样点并移动读指针
+
+        返回的数组是缓冲区（或暂存区）的视图，仅在下一次写入/读取前有效，
+        需要保留时请自行拷贝
+        """
+        if count > self.size:
+            raise ValueError(f"缓冲区数据不足: 需要{count}，当前{self.size}")
+
+        start = self.read_pos
+        end = start + count
+        if end <= self.capacity:
+            chunk = self._samples[start:end]
+        else:
+            if len(self._scratch) != count:
+                self._scratch = np.zeros(count, dtype=np.int16)
+            first = self.capacity - start
+            self._scratch[:first] = self._samples[start:]
+            self._scratch[first:] = self._samples[: count - first]
+            chunk = self._scratch
+
+        self.read_pos = end % self.capacity
+        self.size -= count
+        return chunk
@@ -0,0 +1,72 @@
+class TextSegmenter:
+    """
+    流式TTS的增量分句缓冲
+    每段新文本只扫描一次，记录各标点在未处理文本中最后出现的位置，
+    断句时只拼接未处理的部分，不再对整段回复反复 join 和 rfind
+    """
+
+    def __init__(self, punctuations):
+        """
+        Args:
+            punctuations: 需要跟踪的全部标点（首句与非首句标点的并集）
+        """
+        self.tracked = frozenset(punctuations)
+        self.reset()
+
+    def reset(self):
+        self.pending = []  # 未处理文本的片段
+        self.pending_len = 0
+        self.total_len = 0  # 本轮收到的全部文本长度
+        self.last_pos = {}  # 标点 -> 在未处理文本中最后出现的位置
+        self.skip = 0  # 已越过、需要从后续文本中丢弃的字符数
+
+    def feed(self, text):
+        """追加一段新文本"""
+        self.total_len += len(text)
+        if self.skip:
+            if len(text) <= self.skip:
+                self.skip -= len(text)
+                return
+            text = text[self.skip :]
+            self.skip = 0
+        base = self.pending_len
+        tracked = self.tracked
+        for index, char in enumerate(text):
+            if char in tracked:
+                self.last_pos[char] = base + index
+        self.pending.append(text)
+        self.pending_len += len(text)
+
+    def find_boundary(self, punctuations):
+        """
+        返回断句位置：各标点在未处理文本中最后出现的位置里最靠前的一个，没有则返回-1
+        （与原先对每个标点 rfind 后取最小值的规则一致）
+        """
+        last_punct_pos = -1
+        for punct in punctuations:
+            pos = self.last_pos.get(punct, -1)
+            if pos != -1 and (last_punct_pos == -1 or pos < last_punct_pos):
+                last_punct_pos = pos
+        return last_punct_pos
+
+    def text(self):
+        """未处理的文本"""
+        if len(self.pending) > 1:
+            self.pending = ["".join(self.pending)]
+        return self.pending[0] if self.pending else ""
+
+    def consume(self, count):
+        """标记前 count 个未处理字符已处理并返回它们，超出部分从后续文本中丢弃"""
+        text = self.text()
+        if count >= len(text):
+            self.skip += count - len(text)
+            self.pending = []
+            self.pending_len = 0
+            self.last_pos = {}
+            return text
+        self.pending = [text[count:]]
+        self.pending_len -= count
+        self.last_pos = {
+            punct: pos - count for punct, pos in self.last_pos.items() if pos >= count
+        }
+        return text[:count]
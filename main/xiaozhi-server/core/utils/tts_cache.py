@@ -0,0 +1,257 @@
+"""
+TTS音频缓存
+以规范化文本、TTS提供者配置和音频参数的哈希为键，把合成并编码好的opus包存到磁盘，
+命中时一次读出整个缓存文件并切分出音频包，跳过上游合成和ffmpeg/pydub解码
+"""
+
+import os
+import json
+import time
+import uuid
+import struct
+import hashlib
+import threading
+from collections import OrderedDict
+from config.logger import setup_logging
+
+TAG = __name__
+logger = setup_logging()
+
+_MAGIC = b"XZTC"
+_VERSION = 1
+# 文件头：魔数、版本、未命中时的首包耗时(ms)、音频包数
+_HEADER = struct.Struct("<4sHfI")
+# 每个音频包前的长度
+_PACKET_LEN = struct.Struct("<I")
+_SUFFIX = ".tcache"
+
+
+def normalize_text(text):
+    """去掉首尾空白并合并连续空白，作为缓存键的文本部分"""
+    return " ".join(text.split())
+
+
+class TTSAudioCache:
+    """
+    内容寻址的TTS音频磁盘缓存，所有连接共用
+    每条缓存一个文件，索引常驻内存并按最近使用排序，超过总大小或条数时淘汰最久未用的条目；
+    命中时更新文件修改时间，重启后按修改时间恢复淘汰顺序
+    """
+
+    def __init__(self, cache_dir, max_size_mb=200, max_entries=10000, max_text_length=50):
+        self.cache_dir = cache_dir
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.max_entries = max_entries
+        self.max_text_length = max_text_length
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # 键 -> 文件大小，最近使用的在末尾
+        self._size = 0
+        # 统计
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.saved_ms = 0.0
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + _SUFFIX)
+
+    def _load_index(self):
+        """扫描缓存目录重建索引，清理上次异常退出留下的临时文件"""
+        files = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            try:
+                if name.endswith(".tmp"):
+                    os.remove(path)
+                    continue
+                if not name.endswith(_SUFFIX):
+                    continue
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, name[: -len(_SUFFIX)], stat.st_size))
+        files.sort()
+        with self._lock:
+            for _, key, size in files:
+                self._entries[key] = size
+                self._size += size
+            evicted = self._evict()
+        self._remove_files(evicted)
+        logger.bind(tag=TAG).info(
+            f"TTS音频缓存已加载: {len(self._entries)}条, {self._size / 1024 / 1024:.1f}MB"
+        )
+
+    def make_key(self, text, *params):
+        """文本规范化后与提供者、音色、音频参数一起计算哈希"""
+        payload = json.dumps(
+            [normalize_text(text), *params],
+            ensure_ascii=False,
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def cacheable(self, text):
+        """只缓存较短的句子，长句重复的概率低"""
+        return 0 < len(normalize_text(text)) <= self.max_text_length
+
+    def get(self, key):
+        """返回缓存的音频包列表，未命中返回None"""
+        start_time = time.monotonic()
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+        path = self._path(key)
+        try:
+            packets, first_audio_ms = self._read(path)
+            os.utime(path)
+        except (OSError, ValueError, struct.error) as e:
+            logger.bind(tag=TAG).warning(f"读取TTS音频缓存失败 {path}: {e}")
+            self._discard(key)
+            with self._lock:
+                self.misses += 1
+            return None
+        hit_ms = (time.monotonic() - start_time) * 1000
+        with self._lock:
+            self.hits += 1
+            self.saved_ms += max(0.0, first_audio_ms - hit_ms)
+        return packets
+
+    def put(self, key, packets, first_audio_ms):
+        """
+        写入一条缓存
+        Args:
+            packets: 编码好的音频包列表
+            first_audio_ms: 本次合成从开始到产出首个音频包的耗时，用于统计命中节省的时间
+        """
+        data = bytearray(_HEADER.pack(_MAGIC, _VERSION, first_audio_ms, len(packets)))
+        for packet in packets:
+            data += _PACKET_LEN.pack(len(packet))
+            data += packet
+        if len(data) > self.max_bytes:
+            return
+        path = self._path(key)
+        # 先写临时文件再替换，读取方不会看到写了一半的文件
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.bind(tag=TAG).warning(f"写入TTS音频缓存失败 {path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        with self._lock:
+            self._size -= self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self._size += len(data)
+            self.stores += 1
+            evicted = self._evict()
+        self._remove_files(evicted)
+
+    @staticmethod
+    def _read(path):
+        # 单条缓存只有几十KB，一次读出整个文件再切分
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, first_audio_ms, count = _HEADER.unpack_from(data, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("缓存文件格式不匹配")
+        packets = []
+        offset = _HEADER.size
+        for _ in range(count):
+            (length,) = _PACKET_LEN.unpack_from(data, offset)
+            offset += _PACKET_LEN.size
+            if offset + length > len(data):
+                raise ValueError("缓存文件不完整")
+            packets.append(data[offset : offset + length])
+            offset += length
+        return packets, first_audio_ms
+
+    def _evict(self):
+        """淘汰最久未用的条目直到满足限制，需持有锁，返回被淘汰的键"""
+        evicted = []
+        while self._entries and (
+            self._size > self.max_bytes or len(self._entries) > self.max_entries
+        ):
+            key, size = self._entries.popitem(last=False)
+            self._size -= size
+            self.evictions += 1
+            evicted.append(key)
+        return evicted
+
+    def _remove_files(self, keys):
+        for key in keys:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def _discard(self, key):
+        with self._lock:
+            self._size -= self._entries.pop(key, 0)
+        self._remove_files([key])
+
+    def get_metrics(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "lookups": lookups,
+                "hits": self.hits,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+                "saved_ms_total": round(self.saved_ms),
+                "saved_ms_avg": round(self.saved_ms / self.hits) if self.hits else 0,
+                "entries": len(self._entries),
+                "size_mb": round(self._size / 1024 / 1024, 2),
+                "evictions": self.evictions,
+            }
+
+
+class TTSCacheRecorder:
+    """包装音频包回调，在合成过程中收集音频包，合成成功后写入缓存"""
+
+    def __init__(self, cache, key, callback):
+        self.cache = cache
+        self.key = key
+        self.callback = callback
+        self.packets = []
+        self.start_time = time.monotonic()
+        self.first_audio_ms = None
+
+    def __call__(self, packet):
+        if self.first_audio_ms is None:
+            self.first_audio_ms = (time.monotonic() - self.start_time) * 1000
+        self.packets.append(packet)
+        if self.callback:
+            self.callback(packet)
+
+    def commit(self):
+        if self.packets:
+            self.cache.put(self.key, self.packets, self.first_audio_ms)
+
+
+_tts_cache = None
+_tts_cache_lock = threading.Lock()
+
+
+def get_tts_cache(config):
+    """按配置返回全局的TTS音频缓存，未开启时返回None"""
+    global _tts_cache
+    cache_config = config.get("tts_cache") or {}
+    if not cache_config.get("enable", False):
+        return None
+    with _tts_cache_lock:
+        if _tts_cache is None:
+            _tts_cache = TTSAudioCache(
+                cache_config.get("dir", "data/tts_cache"),
+                max_size_mb=cache_config.get("max_size_mb", 200),
+                max_entries=cache_config.get("max_entries", 10000),
+                max_text_length=cache_config.get("max_text_length", 50),
+            )
+    return _tts_cache
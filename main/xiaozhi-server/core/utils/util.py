@@ -11,6 +11,7 @@ import numpy as np
 import opuslib_next
 from io import BytesIO
 from core.utils import p3
+from core.utils.opus_decoder_pool import decode_opus_packets
 from pydub import AudioSegment
 from typing import Callable, Any
 
@@ -392,34 +393,19 @@ def opus_datas_to_wav_bytes(opus_datas, sample_rate=16000, channels=1):
     """
     将opus帧列表解码为wav字节流
     """
-    decoder = opuslib_next.Decoder(sample_rate, channels)
-    try:
-        pcm_datas = []
-
-        frame_duration = 60  # ms
-        frame_size = int(sample_rate * frame_duration / 1000)  # 960
-
-        for opus_frame in opus_datas:
-            # 解码为PCM（返回bytes，2字节/采样点）
-            pcm = decoder.decode(opus_frame, frame_size)
-            pcm_datas.append(pcm)
-
-        pcm_bytes = b"".join(pcm_datas)
-
-        # 写入wav字节流
-        wav_buffer = BytesIO()
-        with wave.open(wav_buffer, "wb") as wf:
-            wf.setnchannels(channels)
-            wf.setsampwidth(2)  # 16bit
-            wf.setframerate(sample_rate)
-            wf.writeframes(pcm_bytes)
-        return wav_buffer.getvalue()
-    finally:
-        if decoder is not None:
-            try:
-                del decoder
-            except Exception:
-                pass
+    # 使用共享解码器池整段解码，60ms一帧
+    pcm_bytes = decode_opus_packets(
+        opus_datas, sample_rate=sample_rate, channels=channels
+    ).tobytes()
+
+    # 写入wav字节流
+    wav_buffer = BytesIO()
+    with wave.open(wav_buffer, "wb") as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(2)  # 16bit
+        wf.setframerate(sample_rate)
+        wf.writeframes(pcm_bytes)
+    return wav_buffer.getvalue()
 
 
 def check_vad_update(before_config, new_config):
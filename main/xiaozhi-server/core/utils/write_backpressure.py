@@ -0,0 +1,105 @@
+import asyncio
+import threading
+from config.logger import setup_logging
+
+TAG = __name__
+logger = setup_logging()
+
+
+class WriteBackpressure:
+    """
+    连接下行的写缓冲背压
+    未发送的字节数（流控队列中的音频 + websocket传输层写缓冲）超过高水位时暂停，
+    降到低水位以下时恢复。暂停期间TTS文本线程不再合成新句子，音频播放任务不再消费音频队列
+    """
+
+    def __init__(
+        self, high_water=96 * 1024, low_water=32 * 1024, probe=None, recheck_interval=0.05
+    ):
+        """
+        Args:
+            high_water: 高水位（字节），超过后暂停
+            low_water: 低水位（字节），降到该值以下后恢复
+            probe: 返回当前未发送字节数的函数，暂停期间定时调用，用于在没有新的发送时判断能否恢复
+            recheck_interval: 暂停期间重新检查的间隔（秒）
+        """
+        self.high_water = high_water
+        self.low_water = low_water
+        self.probe = probe
+        self.recheck_interval = recheck_interval
+        self._recheck_handle = None
+        self.paused = False
+        self.outstanding = 0
+        self.max_outstanding = 0
+        self.pause_count = 0
+        # 事件循环中的任务和TTS线程分别等待
+        self.resumed_event = asyncio.Event()
+        self.resumed_event.set()
+        self.resumed_flag = threading.Event()
+        self.resumed_flag.set()
+
+    def update(self, outstanding):
+        """更新未发送字节数，只能在事件循环中调用"""
+        self.outstanding = outstanding
+        if outstanding > self.max_outstanding:
+            self.max_outstanding = outstanding
+        if not self.paused and outstanding > self.high_water:
+            self.paused = True
+            self.pause_count += 1
+            self.resumed_event.clear()
+            self.resumed_flag.clear()
+            logger.bind(tag=TAG).debug(f"下行积压 {outstanding} 字节，暂停TTS")
+            self._schedule_recheck()
+        elif self.paused and outstanding <= self.low_water:
+            self.release()
+
+    def _schedule_recheck(self):
+        """
+        暂停后播放任务不再取音频，可能不会再有发送来触发 update，
+        写缓冲只靠传输层排空，因此定时重新检查积压，直到恢复
+        """
+        if self.probe is None or self._recheck_handle is not None:
+            return
+        self._recheck_handle = asyncio.get_running_loop().call_later(
+            self.recheck_interval, self._recheck
+        )
+
+    def _recheck(self):
+        self._recheck_handle = None
+        if not self.paused:
+            return
+        try:
+            self.update(self.probe())
+        except Exception as e:
+            logger.bind(tag=TAG).warning(f"检查下行积压失败，解除暂停: {e}")
+            self.release()
+            return
+        if self.paused:
+            self._schedule_recheck()
+
+    def release(self):
+        """解除暂停（积压降到低水位以下，或被打断、连接关闭）"""
+        if self._recheck_handle is not None:
+            self._recheck_handle.cancel()
+            self._recheck_handle = None
+        if self.paused:
+            logger.bind(tag=TAG).debug(f"下行积压降到 {self.outstanding} 字节，恢复TTS")
+        self.paused = False
+        self.resumed_event.set()
+        self.resumed_flag.set()
+
+    async def wait_writable(self):
+        """在事件循环中等待恢复"""
+        await self.resumed_event.wait()
+
+    def wait_writable_blocking(self, timeout):
+        """在线程中等待恢复，超时返回False"""
+        return self.resumed_flag.wait(timeout)
+
+    def get_metrics(self):
+        return {
+            "paused": self.paused,
+            "outstanding": self.outstanding,
+            "max_outstanding": self.max_outstanding,
+            "pause_count": self.pause_count,
+        }
@@ -0,0 +1,191 @@
+"""
+WebSocket连接池
+双流式TTS每个会话借出一条已完成握手和鉴权的空闲连接，会话结束后归还，
+新会话不必等待TCP/TLS/WebSocket握手；后台定期ping空闲连接并回收超过最大存活时间的连接
+"""
+
+import time
+import asyncio
+from typing import Awaitable, Callable, Dict, Tuple
+from websockets.protocol import State
+from config.logger import setup_logging
+
+TAG = __name__
+logger = setup_logging()
+
+
+class WebSocketPool:
+    """同一服务端地址和鉴权信息的WebSocket连接池，绑定在首次使用它的事件循环上"""
+
+    def __init__(
+        self,
+        connect: Callable[[], Awaitable],
+        min_idle=2,
+        max_idle=8,
+        max_age=300,
+        ping_interval=20,
+        ping_timeout=5,
+    ):
+        """
+        Args:
+            connect: 建立一条新连接的协程函数
+            min_idle: 保持预热的空闲连接数
+            max_idle: 最多保留的空闲连接数，超出的归还连接直接关闭
+            max_age: 连接最大存活时间（秒），超过后不再借出
+            ping_interval: 空闲连接健康检查间隔（秒）
+            ping_timeout: ping等待pong的超时时间（秒）
+        """
+        self.connect = connect
+        self.min_idle = min_idle
+        self.max_idle = max_idle
+        self.max_age = max_age
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+        self.loop = None
+        self.idle = []  # 空闲连接，最近归还的在末尾
+        self._created_at = {}  # 池中连接（含借出的）-> 建立时间
+        self._refill_task = None
+        self._health_task = None
+        # 统计
+        self.acquired = 0
+        self.reused = 0
+        self.connected = 0
+        self.recycled = 0
+        self.ping_failures = 0
+
+    def _in_pool_loop(self):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        if self.loop is None:
+            self.loop = loop
+        return loop is self.loop
+
+    def start(self):
+        """在事件循环中启动预热和健康检查，可重复调用"""
+        if not self._in_pool_loop():
+            return
+        if self._health_task is None or self._health_task.done():
+            self._health_task = self.loop.create_task(self._health_check())
+        self._schedule_refill()
+
+    def _usable(self, ws):
+        created_at = self._created_at.get(ws)
+        return (
+            created_at is not None
+            and ws.state is State.OPEN
+            and time.monotonic() - created_at < self.max_age
+        )
+
+    async def _open(self):
+        ws = await self.connect()
+        self.connected += 1
+        self._created_at[ws] = time.monotonic()
+        return ws
+
+    async def acquire(self):
+        """借出一条连接，没有可用的空闲连接时新建；不在连接池的事件循环中时直接新建且不入池"""
+        if not self._in_pool_loop():
+            return await self.connect()
+        self.start()
+        self.acquired += 1
+        while self.idle:
+            ws = self.idle.pop()
+            if self._usable(ws):
+                self.reused += 1
+                self._schedule_refill()
+                return ws
+            self.recycled += 1
+            self._discard(ws)
+        ws = await self._open()
+        self._schedule_refill()
+        return ws
+
+    def release(self, ws, reusable=True):
+        """
+        归还连接；已断开、超过最大存活时间或空闲连接已满时直接关闭
+        会话状态不确定（如会话中途关闭）时传 reusable=False，关闭连接不再复用
+        """
+        if ws is None:
+            return
+        if not reusable or not self._in_pool_loop() or ws not in self._created_at:
+            self._discard(ws)
+            return
+        if self._usable(ws) and len(self.idle) < self.max_idle:
+            self.idle.append(ws)
+        else:
+            self.recycled += 1
+            self._discard(ws)
+
+    def _discard(self, ws):
+        self._created_at.pop(ws, None)
+        asyncio.get_running_loop().create_task(self._close(ws))
+
+    @staticmethod
+    async def _close(ws):
+        try:
+            await ws.close()
+        except Exception:
+            pass
+
+    def _schedule_refill(self):
+        if len(self.idle) >= self.min_idle:
+            return
+        if self._refill_task is None or self._refill_task.done():
+            self._refill_task = self.loop.create_task(self._refill())
+
+    async def _refill(self):
+        """补足预热的空闲连接"""
+        while len(self.idle) < self.min_idle:
+            try:
+                ws = await self._open()
+            except Exception as e:
+                logger.bind(tag=TAG).warning(f"预热WebSocket连接失败: {e}")
+                return
+            self.idle.append(ws)
+
+    async def _health_check(self):
+        """定期ping空闲连接，移除无响应和超过最大存活时间的连接"""
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            for ws in list(self.idle):
+                healthy = self._usable(ws)
+                if healthy:
+                    try:
+                        pong_waiter = await ws.ping()
+                        await asyncio.wait_for(pong_waiter, self.ping_timeout)
+                    except Exception:
+                        healthy = False
+                        self.ping_failures += 1
+                # ping期间连接可能已被借出
+                if not healthy and ws in self.idle:
+                    self.idle.remove(ws)
+                    self.recycled += 1
+                    self._discard(ws)
+            self._schedule_refill()
+
+    def get_metrics(self):
+        return {
+            "acquired": self.acquired,
+            "reused": self.reused,
+            "reuse_rate": round(self.reused / self.acquired, 3) if self.acquired else 0.0,
+            "connected": self.connected,
+            "recycled": self.recycled,
+            "ping_failures": self.ping_failures,
+            "idle": len(self.idle),
+        }
+
+
+_pools: Dict[Tuple, WebSocketPool] = {}
+
+
+def get_ws_pool(key: Tuple, connect: Callable[[], Awaitable], **options) -> WebSocketPool:
+    """
+    获取进程内共享的连接池，key 相同（地址、鉴权信息一致）的提供者共用一个池
+    连接池常驻进程，connect 不能引用提供者或设备连接，否则它们在设备断开后无法释放
+    """
+    pool = _pools.get(key)
+    if pool is None:
+        pool = _pools.setdefault(key, WebSocketPool(connect, **options))
+    return pool
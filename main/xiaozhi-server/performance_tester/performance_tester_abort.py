@@ -0,0 +1,237 @@
+import json
+import time
+import asyncio
+import logging
+import threading
+from types import SimpleNamespace
+import aiohttp
+from aiohttp import web
+from tabulate import tabulate
+from core.utils.cancel_token import CancellationToken
+from core.providers.tts.base import TTSProviderBase
+from core.providers.llm.openai.openai import LLMProvider
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "打断后LLM/TTS上游停止测试"
+
+HOST = "127.0.0.1"
+PORT = 18767
+LLM_FIRST_TOKEN = 0.3  # 首token时延（秒）
+LLM_CHUNKS = 60  # 一次回复的文本块数
+LLM_CHUNK_INTERVAL = 0.05
+TTS_CHUNKS = 30  # 一句话的音频块数，每块约50ms合成耗时
+TTS_CHUNK_INTERVAL = 0.05
+TTS_CHUNK_SIZE = 2400  # 24kHz 16bit 50ms PCM
+TTS_TRIGGER_CHUNK = 4  # 收到第几个文本块时凑够首句，发起TTS请求
+
+
+class MockUpstream:
+    """模拟LLM（OpenAI兼容SSE）和TTS（HTTP流式音频）服务，统计打断后仍发出的字节数"""
+
+    def __init__(self):
+        self.abort_time = None
+        self.bytes_after_abort = {"llm": 0, "tts": 0}
+        self.loop = None
+
+    async def _write(self, response, kind, data):
+        await response.write(data)
+        if self.abort_time is not None:
+            self.bytes_after_abort[kind] += len(data)
+
+    async def llm_handler(self, request):
+        # 首token生成前不返回响应头，客户端阻塞在创建请求上
+        await asyncio.sleep(LLM_FIRST_TOKEN)
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        try:
+            for index in range(LLM_CHUNKS):
+                chunk = {
+                    "id": "chatcmpl-mock",
+                    "object": "chat.completion.chunk",
+                    "created": 0,
+                    "model": "mock",
+                    "choices": [
+                        {"index": 0, "delta": {"content": f"第{index}块，"}, "finish_reason": None}
+                    ],
+                }
+                await self._write(response, "llm", f"data: {json.dumps(chunk)}\n\n".encode())
+                await asyncio.sleep(LLM_CHUNK_INTERVAL)
+            await self._write(response, "llm", b"data: [DONE]\n\n")
+        except (ConnectionResetError, aiohttp.ClientConnectionResetError):
+            pass
+        return response
+
+    async def tts_handler(self, request):
+        response = web.StreamResponse(headers={"Content-Type": "application/octet-stream"})
+        await response.prepare(request)
+        try:
+            for _ in range(TTS_CHUNKS):
+                await asyncio.sleep(TTS_CHUNK_INTERVAL)
+                await self._write(response, "tts", bytes(TTS_CHUNK_SIZE))
+        except (ConnectionResetError, aiohttp.ClientConnectionResetError):
+            pass
+        return response
+
+    def start(self):
+        started = threading.Event()
+
+        def run():
+            self.loop = asyncio.new_event_loop()
+            app = web.Application()
+            app.router.add_post("/v1/chat/completions", self.llm_handler)
+            app.router.add_post("/tts", self.tts_handler)
+            runner = web.AppRunner(app)
+            self.loop.run_until_complete(runner.setup())
+            self.loop.run_until_complete(web.TCPSite(runner, HOST, PORT).start())
+            started.set()
+            self.loop.run_forever()
+
+        threading.Thread(target=run, daemon=True).start()
+        started.wait()
+
+
+class MockTTSProvider(TTSProviderBase):
+    """HTTP流式TTS，与单流式提供者的请求方式一致"""
+
+    async def text_to_speak(self, text, output_file):
+        audio = bytearray()
+        async with aiohttp.ClientSession() as session:
+            async with session.post(f"http://{HOST}:{PORT}/tts", json={"text": text}) as response:
+                async for chunk in response.content.iter_any():
+                    audio.extend(chunk)
+                    self.last_audio_time = time.monotonic()
+        return bytes(audio)
+
+
+class AbortTester:
+    def __init__(self, rounds=5):
+        self.rounds = rounds
+        self.upstream = MockUpstream()
+        self.llm = LLMProvider(
+            {"model_name": "mock", "api_key": "mock", "base_url": f"http://{HOST}:{PORT}/v1"}
+        )
+        self.results = []
+
+    def _chat(self, conn, tts, use_token, state):
+        """按 ConnectionHandler.chat 的方式消费LLM流，凑够首句后交给TTS线程"""
+        turn_token = conn.turn_token
+        if use_token:
+            llm_responses = self.llm.response("abort-test", [], cancel_token=turn_token)
+        else:
+            llm_responses = self.llm.response("abort-test", [])
+        chunks = 0
+        # chat在取得生成器后重置打断标志（首token前收到的打断会被覆盖）
+        conn.client_abort = False
+        for _ in llm_responses:
+            if conn.client_abort or (use_token and turn_token.cancelled):
+                if use_token:
+                    llm_responses.close()
+                break
+            chunks += 1
+            # TTS线程收到文本时同样检查打断标志
+            if chunks == TTS_TRIGGER_CHUNK and not conn.client_abort:
+                state["tts_thread"] = threading.Thread(
+                    target=self._tts, args=(tts, use_token, state)
+                )
+                state["tts_thread"].start()
+        state["llm_exit_time"] = time.monotonic()
+
+    def _tts(self, tts, use_token, state):
+        try:
+            if use_token:
+                tts._run_tts_coroutine(tts.text_to_speak("你好", None))
+            else:
+                asyncio.run(tts.text_to_speak("你好", None))
+        except asyncio.CancelledError:
+            pass
+
+    def _round(self, use_token, abort_delay):
+        conn = SimpleNamespace(client_abort=False, turn_token=CancellationToken())
+        tts = MockTTSProvider({}, delete_audio_file=True)
+        tts.conn = conn
+        tts.last_audio_time = None
+        state = {"tts_thread": None}
+        self.upstream.abort_time = None
+        self.upstream.bytes_after_abort = {"llm": 0, "tts": 0}
+
+        chat_thread = threading.Thread(target=self._chat, args=(conn, tts, use_token, state))
+        chat_thread.start()
+        time.sleep(abort_delay)
+        # 对应 handleAbortMessage
+        abort_time = time.monotonic()
+        self.upstream.abort_time = abort_time
+        conn.client_abort = True
+        if use_token:
+            # 对应 ConnectionHandler.cancel_turn
+            turn_token = conn.turn_token
+            conn.turn_token = CancellationToken()
+            turn_token.cancel()
+        chat_thread.join()
+        if state["tts_thread"]:
+            state["tts_thread"].join()
+        # 等待服务端把剩余数据发完或发现连接断开
+        time.sleep(0.3)
+        tts_last = tts.last_audio_time if tts.last_audio_time else abort_time
+        return {
+            "llm_exit": (state["llm_exit_time"] - abort_time) * 1000,
+            "tts_audio": max(0.0, tts_last - abort_time) * 1000,
+            "llm_bytes": self.upstream.bytes_after_abort["llm"],
+            "tts_bytes": self.upstream.bytes_after_abort["tts"],
+        }
+
+    def test_abort(self):
+        # 对话开始1秒后打断，此时LLM仍在输出，TTS正在合成首句
+        for mode_name, use_token in (("仅打断标志", False), ("取消令牌", True)):
+            rounds = [self._round(use_token, 1.0) for _ in range(self.rounds)]
+
+            def avg(key):
+                return sum(r[key] for r in rounds) / len(rounds)
+
+            self.results.append(
+                [
+                    mode_name,
+                    f"{avg('llm_exit'):.0f}",
+                    f"{avg('llm_bytes') / 1024:.1f}",
+                    f"{avg('tts_audio'):.0f}",
+                    f"{avg('tts_bytes') / 1024:.1f}",
+                ]
+            )
+
+    def print_results(self):
+        print("\n打断后上游请求的停止情况：")
+        print(
+            tabulate(
+                self.results,
+                headers=[
+                    "方式",
+                    "LLM线程退出(ms)",
+                    "打断后LLM上游(KB)",
+                    "打断到TTS停止(ms)",
+                    "打断后TTS上游(KB)",
+                ],
+                tablefmt="grid",
+            )
+        )
+        print("\n测试说明：")
+        print(f"- 模拟LLM：首token {LLM_FIRST_TOKEN * 1000:.0f}ms，之后每{LLM_CHUNK_INTERVAL * 1000:.0f}ms一块，共{LLM_CHUNKS}块")
+        print(f"- 模拟TTS：收到第{TTS_TRIGGER_CHUNK}个文本块后发起一句合成，流式返回{TTS_CHUNKS}块音频，每块{TTS_CHUNK_INTERVAL * 1000:.0f}ms")
+        print("- 对话开始1秒后打断，此时LLM仍在输出，TTS正在合成首句")
+        print("- 仅打断标志：优化前的实现，LLM/TTS线程只在处理下一个数据块时检查 client_abort")
+        print("- 取消令牌：打断时关闭LLM流式响应、取消进行中的TTS请求")
+        print("- 打断到TTS停止：打断后TTS请求仍在接收音频的时长；上游字节数为模拟服务端在打断后成功写出的数据量")
+        print(f"- 每种方式运行{self.rounds}次取平均")
+
+    async def run(self):
+        self.upstream.start()
+        await asyncio.to_thread(self.test_abort)
+        self.print_results()
+
+
+async def main():
+    await AbortTester().run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
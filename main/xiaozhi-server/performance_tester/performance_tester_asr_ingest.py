@@ -0,0 +1,165 @@
+import time
+import queue
+import asyncio
+import logging
+import threading
+import numpy as np
+import psutil
+from tabulate import tabulate
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "ASR音频接收队列性能测试"
+
+FRAME_DURATION = 60  # 毫秒
+
+
+class LegacyIngest:
+    """优化前的实现：每个连接一个线程，从queue.Queue取出音频后跨线程提交协程并等待结果"""
+
+    def __init__(self, loop, handle_audio):
+        self.loop = loop
+        self.handle_audio = handle_audio
+        self.audio_queue = queue.Queue()
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def feed(self, message):
+        self.audio_queue.put(message)
+
+    def _run(self):
+        while not self.stop_event.is_set():
+            try:
+                message = self.audio_queue.get(timeout=1)
+            except queue.Empty:
+                continue
+            future = asyncio.run_coroutine_threadsafe(
+                self.handle_audio(message), self.loop
+            )
+            future.result()
+
+    def stop(self):
+        self.stop_event.set()
+
+
+class TaskIngest:
+    """当前实现：消息路由直接放入asyncio.Queue，由事件循环中的任务按顺序处理"""
+
+    def __init__(self, loop, handle_audio):
+        self.handle_audio = handle_audio
+        self.audio_queue = asyncio.Queue()
+        self.task = loop.create_task(self._run())
+
+    def feed(self, message):
+        self.audio_queue.put_nowait(message)
+
+    async def _run(self):
+        try:
+            while True:
+                message = await self.audio_queue.get()
+                await self.handle_audio(message)
+        except asyncio.CancelledError:
+            pass
+
+    def stop(self):
+        self.task.cancel()
+
+
+class ASRIngestTester:
+    def __init__(self, seconds=5):
+        self.seconds = seconds
+        self.results = []
+
+    async def _run(self, ingest_factory, conn_count):
+        """每60ms在事件循环中为每个连接投递一个音频包（模拟 _route_message）"""
+        loop = asyncio.get_running_loop()
+        process = psutil.Process()
+        latencies = []
+
+        async def handle_audio(put_time):
+            latencies.append((time.perf_counter() - put_time) * 1000)
+
+        ingests = [ingest_factory(loop, handle_audio) for _ in range(conn_count)]
+        thread_count = threading.active_count()
+        packet_count = int(self.seconds * 1000 / FRAME_DURATION)
+
+        ctx_start = sum(process.num_ctx_switches())
+        cpu_start = time.process_time()
+        wall_start = time.monotonic()
+        for i in range(packet_count):
+            for ingest in ingests:
+                ingest.feed(time.perf_counter())
+            next_time = wall_start + (i + 1) * FRAME_DURATION / 1000
+            await asyncio.sleep(max(0, next_time - time.monotonic()))
+        while len(latencies) < packet_count * conn_count:
+            await asyncio.sleep(0.01)
+        wall_cost = time.monotonic() - wall_start
+        cpu_cost = time.process_time() - cpu_start
+        ctx_cost = sum(process.num_ctx_switches()) - ctx_start
+
+        for ingest in ingests:
+            ingest.stop()
+        # 等待旧线程退出，避免影响下一组测试
+        await asyncio.sleep(1.2)
+        return {
+            "threads": thread_count,
+            "ctx_per_conn": ctx_cost / wall_cost / conn_count,
+            "cpu": cpu_cost / wall_cost,
+            "p50": float(np.percentile(latencies, 50)),
+            "p99": float(np.percentile(latencies, 99)),
+        }
+
+    async def test_ingest(self, conn_counts=(100, 500)):
+        for conn_count in conn_counts:
+            for name, factory in (
+                ("每连接线程", LegacyIngest),
+                ("事件循环任务", TaskIngest),
+            ):
+                result = await self._run(factory, conn_count)
+                self.results.append(
+                    [
+                        name,
+                        conn_count,
+                        result["threads"],
+                        f"{result['ctx_per_conn']:.1f}",
+                        f"{result['cpu'] * 100:.1f}%",
+                        f"{result['p50']:.3f}",
+                        f"{result['p99']:.3f}",
+                    ]
+                )
+
+    def print_results(self):
+        print("\nASR音频接收队列对比：")
+        print(
+            tabulate(
+                self.results,
+                headers=[
+                    "实现",
+                    "并发连接",
+                    "进程线程数",
+                    "每连接上下文切换/秒",
+                    "CPU占用",
+                    "P50延迟(ms)",
+                    "P99延迟(ms)",
+                ],
+                tablefmt="grid",
+            )
+        )
+        print("\n测试说明：")
+        print(f"- 事件循环每60ms为每个连接投递一个音频包，持续{self.seconds}秒")
+        print("- 上下文切换为进程内所有线程的自愿与非自愿切换之和")
+        print("- 延迟为投递到开始处理该包的时间")
+
+    async def run(self):
+        await self.test_ingest()
+        self.print_results()
+
+
+async def main():
+    await ASRIngestTester().run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
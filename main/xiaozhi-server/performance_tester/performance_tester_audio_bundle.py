@@ -0,0 +1,167 @@
+import os
+import sys
+import time
+import uuid
+import random
+import asyncio
+import logging
+import subprocess
+from types import SimpleNamespace
+from tabulate import tabulate
+from websockets.asyncio.client import connect
+from websockets.asyncio.server import serve
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "音频包合并发送性能测试"
+
+HOST = "127.0.0.1"
+PORT = 18765
+# 一句话的包数（60ms一包，约3秒）
+SENTENCE_PACKETS = 50
+# 非流式TTS首次交付的包数，前5个走预缓冲直接发送
+FIRST_CHUNK_PACKETS = 10
+# 之后每次交付的包数
+CHUNK_PACKETS = 8
+
+
+async def _run_receivers(conn_count):
+    """接收端：建立指定数量的连接并持续读取，直到服务端关闭连接"""
+
+    async def receive():
+        async with connect(f"ws://{HOST}:{PORT}", max_size=None) as ws:
+            async for _ in ws:
+                pass
+
+    await asyncio.gather(*(receive() for _ in range(conn_count)), return_exceptions=True)
+
+
+class AudioBundleTester:
+    def __init__(self, duration=10):
+        self.duration = duration
+        self.results = []
+
+    async def _stream(self, websocket, bundle_enabled, stats):
+        """模拟一路TTS音频下发：整句开头批量交付，之后分块交付并随机出现卡顿"""
+        # 接收端子进程不需要加载服务端代码
+        from core.handle.sendAudioHandle import sendAudio
+
+        # 统计实际写入socket的次数（每次transport.write对应一次send系统调用）
+        transport = websocket.transport
+        original_write = transport.write
+
+        def counting_write(data):
+            stats["writes"] += 1
+            original_write(data)
+
+        transport.write = counting_write
+
+        conn = SimpleNamespace(
+            config={},
+            websocket=websocket,
+            client_abort=False,
+            conn_from_mqtt_gateway=False,
+            audio_bundle_enabled=bundle_enabled,
+            sentence_id=None,
+            last_activity_time=0,
+            client_is_speaking=False,
+        )
+        packet = bytes(120)  # 24kbps下60ms一包约180字节，这里取相近大小
+        deadline = time.monotonic() + self.duration
+        while time.monotonic() < deadline:
+            conn.sentence_id = str(uuid.uuid4())
+            await sendAudio(conn, [packet] * FIRST_CHUNK_PACKETS)
+            sent = FIRST_CHUNK_PACKETS
+            while sent < SENTENCE_PACKETS:
+                # TTS按实时速度交付，偶尔卡顿后一次性补齐
+                stall = random.choice((0, 0, 0, 0.2, 0.35))
+                await asyncio.sleep(CHUNK_PACKETS * 0.06 + stall)
+                await sendAudio(conn, [packet] * CHUNK_PACKETS)
+                sent += CHUNK_PACKETS
+            await conn.audio_rate_controller.queue_empty_event.wait()
+            stats["packets"] += sent
+        await websocket.close()
+
+    async def _run(self, conn_count, bundle_enabled):
+        stats = {"writes": 0, "packets": 0}
+
+        async def handler(websocket):
+            await self._stream(websocket, bundle_enabled, stats)
+
+        async with serve(handler, HOST, PORT, max_size=None):
+            receiver = await asyncio.create_subprocess_exec(
+                sys.executable,
+                __file__,
+                "--receivers",
+                str(conn_count),
+                stdout=subprocess.DEVNULL,
+                env=dict(os.environ, PYTHONPATH=os.getcwd()),
+            )
+            cpu_start = time.process_time()
+            wall_start = time.monotonic()
+            await receiver.wait()
+            cpu_cost = time.process_time() - cpu_start
+            wall_cost = time.monotonic() - wall_start
+
+        return {
+            "writes_per_sec": stats["writes"] / wall_cost,
+            "packets_per_write": stats["packets"] / max(stats["writes"], 1),
+            "cpu_per_stream": cpu_cost / wall_cost / conn_count * 1000,
+        }
+
+    async def test_bundle(self, conn_counts=(50, 200)):
+        for conn_count in conn_counts:
+            for bundle_enabled in (False, True):
+                result = await self._run(conn_count, bundle_enabled)
+                self.results.append(
+                    [
+                        "合并发送" if bundle_enabled else "逐包发送",
+                        conn_count,
+                        f"{result['writes_per_sec']:.0f}",
+                        f"{result['packets_per_write']:.2f}",
+                        f"{result['cpu_per_stream']:.2f}",
+                    ]
+                )
+
+    def print_results(self):
+        print("\n音频下发方式对比（服务端）：")
+        print(
+            tabulate(
+                self.results,
+                headers=[
+                    "模式",
+                    "并发连接",
+                    "socket写入/秒",
+                    "每次写入的包数",
+                    "每路CPU(ms/秒)",
+                ],
+                tablefmt="grid",
+            )
+        )
+        print("\n测试说明：")
+        print("- 每路先整批交付10个包（其中5个预缓冲包），之后每480ms交付8个包，随机卡顿200~350ms")
+        print("- 卡顿后积压的包在同一个tick到期，合并发送时作为一帧发出")
+        print("- 接收端运行在独立进程中，CPU只统计服务端进程")
+
+    async def run(self):
+        await self.test_bundle()
+        self.print_results()
+
+
+async def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="音频包合并发送性能测试工具")
+    parser.add_argument("--duration", type=int, default=10, help="每组测试的时长(秒)")
+    parser.add_argument("--receivers", type=int, help=argparse.SUPPRESS)
+    args, _ = parser.parse_known_args()
+    if args.receivers:
+        # 子进程模式：只负责接收
+        await _run_receivers(args.receivers)
+        return
+    await AudioBundleTester(args.duration).run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,169 @@
+import time
+import asyncio
+import logging
+import numpy as np
+from collections import deque
+from tabulate import tabulate
+from core.utils.audioRateController import AudioRateController, AudioPacingScheduler
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "音频发送节奏控制性能测试"
+
+FRAME_DURATION = 60  # 毫秒
+
+
+def _percentile(values, p):
+    if not values:
+        return 0.0
+    return float(np.percentile(values, p))
+
+
+class LegacyAudioRateController:
+    """优化前的实现：每个连接一个后台任务，每个音频包各自sleep到发送时间"""
+
+    def __init__(self, frame_duration=FRAME_DURATION):
+        self.frame_duration = frame_duration
+        self.queue = deque()
+        self.play_position = 0
+        self.start_timestamp = None
+        self.pending_send_task = None
+        self.queue_empty_event = asyncio.Event()
+        self.queue_empty_event.set()
+        self.queue_has_data_event = asyncio.Event()
+
+    def add_audio(self, opus_packet):
+        self.queue.append(opus_packet)
+        self.queue_empty_event.clear()
+        self.queue_has_data_event.set()
+
+    async def check_queue(self, send_audio_callback):
+        while self.queue:
+            if self.start_timestamp is None:
+                self.start_timestamp = time.monotonic()
+            while True:
+                elapsed_ms = (time.monotonic() - self.start_timestamp) * 1000
+                if elapsed_ms < self.play_position:
+                    await asyncio.sleep((self.play_position - elapsed_ms) / 1000)
+                else:
+                    break
+            opus_packet = self.queue.popleft()
+            self.play_position += self.frame_duration
+            await send_audio_callback(opus_packet)
+        self.queue_empty_event.set()
+        self.queue_has_data_event.clear()
+
+    def start_sending(self, send_audio_callback):
+        async def _send_loop():
+            try:
+                while True:
+                    await self.queue_has_data_event.wait()
+                    await self.check_queue(send_audio_callback)
+            except asyncio.CancelledError:
+                pass
+
+        self.pending_send_task = asyncio.create_task(_send_loop())
+
+    def stop_sending(self):
+        if self.pending_send_task and not self.pending_send_task.done():
+            self.pending_send_task.cancel()
+
+
+class AudioPacingTester:
+    def __init__(self, seconds=5):
+        self.seconds = seconds
+        self.results = []
+
+    async def _run(self, controller_factory, conn_count):
+        """每个模拟连接一次性放入若干秒的音频包，统计发送时间相对理想时间的偏差"""
+        packet_count = int(self.seconds * 1000 / FRAME_DURATION)
+        jitters = []
+        controllers = []
+
+        for _ in range(conn_count):
+            controller = controller_factory()
+            state = {"index": 0, "start": None}
+
+            async def send(packet, state=state):
+                now = time.monotonic()
+                if state["start"] is None:
+                    state["start"] = now
+                expected = state["start"] + state["index"] * FRAME_DURATION / 1000
+                jitters.append((now - expected) * 1000)
+                state["index"] += 1
+
+            controller.start_sending(send)
+            controllers.append(controller)
+
+        cpu_start = time.process_time()
+        wall_start = time.monotonic()
+        for controller in controllers:
+            for _ in range(packet_count):
+                controller.add_audio(b"\x00" * 40)
+            # 错开各连接的起始时间，模拟真实场景
+            await asyncio.sleep(0.001)
+        await asyncio.gather(*(c.queue_empty_event.wait() for c in controllers))
+        cpu_cost = time.process_time() - cpu_start
+        wall_cost = time.monotonic() - wall_start
+
+        for controller in controllers:
+            controller.stop_sending()
+        return cpu_cost / wall_cost, jitters
+
+    async def test_pacing(self, conn_counts=(100, 500, 1000)):
+        for conn_count in conn_counts:
+            # 每轮使用新的调度器，避免上一轮的状态影响结果
+            shared_scheduler = AudioPacingScheduler()
+            for name, factory in (
+                ("每连接独立任务", LegacyAudioRateController),
+                (
+                    "共享时间轮",
+                    lambda: AudioRateController(FRAME_DURATION, shared_scheduler),
+                ),
+            ):
+                cpu_ratio, jitters = await self._run(factory, conn_count)
+                abs_jitters = [abs(j) for j in jitters]
+                self.results.append(
+                    [
+                        name,
+                        conn_count,
+                        f"{cpu_ratio * 100:.1f}%",
+                        f"{_percentile(abs_jitters, 50):.2f}",
+                        f"{_percentile(abs_jitters, 99):.2f}",
+                        f"{max(abs_jitters):.2f}",
+                    ]
+                )
+
+    def print_results(self):
+        print("\n音频发送节奏控制对比：")
+        print(
+            tabulate(
+                self.results,
+                headers=[
+                    "实现",
+                    "并发连接",
+                    "事件循环CPU占用",
+                    "P50抖动(ms)",
+                    "P99抖动(ms)",
+                    "最大抖动(ms)",
+                ],
+                tablefmt="grid",
+            )
+        )
+        print("\n测试说明：")
+        print(f"- 每个连接一次性放入{self.seconds}秒音频（60ms一包），由控制器按时发送")
+        print("- 抖动为实际发送时间与理想发送时间（首包时间+序号×60ms）的偏差")
+        print("- CPU占用为测试期间进程CPU时间与墙钟时间之比")
+
+    async def run(self):
+        await self.test_pacing()
+        self.print_results()
+
+
+async def main():
+    await AudioPacingTester().run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,173 @@
+import os
+import sys
+import asyncio
+import logging
+import threading
+import tracemalloc
+import subprocess
+from types import SimpleNamespace
+from tabulate import tabulate
+from websockets.asyncio.client import connect
+from websockets.asyncio.server import serve
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "TTS下行背压测试（接收端停止读取）"
+
+HOST = "127.0.0.1"
+PORT = 18766
+PACKET_SIZE = 180  # 24kbps下60ms一包约180字节
+# TTS合成速度为实时的10倍：每48ms产出8个包（480ms音频）
+CHUNK_PACKETS = 8
+CHUNK_INTERVAL = 0.048
+
+
+async def _run_stalled_reader():
+    """接收端：建立连接后不再读取任何数据，直到被服务端关闭"""
+    async with connect(f"ws://{HOST}:{PORT}", max_size=None) as ws:
+        await ws.wait_closed()
+
+
+class BackpressureTester:
+    def __init__(self, duration=20, sample_interval=5):
+        self.duration = duration
+        self.sample_interval = sample_interval
+        self.results = []
+
+    async def _stream(self, websocket, backpressure_enabled, samples):
+        """模拟一个长回复：TTS持续以10倍实时速度产出音频，播放任务送入流控队列"""
+        from core.utils.loop_queue import LoopQueue
+        from core.utils.write_backpressure import WriteBackpressure
+        from core.handle.sendAudioHandle import sendAudio, get_write_outstanding
+
+        conn = SimpleNamespace(
+            config={},
+            websocket=websocket,
+            client_abort=False,
+            conn_from_mqtt_gateway=False,
+            audio_bundle_enabled=False,
+            sentence_id="stalled-reader",
+            last_activity_time=0,
+            client_is_speaking=False,
+            write_backpressure=None,
+        )
+        if backpressure_enabled:
+            conn.write_backpressure = WriteBackpressure(
+                probe=lambda: get_write_outstanding(conn)
+            )
+        tts_audio_queue = LoopQueue()
+        tts_audio_queue.bind(asyncio.get_running_loop())
+        stop_event = threading.Event()
+
+        def tts_thread():
+            # 对应TTS文本线程：每合成一段前检查背压
+            while not stop_event.is_set():
+                if conn.write_backpressure:
+                    conn.write_backpressure.wait_writable_blocking(timeout=1)
+                    if not conn.write_backpressure.resumed_flag.is_set():
+                        continue
+                tts_audio_queue.put([bytes(PACKET_SIZE) for _ in range(CHUNK_PACKETS)])
+                stop_event.wait(CHUNK_INTERVAL)
+
+        async def play_task():
+            # 对应音频播放任务：背压时暂停消费
+            while True:
+                if conn.write_backpressure:
+                    await conn.write_backpressure.wait_writable()
+                await sendAudio(conn, await tts_audio_queue.get())
+
+        def pending_bytes():
+            queued = tts_audio_queue.qsize() * CHUNK_PACKETS * PACKET_SIZE
+            rate_controller = getattr(conn, "audio_rate_controller", None)
+            if rate_controller:
+                queued += rate_controller.queued_bytes
+            return queued + websocket.transport.get_write_buffer_size()
+
+        thread = threading.Thread(target=tts_thread, daemon=True)
+        thread.start()
+        player = asyncio.create_task(play_task())
+        tracemalloc.start()
+        base_memory = tracemalloc.get_traced_memory()[0]
+        elapsed = 0
+        while elapsed < self.duration:
+            await asyncio.sleep(self.sample_interval)
+            elapsed += self.sample_interval
+            samples.append(
+                (
+                    elapsed,
+                    pending_bytes(),
+                    tracemalloc.get_traced_memory()[0] - base_memory,
+                )
+            )
+        tracemalloc.stop()
+        stop_event.set()
+        player.cancel()
+        conn.audio_rate_controller.stop_sending()
+        await websocket.close()
+
+    async def _run(self, backpressure_enabled):
+        samples = []
+
+        async def handler(websocket):
+            await self._stream(websocket, backpressure_enabled, samples)
+
+        async with serve(handler, HOST, PORT, max_size=None):
+            reader = await asyncio.create_subprocess_exec(
+                sys.executable,
+                __file__,
+                "--stalled-reader",
+                stdout=subprocess.DEVNULL,
+                env=dict(os.environ, PYTHONPATH=os.getcwd()),
+            )
+            await reader.wait()
+        return samples
+
+    async def test_stalled_reader(self):
+        for backpressure_enabled in (False, True):
+            samples = await self._run(backpressure_enabled)
+            for elapsed, pending, memory in samples:
+                self.results.append(
+                    [
+                        "开启背压" if backpressure_enabled else "无背压",
+                        elapsed,
+                        f"{pending / 1024:.0f}",
+                        f"{memory / 1024:.0f}",
+                    ]
+                )
+
+    def print_results(self):
+        print("\n接收端停止读取时的服务端积压：")
+        print(
+            tabulate(
+                self.results,
+                headers=["模式", "时间(秒)", "未发送音频(KB)", "Python内存增量(KB)"],
+                tablefmt="grid",
+            )
+        )
+        print("\n测试说明：")
+        print("- TTS以10倍实时速度持续产出音频，接收端建立连接后不再读取")
+        print("- 未发送音频 = 音频队列 + 流控队列 + websocket传输层写缓冲（不含内核socket缓冲）")
+        print("- 背压使用默认水位：高水位96KB，低水位32KB")
+
+    async def run(self):
+        await self.test_stalled_reader()
+        self.print_results()
+
+
+async def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="TTS下行背压测试工具")
+    parser.add_argument("--duration", type=int, default=20, help="每组测试的时长(秒)")
+    parser.add_argument("--stalled-reader", action="store_true", help=argparse.SUPPRESS)
+    args, _ = parser.parse_known_args()
+    if args.stalled_reader:
+        # 子进程模式：只建立连接，不读取
+        await _run_stalled_reader()
+        return
+    await BackpressureTester(args.duration).run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
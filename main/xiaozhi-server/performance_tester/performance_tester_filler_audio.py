@@ -0,0 +1,181 @@
+import time
+import random
+import asyncio
+import logging
+from types import SimpleNamespace
+from tabulate import tabulate
+from core.utils.cancel_token import CancellationToken
+from core.utils.filler_audio import FillerAudio, filler_audio_cache
+from core.handle.fillerAudioHandle import schedule_filler_audio
+from core.handle.sendAudioHandle import sendAudioMessage, SentenceType
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "首句等待提示音测试"
+
+FILLER_FILE = "config/assets/wakeup_words_short.wav"
+REAL_PACKET = b"\xff" * 180  # 真实语音包，与提示音包区分
+REAL_PACKETS = 20
+
+
+class _QuietLogger:
+    def bind(self, **kwargs):
+        return self
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+class RecordingWebSocket:
+    """记录每个音频包的发送时间和来源"""
+
+    def __init__(self, filler_packets):
+        self.filler_packets = filler_packets
+        self.sent = []
+
+    async def send(self, data):
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            kind = "filler" if bytes(data) in self.filler_packets else "real"
+            self.sent.append((time.monotonic(), kind))
+
+    async def ping(self):
+        pong_waiter = asyncio.get_running_loop().create_future()
+        pong_waiter.set_result(0.01)
+        return pong_waiter
+
+
+def first_audio_latency(rng):
+    """首句语音到达时间：LLM首token（对数正态，中位数600ms）+ TTS首包（200~500ms）"""
+    return rng.lognormvariate(0.0, 0.5) * 0.6 + rng.uniform(0.2, 0.5)
+
+
+class FillerAudioTester:
+    def __init__(self, turns=300, seed=1):
+        self.turns = turns
+        self.seed = seed
+        self.results = []
+
+    def _make_conn(self, enable, threshold_ms, filler_packets):
+        conn = SimpleNamespace(
+            config={
+                "filler_audio": {
+                    "enable": enable,
+                    "threshold_ms": threshold_ms,
+                    "files": [FILLER_FILE],
+                }
+            },
+            logger=_QuietLogger(),
+            websocket=RecordingWebSocket(filler_packets),
+            tts=SimpleNamespace(tts_audio_first_sentence=True),
+            filler_audio=FillerAudio(),
+            turn_token=CancellationToken(),
+            client_abort=False,
+            client_is_speaking=False,
+            conn_from_mqtt_gateway=False,
+            audio_bundle_enabled=False,
+            close_after_chat=False,
+            session_id="filler-test",
+            sentence_id="filler-test-sentence",
+            last_activity_time=0,
+        )
+        return conn
+
+    async def _turn(self, conn, latency):
+        """一轮对话：开始对话后，真实语音在 latency 秒后经音频播放任务送达"""
+        start = time.monotonic()
+        schedule_filler_audio(conn)
+        await asyncio.sleep(latency)
+        await sendAudioMessage(conn, SentenceType.FIRST, [], "你好")
+        for _ in range(REAL_PACKETS):
+            await sendAudioMessage(conn, SentenceType.MIDDLE, REAL_PACKET, None)
+        # 等待流控队列发完
+        await asyncio.sleep(REAL_PACKETS * 0.06 + 0.5)
+        conn.audio_rate_controller.stop_sending()
+
+        sent = conn.websocket.sent
+        first_audio = sent[0][0] - start
+        first_real = next(t for t, kind in sent if kind == "real") - start
+        real_started = False
+        interleaved = 0
+        for _, kind in sent:
+            if kind == "real":
+                real_started = True
+            elif real_started:
+                interleaved += 1
+        return first_audio, first_real, interleaved
+
+    async def _run(self, enable, threshold_ms, filler_packets):
+        rng = random.Random(self.seed)
+        conns = [self._make_conn(enable, threshold_ms, filler_packets) for _ in range(self.turns)]
+        outcomes = await asyncio.gather(
+            *[self._turn(conn, first_audio_latency(rng)) for conn in conns]
+        )
+        fired = sum(conn.filler_audio.fired for conn in conns)
+        truncated = sum(conn.filler_audio.truncated for conn in conns)
+        saved = sum(conn.filler_audio.saved_ms for conn in conns)
+        perceived = sorted(o[0] * 1000 for o in outcomes)
+        return {
+            "fire_rate": fired / self.turns,
+            "p50": perceived[len(perceived) // 2],
+            "p90": perceived[int(len(perceived) * 0.9)],
+            "saved_avg": saved / fired if fired else 0,
+            "truncated": truncated,
+            "interleaved": sum(o[2] for o in outcomes),
+        }
+
+    async def test_thresholds(self):
+        clips = await filler_audio_cache.get([FILLER_FILE])
+        filler_packets = set(clips[0])
+        cases = [("关闭", False, 800)] + [
+            (f"阈值{threshold}ms", True, threshold) for threshold in (600, 800, 1200)
+        ]
+        for name, enable, threshold_ms in cases:
+            result = await self._run(enable, threshold_ms, filler_packets)
+            self.results.append(
+                [
+                    name,
+                    f"{result['fire_rate'] * 100:.1f}%",
+                    f"{result['p50']:.0f}",
+                    f"{result['p90']:.0f}",
+                    f"{result['saved_avg']:.0f}",
+                    result["truncated"],
+                    result["interleaved"],
+                ]
+            )
+
+    def print_results(self):
+        print("\n首句等待提示音效果：")
+        print(
+            tabulate(
+                self.results,
+                headers=[
+                    "提示音",
+                    "触发率",
+                    "感知时延P50(ms)",
+                    "感知时延P90(ms)",
+                    "触发时平均节省(ms)",
+                    "被真实语音截断",
+                    "真实语音后仍发送的提示音包",
+                ],
+                tablefmt="grid",
+            )
+        )
+        print("\n测试说明：")
+        print(f"- 模拟{self.turns}轮对话，首句语音到达时间 = LLM首token（对数正态，中位数600ms）+ TTS首包（200~500ms）")
+        print(f"- 提示音使用 {FILLER_FILE}（约1.5秒，比实际应答音长，因此多数会被真实语音截断）")
+        print("- 感知时延：从开始对话到设备收到第一个音频包（提示音或真实语音）的时间")
+        print("- 触发时平均节省：提示音开始播放到真实语音到达之间原本的静音时长")
+        print("- 提示音经 sendAudioMessage 与真实语音共用流控，真实语音到达后不应再发送任何提示音包")
+
+    async def run(self):
+        await self.test_thresholds()
+        self.print_results()
+
+
+async def main():
+    await FillerAudioTester().run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
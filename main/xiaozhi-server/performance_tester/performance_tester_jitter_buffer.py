@@ -0,0 +1,165 @@
+import time
+import random
+import asyncio
+import logging
+from tabulate import tabulate
+from core.utils.jitter_buffer import AudioJitterBuffer
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "上行音频抖动缓冲性能测试"
+
+FRAME_DURATION = 60  # 毫秒
+
+
+class LegacyReorder:
+    """优化前的实现：字典暂存乱序包，每次到达都排序扫描"""
+
+    def __init__(self):
+        self.audio_timestamp_buffer = {}
+        self.last_processed_timestamp = 0
+        self.max_timestamp_buffer_size = 20
+
+    def push(self, timestamp, audio_data):
+        released = []
+        if timestamp >= self.last_processed_timestamp:
+            released.append(audio_data)
+            self.last_processed_timestamp = timestamp
+            processed_any = True
+            while processed_any:
+                processed_any = False
+                for ts in sorted(self.audio_timestamp_buffer.keys()):
+                    if ts > self.last_processed_timestamp:
+                        released.append(self.audio_timestamp_buffer.pop(ts))
+                        self.last_processed_timestamp = ts
+                        processed_any = True
+                        break
+        else:
+            if len(self.audio_timestamp_buffer) < self.max_timestamp_buffer_size:
+                self.audio_timestamp_buffer[timestamp] = audio_data
+            else:
+                released.append(audio_data)
+        return released
+
+
+def build_timeline(packet_count, max_displacement, loss_rate, duplicate_rate, seed):
+    """
+    生成乱序到达的时间线：每个包的到达时间随机延后0~max_displacement个包，并按比例丢包、重复
+    返回 [(时间戳, 序号)]，序号用作音频数据以便校验顺序
+    """
+    rng = random.Random(seed)
+    arrivals = []
+    for index in range(packet_count):
+        if rng.random() < loss_rate:
+            continue
+        # 时间戳带少量采集误差
+        timestamp = index * FRAME_DURATION + rng.randint(0, 3)
+        arrival = index + rng.uniform(0, max_displacement)
+        arrivals.append((arrival, timestamp, index))
+        if rng.random() < duplicate_rate:
+            arrivals.append(
+                (arrival + rng.uniform(0, max_displacement), timestamp, index)
+            )
+    arrivals.sort()
+    return [(timestamp, index) for _, timestamp, index in arrivals]
+
+
+def count_inversions(released):
+    """输出中与前一个包相比倒序的次数"""
+    return sum(1 for prev, cur in zip(released, released[1:]) if cur < prev)
+
+
+class JitterBufferTester:
+    def __init__(self, packet_count=20000):
+        self.packet_count = packet_count
+        self.results = []
+
+    def _run(self, buffer, timeline):
+        released = []
+        start = time.perf_counter()
+        for timestamp, index in timeline:
+            released.extend(buffer.push(timestamp, index))
+        cost = time.perf_counter() - start
+        if isinstance(buffer, AudioJitterBuffer):
+            released.extend(buffer.flush())
+        return released, cost
+
+    def _check(self, buffer, timeline, released):
+        """校验抖动缓冲的输出：严格递增且每个包的去向都被统计到"""
+        assert all(
+            prev < cur for prev, cur in zip(released, released[1:])
+        ), "输出顺序错误"
+        metrics = buffer.get_metrics()
+        assert metrics["packets"] == len(timeline)
+        assert (
+            len(released) + metrics["late_drops"] + metrics["duplicates"]
+            == len(timeline)
+        ), "存在未统计的包"
+        return metrics
+
+    def test_timelines(self):
+        cases = [
+            ("顺序到达", 0, 0, 0),
+            ("延后≤2包", 2, 0, 0),
+            ("延后≤4包", 4, 0, 0),
+            ("延后≤4包+1%丢包", 4, 0.01, 0),
+            ("延后≤8包+3%丢包+1%重复", 8, 0.03, 0.01),
+        ]
+        for seed, (name, displacement, loss_rate, duplicate_rate) in enumerate(cases):
+            timeline = build_timeline(
+                self.packet_count, displacement, loss_rate, duplicate_rate, seed
+            )
+
+            legacy_released, legacy_cost = self._run(LegacyReorder(), timeline)
+
+            buffer = AudioJitterBuffer(FRAME_DURATION)
+            released, cost = self._run(buffer, timeline)
+            metrics = self._check(buffer, timeline, released)
+
+            for impl, impl_released, impl_cost, extra in (
+                ("排序扫描", legacy_released, legacy_cost, "-"),
+                (
+                    "最小堆",
+                    released,
+                    cost,
+                    f"乱序{metrics['reorders']} 迟到{metrics['late_drops']} "
+                    f"缺口{metrics['gaps']} 重复{metrics['duplicates']} "
+                    f"深度{metrics['target_depth']}",
+                ),
+            ):
+                self.results.append(
+                    [
+                        name,
+                        impl,
+                        f"{impl_cost / len(timeline) * 1e6:.2f}",
+                        count_inversions(impl_released),
+                        len(impl_released),
+                        extra,
+                    ]
+                )
+
+    def print_results(self):
+        print("\n上行音频抖动缓冲对比：")
+        print(
+            tabulate(
+                self.results,
+                headers=["时间线", "实现", "每包耗时(μs)", "输出倒序次数", "输出包数", "统计"],
+                tablefmt="grid",
+            )
+        )
+        print("\n测试说明：")
+        print(f"- 每条时间线{self.packet_count}个60ms音频包，每个包的到达时间随机延后，打乱到达顺序")
+        print("- 抖动缓冲的输出均已校验为严格递增，且输出+迟到+重复等于输入")
+
+    async def run(self):
+        self.test_timelines()
+        self.print_results()
+
+
+async def main():
+    await JitterBufferTester().run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,175 @@
+import os
+import time
+import wave
+import asyncio
+import logging
+import numpy as np
+from tabulate import tabulate
+from core.utils.asr import create_instance as create_stt_instance
+from core.providers.asr.base import ASRProviderBase
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "本地ASR批量推理性能测试"
+
+# 被测的本地ASR及其默认配置
+LOCAL_ASR_CONFIGS = {
+    "fun_local": {
+        "type": "fun_local",
+        "model_dir": "models/SenseVoiceSmall",
+        "output_dir": "tmp/",
+    },
+    "sherpa_onnx_local": {
+        "type": "sherpa_onnx_local",
+        "model_dir": "models/sherpa-onnx-sense-voice-zh-en-ja-ko-yue-2024-07-17",
+        "output_dir": "tmp/",
+        "model_type": "sense_voice",
+    },
+}
+
+
+def _percentile(values, p):
+    if not values:
+        return 0.0
+    return float(np.percentile(values, p))
+
+
+def _load_pcm(file_path):
+    """读取wav文件，转为16kHz单声道int16 PCM"""
+    with wave.open(file_path, "rb") as wf:
+        channels = wf.getnchannels()
+        rate = wf.getframerate()
+        samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+    samples = samples.reshape(-1, channels).mean(axis=1)
+    if rate != 16000:
+        target_len = int(len(samples) * 16000 / rate)
+        samples = np.interp(
+            np.linspace(0, len(samples) - 1, target_len),
+            np.arange(len(samples)),
+            samples,
+        )
+    return samples.astype(np.int16)
+
+
+def _build_utterances(count, seconds=3):
+    """用config/assets下的提示音拼接出若干段合成语音，每段叠加不同的微弱噪声"""
+    wav_root = os.path.join("config", "assets")
+    source = np.concatenate(
+        [
+            _load_pcm(os.path.join(wav_root, name))
+            for name in sorted(os.listdir(wav_root))
+            if name.endswith(".wav")
+        ]
+    )
+    target_len = 16000 * seconds
+    source = np.resize(source, target_len).astype(np.int32)
+
+    rng = np.random.default_rng(0)
+    utterances = []
+    for _ in range(count):
+        noise = rng.integers(-64, 64, size=target_len)
+        pcm = np.clip(source + noise, -32768, 32767).astype(np.int16)
+        utterances.append(pcm.tobytes())
+    return utterances
+
+
+class LocalASRBatchTester:
+    def __init__(self, asr_type="fun_local"):
+        self.asr_type = asr_type
+        self.results = []
+
+    def _create_asr(self, batched):
+        config = dict(LOCAL_ASR_CONFIGS[self.asr_type])
+        if batched:
+            config.update({"batch_window_ms": 30, "max_batch_size": 16})
+        else:
+            # 窗口为0、批大小为1，等价于逐条调用模型
+            config.update({"batch_window_ms": 0, "max_batch_size": 1})
+        return create_stt_instance(self.asr_type, config, True)
+
+    async def _run(self, asr, utterances):
+        async def recognize(pcm_bytes):
+            artifacts = ASRProviderBase.AudioArtifacts(
+                pcm_frames=[pcm_bytes],
+                pcm_bytes=pcm_bytes,
+                file_path=None,
+                temp_path=None,
+            )
+            start = time.perf_counter()
+            await asr.speech_to_text([], "benchmark", "pcm", artifacts)
+            return (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        latencies = await asyncio.gather(*(recognize(pcm) for pcm in utterances))
+        elapsed = time.perf_counter() - start
+        return len(utterances) / elapsed, latencies
+
+    async def test_concurrency(self, concurrency_levels=(1, 4, 8, 16)):
+        utterances = _build_utterances(max(concurrency_levels))
+        for batched in (False, True):
+            asr = self._create_asr(batched)
+            mode = "批量推理" if batched else "逐条推理"
+            # 预热，排除首次推理的初始化开销
+            await self._run(asr, utterances[:1])
+            for concurrency in concurrency_levels:
+                asr.batch_queue.reset_metrics()
+                throughput, latencies = await self._run(
+                    asr, utterances[:concurrency]
+                )
+                metrics = asr.batch_queue.get_metrics()
+                self.results.append(
+                    [
+                        mode,
+                        concurrency,
+                        f"{throughput:.2f}",
+                        f"{_percentile(latencies, 50):.0f}",
+                        f"{_percentile(latencies, 99):.0f}",
+                        f"{metrics['average_batch_size']:.1f}",
+                        metrics["max_queue_depth"],
+                    ]
+                )
+            asr.batch_queue.close()
+
+    def print_results(self):
+        print(f"\n{self.asr_type} 并发识别性能对比（CPU）：")
+        print(
+            tabulate(
+                self.results,
+                headers=[
+                    "模式",
+                    "并发语音数",
+                    "语音/秒",
+                    "P50耗时(ms)",
+                    "P99耗时(ms)",
+                    "平均批大小",
+                    "最大队列深度",
+                ],
+                tablefmt="grid",
+            )
+        )
+        print("\n测试说明：")
+        print("- 每段语音为3秒的合成音频，所有语音同时提交，模拟多个设备同时说完话")
+        print("- 耗时为提交到拿到识别结果的时间，包含排队等待时间")
+
+    async def run(self):
+        await self.test_concurrency()
+        self.print_results()
+
+
+async def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="本地ASR批量推理性能测试工具")
+    parser.add_argument(
+        "--asr",
+        choices=list(LOCAL_ASR_CONFIGS.keys()),
+        default="fun_local",
+        help="被测的本地ASR类型",
+    )
+    args, _ = parser.parse_known_args()
+    await LocalASRBatchTester(args.asr).run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
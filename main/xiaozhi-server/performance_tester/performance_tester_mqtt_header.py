@@ -0,0 +1,123 @@
+import time
+import asyncio
+import logging
+from tabulate import tabulate
+from core.utils.mqtt_audio_header import MQTTAudioPacker, parse_mqtt_audio_header
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "MQTT网关音频头部打包性能测试"
+
+# 60ms一包，每台设备每秒约17个包
+PACKETS_PER_SECOND = 17
+OPUS_PACKET_SIZE = 180
+
+
+def legacy_pack(opus_packet, sequence, timestamp):
+    """优化前的实现：逐字段to_bytes写入临时bytearray，再拼接"""
+    header = bytearray(16)
+    header[0] = 1
+    header[2:4] = len(opus_packet).to_bytes(2, "big")
+    header[4:8] = sequence.to_bytes(4, "big")
+    header[8:12] = timestamp.to_bytes(4, "big")
+    header[12:16] = len(opus_packet).to_bytes(4, "big")
+    return bytes(header) + opus_packet
+
+
+def legacy_parse(message):
+    """优化前的实现：切片后int.from_bytes"""
+    timestamp = int.from_bytes(message[8:12], "big")
+    audio_length = int.from_bytes(message[12:16], "big")
+    return timestamp, audio_length
+
+
+class MQTTHeaderTester:
+    def __init__(self, devices=1000, seconds=10):
+        self.devices = devices
+        self.seconds = seconds
+        self.results = []
+
+    def _measure(self, func, packet_count):
+        """返回处理所有包的总耗时（秒）"""
+        start = time.perf_counter()
+        for i in range(packet_count):
+            func(i)
+        return time.perf_counter() - start
+
+    def test_pack(self, packet_count):
+        opus_packet = bytes(OPUS_PACKET_SIZE)
+        packer = MQTTAudioPacker()
+
+        def run_legacy(i):
+            return legacy_pack(opus_packet, i, i)
+
+        def run_struct(i):
+            # 结果指向复用的缓冲区，不再为头部和拼接结果分配新对象
+            return packer.pack(opus_packet, i, i)
+
+        return self._measure(run_legacy, packet_count), self._measure(
+            run_struct, packet_count
+        )
+
+    def test_parse(self, packet_count):
+        message = legacy_pack(bytes(OPUS_PACKET_SIZE), 1, 1)
+
+        def run_legacy(i):
+            return legacy_parse(message)
+
+        def run_struct(i):
+            return parse_mqtt_audio_header(message)
+
+        return self._measure(run_legacy, packet_count), self._measure(
+            run_struct, packet_count
+        )
+
+    def _append(self, name, legacy, current):
+        rate = self.devices * PACKETS_PER_SECOND
+        for impl, cost in (("逐字段to_bytes", legacy), ("struct", current)):
+            packet_count = rate * self.seconds
+            per_packet_us = cost / packet_count * 1e6
+            self.results.append(
+                [
+                    name,
+                    impl,
+                    f"{per_packet_us:.3f}",
+                    f"{per_packet_us * rate / 1e6 * 100:.2f}%",
+                ]
+            )
+
+    def run_tests(self):
+        packet_count = self.devices * PACKETS_PER_SECOND * self.seconds
+        legacy, current = self.test_pack(packet_count)
+        self._append("打包", legacy, current)
+        legacy, current = self.test_parse(packet_count)
+        self._append("解析", legacy, current)
+
+    def print_results(self):
+        print(
+            f"\nMQTT网关音频头部对比（{self.devices}台设备 × {PACKETS_PER_SECOND}包/秒）："
+        )
+        print(
+            tabulate(
+                self.results,
+                headers=["操作", "实现", "每包耗时(μs)", "单核CPU占用"],
+                tablefmt="grid",
+            )
+        )
+        print("\n测试说明：")
+        total = self.devices * PACKETS_PER_SECOND * self.seconds
+        print(f"- 共处理{total}个{OPUS_PACKET_SIZE}字节的包，相当于{self.seconds}秒的流量")
+        print("- 单核CPU占用 = 每包耗时 × 每秒总包数")
+
+    async def run(self):
+        self.run_tests()
+        self.print_results()
+
+
+async def main():
+    await MQTTHeaderTester().run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,182 @@
+import time
+import asyncio
+import logging
+import numpy as np
+from tabulate import tabulate
+from opuslib_next import Encoder, Decoder
+from opuslib_next import constants
+from core.utils.opus_encoder_utils import OpusEncoderUtils
+from core.utils.opus_decoder_pool import decode_opus_packets
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "Opus编解码性能测试"
+
+# 流式TTS常见的输出采样率和帧长
+TTS_SAMPLE_RATE = 24000
+FRAME_DURATION_MS = 60
+# 设备上行音频的采样率
+INPUT_SAMPLE_RATE = 16000
+
+
+def _synthetic_pcm(seconds, sample_rate):
+    """生成带噪声的正弦波作为测试音频，避免静音帧被编码器特殊处理"""
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    rng = np.random.default_rng(0)
+    signal = 0.3 * np.sin(2 * np.pi * 220 * t) + 0.05 * rng.standard_normal(len(t))
+    return (signal * 32767).astype(np.int16).tobytes()
+
+
+class LegacyOpusEncoder:
+    """优化前的实现：每次调用都用np.append扩展缓冲区，并逐帧tobytes"""
+
+    def __init__(self, sample_rate, channels, frame_size_ms):
+        self.frame_size = (sample_rate * frame_size_ms) // 1000
+        self.total_frame_size = self.frame_size * channels
+        self.buffer = np.array([], dtype=np.int16)
+        self.encoder = Encoder(sample_rate, channels, constants.APPLICATION_AUDIO)
+        self.encoder.bitrate = 24000
+        self.encoder.complexity = 10
+        self.encoder.signal = constants.SIGNAL_VOICE
+
+    def encode_pcm_to_opus_stream(self, pcm_data, end_of_stream, callback):
+        new_samples = np.frombuffer(pcm_data, dtype=np.int16)
+        # 原实现中 _validate_pcm_data 对每个输入块做的范围扫描
+        np.any((new_samples < -32768) | (new_samples > 32767))
+        self.buffer = np.append(self.buffer, new_samples)
+        offset = 0
+        while offset <= len(self.buffer) - self.total_frame_size:
+            frame = self.buffer[offset : offset + self.total_frame_size]
+            callback(self.encoder.encode(frame.tobytes(), self.frame_size))
+            offset += self.total_frame_size
+        self.buffer = self.buffer[offset:]
+        if end_of_stream and len(self.buffer) > 0:
+            last_frame = np.zeros(self.total_frame_size, dtype=np.int16)
+            last_frame[: len(self.buffer)] = self.buffer
+            callback(self.encoder.encode(last_frame.tobytes(), self.frame_size))
+            self.buffer = np.array([], dtype=np.int16)
+
+
+def _legacy_decode(opus_packets, sample_rate=INPUT_SAMPLE_RATE):
+    """优化前的实现：每次新建解码器，逐包解码后拼接bytes"""
+    decoder = Decoder(sample_rate, 1)
+    frame_size = sample_rate * FRAME_DURATION_MS // 1000
+    pcm_data = []
+    for opus_packet in opus_packets:
+        pcm_data.append(decoder.decode(opus_packet, frame_size))
+    return b"".join(pcm_data)
+
+
+class OpusPerformanceTester:
+    def __init__(self):
+        self.encode_results = []
+        self.decode_results = []
+
+    def _run_encode(self, encoder, pcm, chunk_bytes, rounds):
+        packets = []
+        cost = 0.0
+        for _ in range(rounds):
+            packets.clear()
+            start = time.perf_counter()
+            for offset in range(0, len(pcm), chunk_bytes):
+                chunk = pcm[offset : offset + chunk_bytes]
+                end_of_stream = offset + chunk_bytes >= len(pcm)
+                encoder.encode_pcm_to_opus_stream(chunk, end_of_stream, packets.append)
+            cost += time.perf_counter() - start
+        return cost / rounds, len(packets)
+
+    def test_encode(self, chunk_ms_list=(20, 40, 100, 200, 1000), seconds=10, rounds=5):
+        """流式TTS场景：按不同大小的PCM块喂给编码器，统计每个Opus包的平均耗时"""
+        pcm = _synthetic_pcm(seconds, TTS_SAMPLE_RATE)
+        for chunk_ms in chunk_ms_list:
+            chunk_bytes = TTS_SAMPLE_RATE * chunk_ms // 1000 * 2
+            legacy = LegacyOpusEncoder(TTS_SAMPLE_RATE, 1, FRAME_DURATION_MS)
+            current = OpusEncoderUtils(TTS_SAMPLE_RATE, 1, FRAME_DURATION_MS)
+            legacy_cost, packet_count = self._run_encode(
+                legacy, pcm, chunk_bytes, rounds
+            )
+            current_cost, _ = self._run_encode(current, pcm, chunk_bytes, rounds)
+            self.encode_results.append(
+                [
+                    chunk_ms,
+                    chunk_bytes,
+                    packet_count,
+                    f"{legacy_cost / packet_count * 1e6:.1f}",
+                    f"{current_cost / packet_count * 1e6:.1f}",
+                    f"{legacy_cost / current_cost:.2f}x",
+                ]
+            )
+            current.close()
+
+    def test_decode(self, seconds=10, rounds=20):
+        """整句解码场景：10秒语音的ASR解码、上报和声纹WAV生成都走这条路径"""
+        pcm = _synthetic_pcm(seconds, INPUT_SAMPLE_RATE)
+        encoder = OpusEncoderUtils(INPUT_SAMPLE_RATE, 1, FRAME_DURATION_MS)
+        opus_packets = []
+        encoder.encode_pcm_to_opus_stream(pcm, True, opus_packets.append)
+        encoder.close()
+
+        # 两种实现的解码结果应完全一致
+        assert _legacy_decode(opus_packets) == decode_opus_packets(opus_packets).tobytes()
+
+        for name, decode in (
+            ("每次新建解码器+拼接bytes", lambda: _legacy_decode(opus_packets)),
+            ("解码器池+预分配数组", lambda: decode_opus_packets(opus_packets).tobytes()),
+        ):
+            start = time.perf_counter()
+            for _ in range(rounds):
+                decode()
+            cost = (time.perf_counter() - start) / rounds
+            self.decode_results.append(
+                [
+                    name,
+                    len(opus_packets),
+                    f"{cost * 1000:.2f}",
+                    f"{cost / len(opus_packets) * 1e6:.1f}",
+                ]
+            )
+
+    def print_results(self):
+        if self.encode_results:
+            print(
+                f"\nOpus流式编码性能（{TTS_SAMPLE_RATE}Hz，{FRAME_DURATION_MS}ms帧）："
+            )
+            print(
+                tabulate(
+                    self.encode_results,
+                    headers=[
+                        "输入块(ms)",
+                        "输入块(字节)",
+                        "Opus包数",
+                        "优化前(us/包)",
+                        "优化后(us/包)",
+                        "加速比",
+                    ],
+                    tablefmt="grid",
+                )
+            )
+            print("- 耗时包含PCM缓冲与编码，编码器参数与线上一致（24kbps，复杂度10）")
+
+        if self.decode_results:
+            print(f"\n10秒语音整句解码性能（{INPUT_SAMPLE_RATE}Hz）：")
+            print(
+                tabulate(
+                    self.decode_results,
+                    headers=["实现", "Opus包数", "每句耗时(ms)", "每包耗时(us)"],
+                    tablefmt="grid",
+                )
+            )
+
+    def run(self):
+        self.test_encode()
+        self.test_decode()
+        self.print_results()
+
+
+async def main():
+    OpusPerformanceTester().run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
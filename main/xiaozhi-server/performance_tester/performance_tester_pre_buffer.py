@@ -0,0 +1,179 @@
+import random
+import asyncio
+import logging
+from tabulate import tabulate
+from core.utils.delivery_jitter import DeliveryJitterEstimator
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "TTS自适应预缓冲仿真测试"
+
+FRAME_DURATION = 60  # 毫秒
+FIXED_PRE_BUFFER = 5  # 优化前的固定预缓冲包数
+SENTENCE_PACKETS = 50  # 每句约3秒
+
+
+class Link:
+    """
+    链路模型：每个包有基础单程时延，另有随机出现的卡顿窗口（如Wi-Fi重传），
+    卡顿期间发出的包要等卡顿结束后才能到达（TCP队头阻塞）
+    """
+
+    def __init__(self, base_delay, stall_probability=0.0, stall_range=(0, 0)):
+        """
+        Args:
+            base_delay: 基础单程时延的采样函数 (rng) -> 毫秒
+            stall_probability: 每60ms出现一次卡顿的概率
+            stall_range: 卡顿时长范围（毫秒）
+        """
+        self.base_delay = base_delay
+        self.stall_probability = stall_probability
+        self.stall_range = stall_range
+        self.stalls = []
+
+    def new_period(self, rng, duration):
+        """为接下来 duration 毫秒生成卡顿窗口"""
+        self.stalls = []
+        for slot in range(int(duration / FRAME_DURATION)):
+            if rng.random() < self.stall_probability:
+                start = slot * FRAME_DURATION + rng.uniform(0, FRAME_DURATION)
+                self.stalls.append((start, start + rng.uniform(*self.stall_range)))
+
+    def arrival(self, rng, send_time):
+        arrival = send_time + self.base_delay(rng)
+        for start, end in self.stalls:
+            if start <= arrival < end:
+                arrival = end + self.base_delay(rng) / 2
+        return arrival
+
+
+def lan():
+    """局域网：单程约2ms，几乎没有抖动"""
+    return Link(lambda rng: max(0.5, rng.gauss(2, 0.5)))
+
+
+def good_wifi():
+    """良好Wi-Fi：单程10ms，少量排队时延，偶发短卡顿"""
+    return Link(lambda rng: 10 + rng.expovariate(1 / 5), 0.002, (60, 120))
+
+
+def poor_wifi():
+    """较差Wi-Fi：单程30ms，较大的排队时延，频繁出现150~300ms的卡顿"""
+    return Link(lambda rng: 30 + rng.expovariate(1 / 20), 0.02, (150, 300))
+
+
+LINKS = (("局域网", lan), ("良好Wi-Fi", good_wifi), ("较差Wi-Fi", poor_wifi))
+
+
+def play_sentence(pre_buffer_count, link, rng):
+    """
+    模拟一句话的发送与设备端播放
+    服务端：前 pre_buffer_count 个包在0时刻发出，其余包从0时刻起每60ms发一个
+    设备端：收到首包即开始播放，某个包在播放时刻还未到达则断音，等它到达后继续
+
+    Returns:
+        断音次数
+    """
+    underruns = 0
+    last_arrival = 0.0
+    play_time = None
+    for index in range(SENTENCE_PACKETS):
+        if index < pre_buffer_count:
+            send_time = 0.0
+        else:
+            send_time = (index - pre_buffer_count) * FRAME_DURATION
+        # TCP按序交付：后发的包不会先于前面的包到达
+        arrival = max(last_arrival, link.arrival(rng, send_time))
+        last_arrival = arrival
+        if play_time is None:
+            play_time = arrival
+        elif arrival > play_time:
+            underruns += 1
+            play_time = arrival
+        play_time += FRAME_DURATION
+    return underruns
+
+
+class PreBufferTester:
+    def __init__(self, sentences=2000, seed=1):
+        self.sentences = sentences
+        self.seed = seed
+        self.results = []
+
+    def _run(self, link_factory, adaptive):
+        rng = random.Random(self.seed)
+        link = link_factory()
+        estimator = DeliveryJitterEstimator(FRAME_DURATION)
+        total_underruns = 0
+        total_count = 0
+        sentences_with_underrun = 0
+        for _ in range(self.sentences):
+            # 句子之间的间隔（含一次ping探测）和整句的发送过程共用同一段链路状况
+            link.new_period(rng, (SENTENCE_PACKETS + 20) * FRAME_DURATION)
+            count = estimator.pre_buffer_count() if adaptive else FIXED_PRE_BUFFER
+            underruns = play_sentence(count, link, rng)
+            # 每句结束后进行一次ping探测，时间点随机（往返为两次单程时延）
+            probe_time = rng.uniform(0, SENTENCE_PACKETS * FRAME_DURATION)
+            pong_time = link.arrival(rng, link.arrival(rng, probe_time))
+            estimator.add_rtt((pong_time - probe_time) / 1000)
+            total_underruns += underruns
+            total_count += count
+            sentences_with_underrun += 1 if underruns else 0
+        average_count = total_count / self.sentences
+        return {
+            "pre_buffer": average_count,
+            "underruns": total_underruns / self.sentences,
+            "underrun_rate": sentences_with_underrun / self.sentences,
+            # 发送完最后一个包后等待预缓冲播放完的时间
+            "tail_wait": (average_count + 2) * FRAME_DURATION,
+        }
+
+    def test_links(self):
+        for link_name, link_factory in LINKS:
+            for name, adaptive in (("固定5包", False), ("自适应", True)):
+                result = self._run(link_factory, adaptive)
+                self.results.append(
+                    [
+                        link_name,
+                        name,
+                        f"{result['pre_buffer']:.2f}",
+                        f"{result['tail_wait']:.0f}",
+                        f"{result['underruns']:.3f}",
+                        f"{result['underrun_rate'] * 100:.1f}%",
+                    ]
+                )
+
+    def print_results(self):
+        print("\nTTS预缓冲仿真对比：")
+        print(
+            tabulate(
+                self.results,
+                headers=[
+                    "链路",
+                    "预缓冲",
+                    "平均预缓冲包数",
+                    "句末等待(ms)",
+                    "每句断音次数",
+                    "出现断音的句子",
+                ],
+                tablefmt="grid",
+            )
+        )
+        print("\n测试说明：")
+        print(f"- 每种链路模拟{self.sentences}句话，每句{SENTENCE_PACKETS}个60ms音频包")
+        print("- 每个包按链路模型注入单程时延和随机卡顿，按TCP顺序交付；设备收到首包即开始播放")
+        print("- 每句结束后用一次ping往返时间更新抖动估计，自适应模式按估计值确定下一句的预缓冲")
+        print("- 句末等待为队列发送完后等待预缓冲在设备端播放完的时间：(预缓冲+2)×60ms")
+
+    async def run(self):
+        self.test_links()
+        self.print_results()
+
+
+async def main():
+    await PreBufferTester().run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
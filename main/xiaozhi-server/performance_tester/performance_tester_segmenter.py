@@ -0,0 +1,210 @@
+import time
+import random
+import asyncio
+import logging
+from tabulate import tabulate
+from core.utils import textUtils
+from core.providers.tts.base import TTSProviderBase
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "流式TTS增量分句性能测试"
+
+CORPUS_FILE = "agent-base-prompt.txt"
+
+
+class LegacySegmenter:
+    """优化前的实现：每个token都 join 全文，再对每个标点 rfind"""
+
+    def __init__(self, punctuations, first_sentence_punctuations):
+        self.punctuations = punctuations
+        self.first_sentence_punctuations = first_sentence_punctuations
+        self.tts_text_buff = []
+        self.processed_chars = 0
+        self.is_first_sentence = True
+        self.tts_stop_request = False
+
+    def start(self):
+        self.tts_text_buff = []
+        self.processed_chars = 0
+        self.is_first_sentence = True
+
+    def push(self, token):
+        self.tts_text_buff.append(token)
+        full_text = "".join(self.tts_text_buff)
+        current_text = full_text[self.processed_chars :]
+        last_punct_pos = -1
+        punctuations_to_use = (
+            self.first_sentence_punctuations
+            if self.is_first_sentence
+            else self.punctuations
+        )
+        for punct in punctuations_to_use:
+            pos = current_text.rfind(punct)
+            if (pos != -1 and last_punct_pos == -1) or (
+                pos != -1 and pos < last_punct_pos
+            ):
+                last_punct_pos = pos
+        if last_punct_pos != -1:
+            segment_text_raw = current_text[: last_punct_pos + 1]
+            segment_text = textUtils.get_string_no_punctuation_or_emoji(
+                segment_text_raw
+            )
+            self.processed_chars += len(segment_text_raw)
+            if self.is_first_sentence:
+                self.is_first_sentence = False
+            return segment_text
+        elif self.tts_stop_request and current_text:
+            self.is_first_sentence = True
+            return current_text
+        return None
+
+    def finish(self):
+        full_text = "".join(self.tts_text_buff)
+        remaining_text = full_text[self.processed_chars :]
+        if remaining_text:
+            segment_text = textUtils.get_string_no_punctuation_or_emoji(remaining_text)
+            if segment_text:
+                self.processed_chars += len(full_text)
+                return segment_text
+        return None
+
+
+class RecordingTTS(TTSProviderBase):
+    """只记录分句结果，不做合成"""
+
+    def __init__(self):
+        super().__init__({}, delete_audio_file=True)
+        self.segments = []
+
+    def to_tts_stream(self, text, opus_handler=None):
+        self.segments.append(text)
+
+    async def text_to_speak(self, text, output_file):
+        return None
+
+    def start(self):
+        # 与 tts_text_priority_thread 收到 FIRST 时的初始化一致
+        self.tts_stop_request = False
+        self.text_segmenter.reset()
+        self.is_first_sentence = True
+
+    def push(self, token):
+        self.text_segmenter.feed(token)
+        return self._get_segment_text()
+
+    def finish(self):
+        before = len(self.segments)
+        self._process_remaining_text_stream()
+        return self.segments[-1] if len(self.segments) > before else None
+
+
+def build_stream(rng, corpus, length):
+    """从语料中截取约 length 个字符的回复，按LLM的习惯切成1~4个字符的token"""
+    start = rng.randrange(0, max(1, len(corpus) - length))
+    text = corpus[start : start + length]
+    while len(text) < length:
+        text += corpus[: length - len(text)]
+    tokens = []
+    index = 0
+    while index < len(text):
+        size = rng.choice((1, 1, 2, 2, 2, 3, 4))
+        tokens.append(text[index : index + size])
+        index += size
+    return tokens
+
+
+def run_stream(segmenter, tokens):
+    segments = []
+    segmenter.start()
+    start = time.perf_counter()
+    for token in tokens:
+        segment = segmenter.push(token)
+        if segment:
+            segments.append(segment)
+    remaining = segmenter.finish()
+    elapsed = time.perf_counter() - start
+    if remaining:
+        segments.append(remaining)
+    return segments, elapsed
+
+
+class SegmenterTester:
+    def __init__(self, streams=50, seed=1):
+        self.streams = streams
+        self.seed = seed
+        self.results = []
+
+    def test_lengths(self):
+        with open(CORPUS_FILE, "r", encoding="utf-8") as f:
+            # 去掉换行，模拟一整段连续的回复
+            corpus = f.read().replace("\n", "")
+        rng = random.Random(self.seed)
+        tts = RecordingTTS()
+        legacy = LegacySegmenter(tts.punctuations, tts.first_sentence_punctuations)
+        for length in (500, 2000, 3000, 4000):
+            legacy_total = 0.0
+            new_total = 0.0
+            token_count = 0
+            segment_count = 0
+            for _ in range(self.streams):
+                tokens = build_stream(rng, corpus, length)
+                tts.segments = []
+                legacy_segments, legacy_elapsed = run_stream(legacy, tokens)
+                new_segments, new_elapsed = run_stream(tts, tokens)
+                assert new_segments == legacy_segments, "分句结果与原实现不一致"
+                legacy_total += legacy_elapsed
+                new_total += new_elapsed
+                token_count += len(tokens)
+                segment_count += len(new_segments)
+            self.results.append(
+                [
+                    length,
+                    token_count // self.streams,
+                    segment_count // self.streams,
+                    f"{legacy_total / self.streams * 1000:.2f}",
+                    f"{new_total / self.streams * 1000:.2f}",
+                    f"{legacy_total / token_count * 1e6:.1f}",
+                    f"{new_total / token_count * 1e6:.1f}",
+                    f"{legacy_total / new_total:.1f}x",
+                    "一致",
+                ]
+            )
+
+    def print_results(self):
+        print("\n流式分句耗时对比：")
+        print(
+            tabulate(
+                self.results,
+                headers=[
+                    "回复长度(字)",
+                    "token数",
+                    "分句数",
+                    "原实现(ms/回复)",
+                    "增量分句(ms/回复)",
+                    "原实现(µs/token)",
+                    "增量分句(µs/token)",
+                    "加速",
+                    "分句结果",
+                ],
+                tablefmt="grid",
+            )
+        )
+        print("\n测试说明：")
+        print(f"- 回复文本截取自 {CORPUS_FILE}，按1~4个字符切分为token逐个送入，每种长度{self.streams}条")
+        print("- 原实现：每个token都 join 全部文本后对每个标点 rfind")
+        print("- 增量分句：TTSProviderBase._get_segment_text，每个token只扫描一次")
+        print("- 每条回复都校验两种实现输出的分句完全一致（含首句标点规则和末尾剩余文本）")
+
+    async def run(self):
+        self.test_lengths()
+        self.print_results()
+
+
+async def main():
+    await SegmenterTester().run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,168 @@
+import io
+import time
+import wave
+import random
+import shutil
+import asyncio
+import logging
+import tempfile
+import statistics
+from types import SimpleNamespace
+from tabulate import tabulate
+from core.utils.cancel_token import CancellationToken
+from core.utils.tts_cache import TTSAudioCache
+from core.providers.tts.base import TTSProviderBase
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "TTS音频缓存命中率与首包耗时测试"
+
+SAMPLE_RATE = 16000
+UPSTREAM_LATENCY = (0.12, 0.25)  # 模拟TTS服务返回整句音频的耗时（秒）
+
+# 对话中反复出现的句子：应答、问候、报错提示
+COMMON_SENTENCES = [
+    "好的",
+    "好的，马上为你处理",
+    "没问题",
+    "你好，我是小智",
+    "我在呢",
+    "再见，下次见",
+    "抱歉，我没有听清楚",
+    "网络有点问题，请稍后再试",
+    "已经帮你打开了",
+    "已经帮你关闭了",
+    "现在音量调到百分之五十",
+    "还有什么可以帮你的吗",
+]
+
+
+def make_wav(duration):
+    """生成一段静音wav，作为模拟TTS服务返回的音频"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(bytes(int(SAMPLE_RATE * duration) * 2))
+    return buffer.getvalue()
+
+
+class MockTTSProvider(TTSProviderBase):
+    """非流式TTS：等待上游返回整句wav，由基类解码并编码为opus"""
+
+    def __init__(self, rng):
+        super().__init__({"type": "mock", "voice": "xiaozhi"}, delete_audio_file=True)
+        self.rng = rng
+        self.upstream_calls = 0
+
+    async def text_to_speak(self, text, output_file):
+        self.upstream_calls += 1
+        await asyncio.sleep(self.rng.uniform(*UPSTREAM_LATENCY))
+        return make_wav(0.25 * len(text) / 4 + 0.3)
+
+
+def build_workload(rng, sentences, round_index):
+    """约一半句子来自常用句，其余为只出现一次的句子（每轮测试都不同）"""
+    workload = []
+    for index in range(sentences):
+        if rng.random() < 0.5:
+            # 越靠前的常用句出现得越频繁
+            workload.append(COMMON_SENTENCES[min(int(rng.expovariate(0.3)), len(COMMON_SENTENCES) - 1)])
+        else:
+            workload.append(f"这是第{round_index}轮第{index}句只出现一次的回答")
+    return workload
+
+
+class TTSCacheTester:
+    def __init__(self, sentences=150, seed=1):
+        self.sentences = sentences
+        self.seed = seed
+        self.results = []
+        self.cache_dir = tempfile.mkdtemp(prefix="tts_cache_")
+
+    def _run(self, name, cache):
+        rng = random.Random(self.seed)
+        workload = build_workload(rng, self.sentences, len(self.results))
+        tts = MockTTSProvider(rng)
+        tts.conn = SimpleNamespace(
+            sample_rate=SAMPLE_RATE,
+            audio_format="opus",
+            turn_token=CancellationToken(),
+        )
+        # 未命中时每句使用临时编码器，与 to_tts 的编码方式相同
+        tts.opus_encoder = None
+        tts.tts_cache = cache
+        first_audio = []
+        state = {}
+
+        def opus_handler(packet):
+            if state["first"] is None:
+                state["first"] = (time.perf_counter() - state["start"]) * 1000
+
+        for text in workload:
+            state["start"] = time.perf_counter()
+            state["first"] = None
+            tts.to_tts_stream(text, opus_handler=opus_handler)
+            first_audio.append(state["first"])
+        tts._stop_tts_loop()
+        first_audio.sort()
+        metrics = cache.get_metrics() if cache else None
+        self.results.append(
+            [
+                name,
+                tts.upstream_calls,
+                f"{metrics['hit_ratio'] * 100:.1f}%" if metrics else "-",
+                f"{statistics.mean(first_audio):.1f}",
+                f"{first_audio[len(first_audio) // 2]:.1f}",
+                f"{first_audio[int(len(first_audio) * 0.9)]:.1f}",
+                metrics["saved_ms_avg"] if metrics else "-",
+                metrics["entries"] if metrics else "-",
+            ]
+        )
+
+    def test_cache(self):
+        self._run("不开启缓存", None)
+        self._run("开启缓存（空缓存启动）", TTSAudioCache(self.cache_dir))
+        # 模拟服务重启：新实例从磁盘重建索引
+        self._run("开启缓存（重启后）", TTSAudioCache(self.cache_dir))
+
+    def print_results(self):
+        print("\nTTS音频缓存效果：")
+        print(
+            tabulate(
+                self.results,
+                headers=[
+                    "模式",
+                    "上游请求数",
+                    "命中率",
+                    "平均首包(ms)",
+                    "P50首包(ms)",
+                    "P90首包(ms)",
+                    "命中平均节省(ms)",
+                    "缓存条数",
+                ],
+                tablefmt="grid",
+            )
+        )
+        print("\n测试说明：")
+        print(f"- 模拟{self.sentences}句回复，约一半来自{len(COMMON_SENTENCES)}条常用句（应答、问候、报错提示），其余只出现一次")
+        print(f"- 模拟TTS服务返回整句wav耗时{UPSTREAM_LATENCY[0] * 1000:.0f}~{UPSTREAM_LATENCY[1] * 1000:.0f}ms，未命中时由基类解码并编码为opus")
+        print("- 首包：从 to_tts_stream 开始到第一个opus包交给播放队列的耗时")
+        print("- 重启后：新建缓存实例从磁盘目录恢复索引，常用句直接命中")
+
+    async def run(self):
+        try:
+            await asyncio.to_thread(self.test_cache)
+        finally:
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+        self.print_results()
+
+
+async def main():
+    await TTSCacheTester().run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,185 @@
+import time
+import asyncio
+import logging
+import threading
+import statistics
+from types import SimpleNamespace
+import aiohttp
+import requests
+from aiohttp import web
+from tabulate import tabulate
+from core.utils.cancel_token import CancellationToken
+from core.utils.http_pool import get_http_session
+from core.providers.tts.base import TTSProviderBase
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "HTTP接口TTS连接池测试"
+
+HOST = "127.0.0.1"
+PORT = 18770
+HANDSHAKE_DELAY = 0.05  # 新连接首个请求额外等待，模拟TLS握手与慢启动（秒）
+SYNTH_DELAY = 0.03  # 模拟合成耗时
+AUDIO_SIZE = 9600
+MAX_CONNECTIONS_PER_HOST = 4
+
+
+class MockTTSServer:
+    """模拟HTTP接口TTS服务，新连接的首个请求多等待一次握手时间，统计客户端建立的连接数"""
+
+    def __init__(self):
+        self.peers = set()
+        self.active = 0
+        self.max_active = 0
+
+    async def tts_handler(self, request):
+        peer = request.transport.get_extra_info("peername")
+        if peer not in self.peers:
+            self.peers.add(peer)
+            await asyncio.sleep(HANDSHAKE_DELAY)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(SYNTH_DELAY)
+            response = web.StreamResponse(headers={"Content-Type": "application/octet-stream"})
+            await response.prepare(request)
+            await response.write(bytes(AUDIO_SIZE))
+            return response
+        finally:
+            self.active -= 1
+
+    def reset(self):
+        self.peers = set()
+        self.max_active = 0
+
+    def start(self):
+        started = threading.Event()
+
+        def run():
+            loop = asyncio.new_event_loop()
+            app = web.Application()
+            app.router.add_post("/tts", self.tts_handler)
+            runner = web.AppRunner(app)
+            loop.run_until_complete(runner.setup())
+            loop.run_until_complete(web.TCPSite(runner, HOST, PORT).start())
+            started.set()
+            loop.run_forever()
+
+        threading.Thread(target=run, daemon=True).start()
+        started.wait()
+
+
+class MockTTSProvider(TTSProviderBase):
+    """按指定方式请求模拟服务的TTS提供者"""
+
+    def __init__(self, mode):
+        super().__init__({}, delete_audio_file=True)
+        self.mode = mode
+        self.url = f"http://{HOST}:{PORT}/tts"
+
+    async def text_to_speak(self, text, output_file):
+        if self.mode == "requests":
+            # 优化前的同步请求：每句都新建连接
+            return requests.post(self.url, json={"text": text}).content
+        if self.mode == "http_session":
+            return self.http_session.post(
+                self.url, json={"text": text}, timeout=self.http_timeout
+            ).content
+        if self.mode == "aiohttp":
+            # 优化前的流式请求：每句都新建 ClientSession
+            async with aiohttp.ClientSession() as session:
+                async with session.post(self.url, json={"text": text}) as resp:
+                    return await resp.read()
+        session = await self.get_aiohttp_session()
+        async with session.post(self.url, json={"text": text}) as resp:
+            return await resp.read()
+
+
+class HttpPoolTester:
+    def __init__(self, devices=8, sentences=20):
+        self.devices = devices
+        self.sentences = sentences
+        self.server = MockTTSServer()
+        self.results = []
+
+    def _device(self, mode, latencies):
+        tts = MockTTSProvider(mode)
+        tts.conn = SimpleNamespace(
+            turn_token=CancellationToken(),
+            config={"tts_http_pool": {"max_connections_per_host": MAX_CONNECTIONS_PER_HOST}},
+        )
+        for index in range(self.sentences):
+            start = time.perf_counter()
+            tts._run_tts_coroutine(tts.text_to_speak(f"第{index}句", None))
+            latencies.append((time.perf_counter() - start) * 1000)
+        tts._stop_tts_loop()
+
+    def _run(self, name, mode):
+        self.server.reset()
+        latencies = []
+        threads = [
+            threading.Thread(target=self._device, args=(mode, latencies))
+            for _ in range(self.devices)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        latencies.sort()
+        self.results.append(
+            [
+                name,
+                f"{statistics.mean(latencies):.1f}",
+                f"{latencies[len(latencies) // 2]:.1f}",
+                f"{latencies[int(len(latencies) * 0.9)]:.1f}",
+                len(self.server.peers),
+                self.server.max_active,
+            ]
+        )
+
+    def test_pool(self):
+        self._run("requests 每句新建连接（原方式）", "requests")
+        self._run("共享 http_session", "http_session")
+        self._run("aiohttp 每句新建会话（原方式）", "aiohttp")
+        self._run("get_aiohttp_session 跨句复用", "aiohttp_pool")
+
+    def print_results(self):
+        print("\nHTTP接口TTS单句耗时与连接数：")
+        print(
+            tabulate(
+                self.results,
+                headers=[
+                    "请求方式",
+                    "平均(ms/句)",
+                    "P50(ms/句)",
+                    "P90(ms/句)",
+                    "建立连接数",
+                    "最大并发请求",
+                ],
+                tablefmt="grid",
+            )
+        )
+        print("\n测试说明：")
+        print(f"- {self.devices}台设备并发，每台连续合成{self.sentences}句，共{self.devices * self.sentences}句")
+        print(f"- 模拟服务：合成耗时{SYNTH_DELAY * 1000:.0f}ms，新连接的首个请求额外等待{HANDSHAKE_DELAY * 1000:.0f}ms（模拟TLS握手与慢启动）")
+        print(
+            f"- 连接池每个主机最多保留{MAX_CONNECTIONS_PER_HOST}条keep-alive连接（tts_http_pool.max_connections_per_host），"
+            "同步请求并发超出时临时新建连接、用完即关闭"
+        )
+        print("- 共享 http_session 为进程级连接池，所有设备共用；aiohttp会话绑定在每台设备的TTS事件循环上")
+
+    async def run(self):
+        self.server.start()
+        # 进程级连接池在首次使用时按配置创建
+        get_http_session({"tts_http_pool": {"max_connections_per_host": MAX_CONNECTIONS_PER_HOST}})
+        await asyncio.to_thread(self.test_pool)
+        self.print_results()
+
+
+async def main():
+    await HttpPoolTester().run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,183 @@
+import time
+import asyncio
+import logging
+import threading
+import statistics
+from types import SimpleNamespace
+import aiohttp
+from aiohttp import web
+from tabulate import tabulate
+from core.utils.cancel_token import CancellationToken
+from core.providers.tts.base import TTSProviderBase
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "TTS常驻事件循环单句开销测试"
+
+HOST = "127.0.0.1"
+PORT = 18768
+AUDIO_SIZE = 4800  # 一句话返回的音频字节数
+
+
+class MockTTSServer:
+    """模拟HTTP流式TTS服务，立即返回固定长度的音频，统计新建的TCP连接数"""
+
+    def __init__(self):
+        self.peers = set()
+
+    @property
+    def connections(self):
+        return len(self.peers)
+
+    async def tts_handler(self, request):
+        # 以客户端地址和端口区分TCP连接
+        self.peers.add(request.transport.get_extra_info("peername"))
+        response = web.StreamResponse(headers={"Content-Type": "application/octet-stream"})
+        await response.prepare(request)
+        await response.write(bytes(AUDIO_SIZE))
+        return response
+
+    def start(self):
+        started = threading.Event()
+
+        def run():
+            loop = asyncio.new_event_loop()
+            app = web.Application()
+            app.router.add_post("/tts", self.tts_handler)
+            runner = web.AppRunner(app)
+            loop.run_until_complete(runner.setup())
+            loop.run_until_complete(web.TCPSite(runner, HOST, PORT).start())
+            started.set()
+            loop.run_forever()
+
+        threading.Thread(target=run, daemon=True).start()
+        started.wait()
+
+
+class MockTTSProvider(TTSProviderBase):
+    """与 index_stream 等HTTP流式提供者相同：每句新建 ClientSession 请求"""
+
+    def __init__(self, reuse_session=False):
+        super().__init__({}, delete_audio_file=True)
+        self.reuse_session = reuse_session
+        self.session = None
+
+    async def _request(self, session, text):
+        audio = bytearray()
+        async with session.post(f"http://{HOST}:{PORT}/tts", json={"text": text}) as response:
+            async for chunk in response.content.iter_any():
+                audio.extend(chunk)
+        return bytes(audio)
+
+    async def text_to_speak(self, text, output_file):
+        if text is None:
+            await asyncio.sleep(0)
+            return None
+        if self.reuse_session:
+            # 会话绑定在创建它的事件循环上，只有常驻循环才能跨句复用
+            if self.session is None:
+                self.session = aiohttp.ClientSession()
+            return await self._request(self.session, text)
+        async with aiohttp.ClientSession() as session:
+            return await self._request(session, text)
+
+
+def legacy_run_tts_coroutine(tts, coro):
+    """优化前的实现：每句话 asyncio.run 创建并销毁一个事件循环"""
+    turn_token = tts.conn.turn_token
+
+    async def _run():
+        loop = asyncio.get_running_loop()
+        task = asyncio.current_task()
+
+        def cancel():
+            loop.call_soon_threadsafe(task.cancel)
+
+        turn_token.register(cancel)
+        try:
+            return await coro
+        finally:
+            turn_token.unregister(cancel)
+
+    return asyncio.run(_run())
+
+
+class TTSLoopTester:
+    def __init__(self, sentences=300):
+        self.sentences = sentences
+        self.server = MockTTSServer()
+        self.results = []
+
+    def _measure(self, name, mode, text, reuse_session=False):
+        tts = MockTTSProvider(reuse_session)
+        tts.conn = SimpleNamespace(turn_token=CancellationToken())
+        run = tts._run_tts_coroutine
+        if mode == "legacy":
+            run = lambda coro: legacy_run_tts_coroutine(tts, coro)
+        # 预热
+        run(tts.text_to_speak(text, None))
+        connections_before = self.server.connections
+        durations = []
+        for _ in range(self.sentences):
+            start = time.perf_counter()
+            run(tts.text_to_speak(text, None))
+            durations.append((time.perf_counter() - start) * 1e6)
+        connections = self.server.connections - connections_before
+        if tts.session:
+            tts._run_tts_coroutine(tts.session.close())
+        tts._stop_tts_loop()
+        durations.sort()
+        self.results.append(
+            [
+                name,
+                "每句 asyncio.run" if mode == "legacy" else "常驻事件循环",
+                f"{statistics.mean(durations):.0f}",
+                f"{durations[len(durations) // 2]:.0f}",
+                f"{durations[int(len(durations) * 0.99)]:.0f}",
+                connections if text else "-",
+            ]
+        )
+
+    def test_overhead(self):
+        self._measure("空协程", "legacy", None)
+        self._measure("空协程", "persistent", None)
+        self._measure("HTTP合成(每句新建会话)", "legacy", "你好")
+        self._measure("HTTP合成(每句新建会话)", "persistent", "你好")
+        self._measure("HTTP合成(复用会话)", "persistent", "你好", reuse_session=True)
+
+    def print_results(self):
+        print("\nTTS单句调度开销：")
+        print(
+            tabulate(
+                self.results,
+                headers=[
+                    "场景",
+                    "执行方式",
+                    "平均(µs/句)",
+                    "P50(µs/句)",
+                    "P99(µs/句)",
+                    "新建TCP连接",
+                ],
+                tablefmt="grid",
+            )
+        )
+        print("\n测试说明：")
+        print(f"- 每种场景在TTS线程中连续合成{self.sentences}句，统计从提交到拿到结果的耗时")
+        print("- 空协程：只包含事件循环的创建/销毁或跨线程提交开销")
+        print(f"- HTTP合成：本地模拟服务立即返回{AUDIO_SIZE}字节音频，与 index_stream 等提供者一样每句新建 ClientSession")
+        print("- 复用会话：ClientSession 绑定在事件循环上，常驻事件循环下可以跨句保持连接")
+        print("- 新建TCP连接：服务端看到的客户端连接数，不含预热的第一句")
+
+    async def run(self):
+        self.server.start()
+        await asyncio.to_thread(self.test_overhead)
+        self.print_results()
+
+
+async def main():
+    await TTSLoopTester().run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,165 @@
+import time
+import queue
+import asyncio
+import logging
+import threading
+import numpy as np
+import psutil
+from tabulate import tabulate
+from core.utils.loop_queue import LoopQueue
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "TTS音频播放队列性能测试"
+
+FRAME_DURATION = 60  # 毫秒
+
+
+class LegacyPlayer:
+    """优化前的实现：每个连接一个线程，阻塞读取queue.Queue后跨线程提交协程并等待结果"""
+
+    def __init__(self, loop, on_packet):
+        self.loop = loop
+        self.on_packet = on_packet
+        self.audio_queue = queue.Queue()
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while not self.stop_event.is_set():
+            try:
+                item = self.audio_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            future = asyncio.run_coroutine_threadsafe(self.on_packet(item), self.loop)
+            future.result()
+
+    def stop(self):
+        self.stop_event.set()
+        self.thread.join()
+
+
+class TaskPlayer:
+    """当前实现：事件循环中的任务消费LoopQueue"""
+
+    def __init__(self, loop, on_packet):
+        self.on_packet = on_packet
+        self.audio_queue = LoopQueue()
+        self.audio_queue.bind(loop)
+        self.task = loop.create_task(self._run())
+
+    async def _run(self):
+        try:
+            while True:
+                item = await self.audio_queue.get()
+                await self.on_packet(item)
+        except asyncio.CancelledError:
+            pass
+
+    def stop(self):
+        self.task.cancel()
+
+
+class TTSPlaybackTester:
+    def __init__(self, seconds=5):
+        self.seconds = seconds
+        self.results = []
+
+    async def _run(self, player_factory, conn_count):
+        """一个生产者线程（模拟TTS合成线程）按60ms节奏为每个连接投递音频包"""
+        loop = asyncio.get_running_loop()
+        process = psutil.Process()
+        rss_before = process.memory_info().rss
+        latencies = []
+
+        async def on_packet(put_time):
+            latencies.append((time.perf_counter() - put_time) * 1000)
+
+        players = [player_factory(loop, on_packet) for _ in range(conn_count)]
+        thread_count = threading.active_count()
+
+        packet_count = int(self.seconds * 1000 / FRAME_DURATION)
+
+        def produce():
+            for _ in range(packet_count):
+                tick = time.perf_counter()
+                for player in players:
+                    player.audio_queue.put(time.perf_counter())
+                elapsed = time.perf_counter() - tick
+                time.sleep(max(0, FRAME_DURATION / 1000 - elapsed))
+
+        cpu_start = time.process_time()
+        wall_start = time.monotonic()
+        await asyncio.to_thread(produce)
+        # 等待最后一批包被消费
+        while len(latencies) < packet_count * conn_count:
+            await asyncio.sleep(0.01)
+        cpu_cost = time.process_time() - cpu_start
+        wall_cost = time.monotonic() - wall_start
+        rss_after = process.memory_info().rss
+
+        for player in players:
+            player.stop()
+        await asyncio.sleep(0.2)
+        return {
+            "threads": thread_count,
+            "rss_mb": (rss_after - rss_before) / 1024 / 1024,
+            "cpu": cpu_cost / wall_cost,
+            "p50": float(np.percentile(latencies, 50)),
+            "p99": float(np.percentile(latencies, 99)),
+        }
+
+    async def test_playback(self, conn_counts=(100, 500)):
+        for conn_count in conn_counts:
+            for name, factory in (
+                ("每连接线程", LegacyPlayer),
+                ("事件循环任务", TaskPlayer),
+            ):
+                result = await self._run(factory, conn_count)
+                self.results.append(
+                    [
+                        name,
+                        conn_count,
+                        result["threads"],
+                        f"{result['rss_mb']:.1f}",
+                        f"{result['cpu'] * 100:.1f}%",
+                        f"{result['p50']:.3f}",
+                        f"{result['p99']:.3f}",
+                    ]
+                )
+
+    def print_results(self):
+        print("\nTTS音频播放队列对比：")
+        print(
+            tabulate(
+                self.results,
+                headers=[
+                    "实现",
+                    "并发连接",
+                    "进程线程数",
+                    "RSS增量(MB)",
+                    "CPU占用",
+                    "P50延迟(ms)",
+                    "P99延迟(ms)",
+                ],
+                tablefmt="grid",
+            )
+        )
+        print("\n测试说明：")
+        print(f"- 生产者线程每60ms为每个连接投递一个音频包，持续{self.seconds}秒")
+        print("- 延迟为投递到事件循环中开始处理该包的时间")
+        print("- RSS增量为创建播放器并完成测试后相对测试前的增长")
+
+    async def run(self):
+        await self.test_playback()
+        self.print_results()
+
+
+async def main():
+    await TTSPlaybackTester().run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,330 @@
+import os
+import sys
+import json
+import time
+import wave
+import asyncio
+import logging
+import subprocess
+import numpy as np
+from types import SimpleNamespace
+from tabulate import tabulate
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "VAD语音活动检测性能测试"
+
+# 16kHz下512个采样点，约32ms
+CHUNK_SAMPLES = 512
+CHUNK_INTERVAL = CHUNK_SAMPLES / 16000
+
+
+def _percentile(values, p):
+    if not values:
+        return 0.0
+    return float(np.percentile(values, p))
+
+
+def _new_conn():
+    return SimpleNamespace(vad_model_state=None)
+
+
+def _load_fixture(file_path):
+    """读取wav文件，转为16kHz单声道float32"""
+    with wave.open(file_path, "rb") as wf:
+        channels = wf.getnchannels()
+        rate = wf.getframerate()
+        samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+    samples = samples.reshape(-1, channels).mean(axis=1) / 32768.0
+    if rate != 16000:
+        target_len = int(len(samples) * 16000 / rate)
+        samples = np.interp(
+            np.linspace(0, len(samples) - 1, target_len),
+            np.arange(len(samples)),
+            samples,
+        )
+    return samples.astype(np.float32)
+
+
+def _load_fixtures():
+    """使用config/assets下录制好的提示音作为测试音频"""
+    wav_root = os.path.join("config", "assets")
+    return {
+        name: _load_fixture(os.path.join(wav_root, name))
+        for name in sorted(os.listdir(wav_root))
+        if name.endswith(".wav")
+    }
+
+
+def _measure_backend(backend, model_dir):
+    """在独立进程中执行：加载指定后端，输出启动耗时、内存占用、单帧耗时和每块语音概率"""
+    import psutil
+
+    start = time.perf_counter()
+    if backend == "torch":
+        from core.providers.vad.silero import VADProvider
+    else:
+        from core.providers.vad.silero_onnx import VADProvider
+    vad = VADProvider({"model_dir": model_dir})
+    startup = time.perf_counter() - start
+    rss = psutil.Process().memory_info().rss / 1024 / 1024
+
+    probs, costs = {}, []
+    for name, samples in _load_fixtures().items():
+        conn = _new_conn()
+        probs[name] = []
+        for i in range(0, len(samples) - CHUNK_SAMPLES + 1, CHUNK_SAMPLES):
+            chunk = samples[i : i + CHUNK_SAMPLES]
+            begin = time.perf_counter()
+            probs[name].append(vad._infer_batch([conn], [chunk])[0])
+            costs.append(time.perf_counter() - begin)
+
+    return {
+        "startup": startup,
+        "rss": rss,
+        "frame_cost": float(np.mean(costs)) * 1e6,
+        "probs": probs,
+    }
+
+
+def _decisions(probs, threshold=0.5, threshold_low=0.3):
+    """按VAD的双阈值规则把语音概率转为逐块判断结果"""
+    last_is_voice = False
+    decisions = []
+    for prob in probs:
+        if prob >= threshold:
+            last_is_voice = True
+        elif prob <= threshold_low:
+            last_is_voice = False
+        decisions.append(last_is_voice)
+    return decisions
+
+
+class VADPerformanceTester:
+    def __init__(self, model_dir="models/snakers4_silero-vad"):
+        self.model_dir = model_dir
+        self.rng = np.random.default_rng(0)
+        self.results = []
+
+    def _random_chunk(self):
+        return (self.rng.standard_normal(CHUNK_SAMPLES) * 0.1).astype(np.float32)
+
+    def _create_vad(self, batch_inference):
+        from core.providers.vad.silero import VADProvider
+
+        return VADProvider(
+            {
+                "model_dir": self.model_dir,
+                "batch_inference": batch_inference,
+                "batch_window_ms": 10,
+                "max_batch_size": 64,
+            }
+        )
+
+    async def _run_per_chunk(self, vad, conn_count, duration):
+        """逐块推理：每个连接按32ms节奏提交音频块，在事件循环中同步推理"""
+        latencies = []
+        processed = 0
+
+        async def client(conn):
+            nonlocal processed
+            start = time.monotonic()
+            index = 0
+            while True:
+                due = start + index * CHUNK_INTERVAL
+                if due - start >= duration:
+                    break
+                await asyncio.sleep(max(0, due - time.monotonic()))
+                vad._infer_batch([conn], [self._random_chunk()])
+                latencies.append((time.monotonic() - due) * 1000)
+                processed += 1
+                index += 1
+
+        begin = time.monotonic()
+        await asyncio.gather(*[client(_new_conn()) for _ in range(conn_count)])
+        return processed / (time.monotonic() - begin), latencies
+
+    async def _run_batched(self, vad, conn_count, duration):
+        """批量推理：音频块交给调度器，按时间窗口合并推理"""
+        latencies = []
+        processed = 0
+
+        async def client(conn):
+            nonlocal processed
+            start = time.monotonic()
+            index = 0
+            while True:
+                due = start + index * CHUNK_INTERVAL
+                if due - start >= duration:
+                    break
+                await asyncio.sleep(max(0, due - time.monotonic()))
+                await vad.batch_scheduler.submit(conn, self._random_chunk())
+                latencies.append((time.monotonic() - due) * 1000)
+                processed += 1
+                index += 1
+
+        begin = time.monotonic()
+        await asyncio.gather(*[client(_new_conn()) for _ in range(conn_count)])
+        return processed / (time.monotonic() - begin), latencies
+
+    def test_buffer_ingestion(self, frame_count=20000):
+        """60ms帧写入缓冲区并按512采样点取块：bytearray重新切片 vs 环形缓冲区"""
+        from core.utils.pcm_ring_buffer import PCMRingBuffer
+
+        # 16kHz下60ms为960个采样点
+        frames = [
+            self.rng.integers(-32768, 32767, 960, dtype=np.int16).tobytes()
+            for _ in range(64)
+        ]
+
+        buffer = bytearray()
+        start = time.perf_counter()
+        for i in range(frame_count):
+            buffer.extend(frames[i % 64])
+            while len(buffer) >= CHUNK_SAMPLES * 2:
+                chunk = buffer[: CHUNK_SAMPLES * 2]
+                buffer = buffer[CHUNK_SAMPLES * 2 :]
+                np.frombuffer(chunk, dtype=np.int16)
+        bytearray_cost = (time.perf_counter() - start) / frame_count * 1e6
+
+        ring_buffer = PCMRingBuffer()
+        start = time.perf_counter()
+        for i in range(frame_count):
+            ring_buffer.extend(frames[i % 64])
+            while len(ring_buffer) >= CHUNK_SAMPLES:
+                ring_buffer.read(CHUNK_SAMPLES)
+        ring_cost = (time.perf_counter() - start) / frame_count * 1e6
+
+        print("\nVAD音频缓冲区写入性能（每60ms帧）：")
+        print(
+            tabulate(
+                [
+                    ["bytearray重新切片", f"{bytearray_cost:.2f}"],
+                    ["PCMRingBuffer", f"{ring_cost:.2f}"],
+                ],
+                headers=["缓冲区实现", "单帧耗时(us)"],
+                tablefmt="grid",
+            )
+        )
+
+    def test_backends(self):
+        """对比torch与onnxruntime后端：启动耗时、内存占用、单帧耗时、判断结果一致性"""
+        measurements = {}
+        env = dict(os.environ, PYTHONPATH=os.getcwd())
+        for backend in ("torch", "onnx"):
+            # 每个后端在独立进程中测量，避免互相影响启动耗时和内存
+            proc = subprocess.run(
+                [sys.executable, __file__, "--backend", backend],
+                capture_output=True,
+                text=True,
+                env=env,
+            )
+            if proc.returncode != 0:
+                print(f"{backend}后端测试失败: {proc.stderr[-500:]}")
+                continue
+            measurements[backend] = json.loads(proc.stdout.strip().splitlines()[-1])
+
+        if len(measurements) < 2:
+            return
+
+        torch_result, onnx_result = measurements["torch"], measurements["onnx"]
+        total, same = 0, 0
+        for name, probs in torch_result["probs"].items():
+            torch_decisions = _decisions(probs)
+            onnx_decisions = _decisions(onnx_result["probs"][name])
+            total += len(torch_decisions)
+            same += sum(a == b for a, b in zip(torch_decisions, onnx_decisions))
+
+        rows = [
+            [
+                backend,
+                f"{result['startup']:.2f}",
+                f"{result['rss']:.0f}",
+                f"{result['frame_cost']:.1f}",
+            ]
+            for backend, result in measurements.items()
+        ]
+        print("\nSilero VAD后端对比（CPU）：")
+        print(
+            tabulate(
+                rows,
+                headers=["后端", "启动耗时(秒)", "常驻内存(MB)", "单帧耗时(us)"],
+                tablefmt="grid",
+            )
+        )
+        print(f"测试音频共 {total} 个音频块，判断结果一致率: {same / max(total, 1):.2%}")
+
+    async def test_batch_inference(self, conn_counts=(10, 50, 100, 200), duration=5):
+        per_chunk_vad = self._create_vad(False)
+        batched_vad = self._create_vad(True)
+
+        for conn_count in conn_counts:
+            fps, latencies = await self._run_per_chunk(
+                per_chunk_vad, conn_count, duration
+            )
+            self.results.append(
+                [
+                    "逐块推理",
+                    conn_count,
+                    f"{fps:.0f}",
+                    f"{_percentile(latencies, 50):.1f}",
+                    f"{_percentile(latencies, 99):.1f}",
+                    "1.0",
+                ]
+            )
+
+            scheduler = batched_vad.batch_scheduler
+            scheduler.reset_metrics()
+            fps, latencies = await self._run_batched(batched_vad, conn_count, duration)
+            self.results.append(
+                [
+                    "批量推理",
+                    conn_count,
+                    f"{fps:.0f}",
+                    f"{_percentile(latencies, 50):.1f}",
+                    f"{_percentile(latencies, 99):.1f}",
+                    f"{scheduler.average_batch_size:.1f}",
+                ]
+            )
+
+        batched_vad.batch_scheduler.close()
+
+    def print_results(self):
+        print("\nVAD推理性能对比（CPU）：")
+        print(
+            tabulate(
+                self.results,
+                headers=["模式", "并发连接", "帧/秒", "P50延迟(ms)", "P99延迟(ms)", "平均批大小"],
+                tablefmt="grid",
+            )
+        )
+        print("\n测试说明：")
+        print("- 每个模拟连接每32ms提交一个512采样点的音频块，持续固定时长")
+        print("- 延迟为音频块到期时刻到拿到语音概率的时间，即VAD带来的额外延迟")
+        print("- 帧/秒低于 并发连接数×31.25 时说明推理已跟不上实时音频")
+
+    async def run(self, duration=5):
+        self.test_buffer_ingestion()
+        self.test_backends()
+        await self.test_batch_inference(duration=duration)
+        self.print_results()
+
+
+async def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="VAD性能测试工具")
+    parser.add_argument("--duration", type=int, default=5, help="每组测试的时长(秒)")
+    parser.add_argument("--backend", choices=["torch", "onnx"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.backend:
+        # 子进程模式：只测量单个后端并输出JSON结果
+        result = _measure_backend(args.backend, "models/snakers4_silero-vad")
+        print(json.dumps(result))
+        return
+    await VADPerformanceTester().run(args.duration)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
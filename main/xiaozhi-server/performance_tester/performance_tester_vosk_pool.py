@@ -0,0 +1,158 @@
+import os
+import json
+import time
+import wave
+import asyncio
+import logging
+import numpy as np
+from tabulate import tabulate
+from core.providers.asr.base import ASRProviderBase
+from core.providers.asr.vosk import ASRProvider
+import vosk
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "VOSK识别器池并发识别正确性测试"
+
+MODEL_PATH = "models/vosk/vosk-model-small-cn-0.22"
+# 两段内容不同的提示音，作为同时到达的两条语音
+UTTERANCE_FILES = ["bind_not_found.wav", "max_output_size.wav"]
+
+
+def _load_pcm(file_path):
+    """读取wav文件，转为16kHz单声道int16 PCM"""
+    with wave.open(file_path, "rb") as wf:
+        channels = wf.getnchannels()
+        rate = wf.getframerate()
+        samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+    samples = samples.reshape(-1, channels).mean(axis=1)
+    if rate != 16000:
+        target_len = int(len(samples) * 16000 / rate)
+        samples = np.interp(
+            np.linspace(0, len(samples) - 1, target_len),
+            np.arange(len(samples)),
+            samples,
+        )
+    return samples.astype(np.int16).tobytes()
+
+
+def _reference_text(model, pcm_bytes):
+    """用独立的新识别器单独识别，作为该语音的正确结果"""
+    recognizer = vosk.KaldiRecognizer(model, 16000)
+    text_result = ""
+    for i in range(0, len(pcm_bytes), 2000):
+        if recognizer.AcceptWaveform(pcm_bytes[i : i + 2000]):
+            text = json.loads(recognizer.Result()).get("text", "")
+            if text:
+                text_result += text + " "
+    final_text = json.loads(recognizer.FinalResult()).get("text", "")
+    if final_text:
+        text_result += final_text
+    return text_result.strip()
+
+
+class VoskPoolTester:
+    def __init__(self, model_path=MODEL_PATH, rounds=10):
+        self.model_path = model_path
+        self.rounds = rounds
+        self.results = []
+        self.checks = []
+
+    async def _recognize(self, asr, pcm_bytes):
+        artifacts = ASRProviderBase.AudioArtifacts(
+            pcm_frames=[pcm_bytes],
+            pcm_bytes=pcm_bytes,
+            file_path=None,
+            temp_path=None,
+        )
+        text, _ = await asr.speech_to_text([], "benchmark", "pcm", artifacts)
+        return text
+
+    def _check_recognizers_reset(self, asr):
+        """池中的识别器不应残留上一条语音的解码状态"""
+        recognizers = []
+        while not asr.recognizer_pool.empty():
+            recognizers.append(asr.recognizer_pool.get_nowait())
+        assert recognizers, "识别完成后识别器没有归还到池中"
+        for recognizer in recognizers:
+            leftover = json.loads(recognizer.FinalResult()).get("text", "")
+            assert leftover == "", f"归还的识别器未重置，残留文本: {leftover}"
+            asr.recognizer_pool.put_nowait(recognizer)
+        return len(recognizers)
+
+    async def test_concurrent_utterances(self):
+        asr = ASRProvider({"model_path": self.model_path, "output_dir": "tmp/"})
+        wav_root = os.path.join("config", "assets")
+        utterances = [_load_pcm(os.path.join(wav_root, name)) for name in UTTERANCE_FILES]
+        expected = [_reference_text(asr.model, pcm) for pcm in utterances]
+        assert all(expected), f"参考结果为空，请检查模型与测试音频: {expected}"
+        assert expected[0] != expected[1], "两段测试语音的参考结果相同，无法区分串音"
+
+        serial_ms = []
+        concurrent_ms = []
+        for _ in range(self.rounds):
+            start = time.perf_counter()
+            for pcm in utterances:
+                await self._recognize(asr, pcm)
+            serial_ms.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            texts = await asyncio.gather(
+                *(self._recognize(asr, pcm) for pcm in utterances)
+            )
+            concurrent_ms.append((time.perf_counter() - start) * 1000)
+            for name, text, expected_text in zip(UTTERANCE_FILES, texts, expected):
+                assert text == expected_text, (
+                    f"{name} 并发识别结果与单独识别不一致: {text!r} != {expected_text!r}"
+                )
+            pooled = self._check_recognizers_reset(asr)
+
+        for name, expected_text in zip(UTTERANCE_FILES, expected):
+            self.checks.append([name, expected_text, "一致"])
+        self.results.append(
+            ["依次识别两条语音", f"{np.mean(serial_ms):.0f}", f"{np.percentile(serial_ms, 90):.0f}"]
+        )
+        self.results.append(
+            ["asyncio.gather 同时识别", f"{np.mean(concurrent_ms):.0f}", f"{np.percentile(concurrent_ms, 90):.0f}"]
+        )
+        self.pooled = pooled
+
+    def print_results(self):
+        print("\nVOSK并发识别结果校验：")
+        print(
+            tabulate(
+                self.checks,
+                headers=["语音", "单独识别结果", f"{self.rounds}轮并发识别"],
+                tablefmt="grid",
+            )
+        )
+        print("\n两条语音总耗时：")
+        print(
+            tabulate(
+                self.results,
+                headers=["方式", "平均(ms)", "P90(ms)"],
+                tablefmt="grid",
+            )
+        )
+        print("\n测试说明：")
+        print(f"- 使用config/assets下的两段不同提示音，每轮同时提交两条语音，共{self.rounds}轮")
+        print("- 每条并发识别结果都与用独立识别器单独识别的结果比对，不一致即断言失败")
+        print(f"- 每轮结束后检查池中{self.pooled}个识别器均已重置，无残留解码状态")
+
+    async def run(self):
+        await self.test_concurrent_utterances()
+        self.print_results()
+
+
+async def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="VOSK识别器池并发识别正确性测试")
+    parser.add_argument("--model", default=MODEL_PATH, help="VOSK模型路径")
+    args, _ = parser.parse_known_args()
+    await VoskPoolTester(args.model).run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,292 @@
+import time
+import uuid
+import json
+import asyncio
+import logging
+import threading
+import statistics
+from types import SimpleNamespace
+from tabulate import tabulate
+from websockets.asyncio.server import serve
+from core.utils.cancel_token import CancellationToken
+from core.providers.tts import huoshan_double_stream as huoshan
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "火山双流式TTS WebSocket连接池首包时延测试"
+
+HOST = "127.0.0.1"
+PORT = 18769
+HANDSHAKE_DELAY = 0.15  # 模拟公网TLS握手与鉴权耗时（秒）
+FIRST_AUDIO_DELAY = 0.05  # 收到文本到返回首个音频包的耗时
+AUDIO_PACKETS = 10  # 每句返回的音频包数
+AUDIO_INTERVAL = 0.02
+CANCEL_ACK_DELAY = 0.2  # 收到取消会话到返回 SessionCanceled 的耗时
+
+
+def build_frame(message_type, event, session_id, payload):
+    """按火山双向流式协议组装下行帧"""
+    frame = bytearray(
+        [
+            (huoshan.PROTOCOL_VERSION << 4) | huoshan.DEFAULT_HEADER_SIZE,
+            (message_type << 4) | huoshan.MsgTypeFlagWithEvent,
+            huoshan.JSON << 4,
+            0,
+        ]
+    )
+    frame.extend(event.to_bytes(4, "big", signed=True))
+    session_bytes = session_id.encode()
+    frame.extend(len(session_bytes).to_bytes(4, "big", signed=True))
+    frame.extend(session_bytes)
+    frame.extend(len(payload).to_bytes(4, "big", signed=True))
+    frame.extend(payload)
+    return bytes(frame)
+
+
+def parse_request(message):
+    """解析上行帧，返回 (事件, 会话ID)"""
+    event = int.from_bytes(message[4:8], "big", signed=True)
+    session_id = None
+    if event >= huoshan.EVENT_StartSession:
+        size = int.from_bytes(message[8:12], "big", signed=True)
+        session_id = message[12 : 12 + size].decode()
+    return event, session_id
+
+
+class MockHuoshanServer:
+    """模拟火山双向流式TTS服务：握手有固定耗时，每个会话流式返回音频"""
+
+    def __init__(self):
+        self.handshakes = 0
+
+    async def process_request(self, connection, request):
+        self.handshakes += 1
+        await asyncio.sleep(HANDSHAKE_DELAY)
+        return None
+
+    async def _stream_audio(self, websocket, session_id, text):
+        await asyncio.sleep(FIRST_AUDIO_DELAY)
+        await websocket.send(
+            build_frame(
+                huoshan.FULL_SERVER_RESPONSE,
+                huoshan.EVENT_TTSSentenceStart,
+                session_id,
+                json.dumps({"text": text}).encode(),
+            )
+        )
+        for _ in range(AUDIO_PACKETS):
+            await websocket.send(
+                build_frame(
+                    huoshan.AUDIO_ONLY_RESPONSE,
+                    huoshan.EVENT_TTSResponse,
+                    session_id,
+                    bytes(1920),
+                )
+            )
+            await asyncio.sleep(AUDIO_INTERVAL)
+
+    async def handler(self, websocket):
+        audio_tasks = {}
+        try:
+            async for message in websocket:
+                event, session_id = parse_request(message)
+                if event == huoshan.EVENT_TaskRequest:
+                    text = json.loads(message[16 + len(session_id) :])["req_params"]["text"]
+                    audio_tasks[session_id] = asyncio.create_task(
+                        self._stream_audio(websocket, session_id, text)
+                    )
+                elif event == huoshan.EVENT_FinishSession:
+                    task = audio_tasks.pop(session_id, None)
+                    if task:
+                        await task
+                    await websocket.send(
+                        build_frame(
+                            huoshan.FULL_SERVER_RESPONSE,
+                            huoshan.EVENT_SessionFinished,
+                            session_id,
+                            b"{}",
+                        )
+                    )
+                elif event == huoshan.EVENT_CancelSession:
+                    task = audio_tasks.pop(session_id, None)
+                    if task:
+                        task.cancel()
+                    await asyncio.sleep(CANCEL_ACK_DELAY)
+                    await websocket.send(
+                        build_frame(
+                            huoshan.FULL_SERVER_RESPONSE,
+                            huoshan.EVENT_SessionCanceled,
+                            session_id,
+                            b"{}",
+                        )
+                    )
+        except Exception:
+            pass
+        finally:
+            for task in audio_tasks.values():
+                task.cancel()
+
+
+class BenchTTSProvider(huoshan.TTSProvider):
+    """记录每个会话首个音频包的到达时间，不做opus编码"""
+
+    first_audio = None
+
+    def wav_to_opus_data_audio_raw_stream(self, raw_data_var, is_end=False, callback=None):
+        if self.first_audio is not None and not self.first_audio.done():
+            self.first_audio.set_result(time.monotonic())
+
+
+class WSPoolTester:
+    def __init__(self, devices=10, turns=5):
+        self.devices = devices
+        self.turns = turns
+        self.server = MockHuoshanServer()
+        self.results = []
+        self.connection_results = []
+
+    def _new_device(self, use_pool):
+        tts = BenchTTSProvider(
+            {
+                "ws_url": f"ws://{HOST}:{PORT}",
+                "appid": "mock",
+                "access_token": "mock",
+                "resource_id": "mock",
+                "speaker": "mock",
+                "enable_ws_pool": use_pool,
+                "ws_pool_min_idle": 2,
+            },
+            delete_audio_file=True,
+        )
+        tts.conn = SimpleNamespace(
+            loop=asyncio.get_running_loop(),
+            stop_event=threading.Event(),
+            sentence_id=None,
+            turn_token=CancellationToken(),
+            client_abort=False,
+        )
+        return tts
+
+    async def _start_turn(self, tts, text):
+        """开始一轮会话并发送文本，返回开始时间"""
+        tts.conn.sentence_id = uuid.uuid4().hex
+        tts.conn.turn_token = CancellationToken()
+        tts.first_audio = asyncio.get_running_loop().create_future()
+        start_time = time.monotonic()
+        await tts.start_session(tts.conn.sentence_id)
+        await tts.text_to_speak(text, None)
+        return start_time
+
+    async def _turn(self, tts, text):
+        """完整的一轮会话，返回首包时延(ms)"""
+        start_time = await self._start_turn(tts, text)
+        latency = (await tts.first_audio - start_time) * 1000
+        await tts.finish_session(tts.conn.sentence_id)
+        await tts._session_idle.wait()
+        return latency
+
+    async def _aborted_turn(self, tts):
+        """收到首包后打断，立即开始下一轮，返回下一轮的首包时延(ms)"""
+        await self._start_turn(tts, "被打断的回答")
+        await tts.first_audio
+        tts.conn.turn_token.cancel()
+        await asyncio.sleep(0)
+        start_time = await self._start_turn(tts, "新的回答")
+        latency = (await tts.first_audio - start_time) * 1000
+        await tts.finish_session(tts.conn.sentence_id)
+        await tts._session_idle.wait()
+        return latency
+
+    def _record(self, scene, mode, latencies):
+        self.results.append(
+            [
+                scene,
+                mode,
+                f"{statistics.mean(latencies):.0f}",
+                f"{statistics.median(latencies):.0f}",
+                f"{max(latencies):.0f}",
+            ]
+        )
+
+    async def _run_mode(self, use_pool):
+        mode = "连接池" if use_pool else "连接复用（原方式）"
+        first, later, aborted = [], [], []
+        handshakes_before = self.server.handshakes
+        devices = []
+        for index in range(self.devices):
+            tts = self._new_device(use_pool)
+            if use_pool and index == 0:
+                # 服务已运行一段时间，连接池已完成预热
+                tts.ws_pool.start()
+                await asyncio.sleep(HANDSHAKE_DELAY * 3)
+                handshakes_before = self.server.handshakes
+            devices.append(tts)
+            first.append(await self._turn(tts, "你好"))
+            for _ in range(self.turns - 1):
+                later.append(await self._turn(tts, "好的"))
+            aborted.append(await self._aborted_turn(tts))
+        handshakes = self.server.handshakes - handshakes_before
+        metrics = devices[0].ws_pool.get_metrics() if use_pool else None
+        for tts in devices:
+            tts.conn.stop_event.set()
+            await tts.close()
+        self._record("新设备首次会话", mode, first)
+        self._record("同一设备后续会话", mode, later)
+        self._record("打断后立即开始新会话", mode, aborted)
+        self.connection_results.append(
+            [
+                mode,
+                self.devices * (self.turns + 2),
+                handshakes,
+                f"{metrics['reuse_rate'] * 100:.1f}%" if metrics else "-",
+            ]
+        )
+
+    async def test_pool(self):
+        await self._run_mode(False)
+        await self._run_mode(True)
+
+    def print_results(self):
+        print("\n火山双流式TTS首包时延：")
+        print(
+            tabulate(
+                self.results,
+                headers=["场景", "方式", "平均(ms)", "P50(ms)", "最大(ms)"],
+                tablefmt="grid",
+            )
+        )
+        print("\n上游连接情况：")
+        print(
+            tabulate(
+                self.connection_results,
+                headers=["方式", "会话数", "握手次数", "连接池借出复用率"],
+                tablefmt="grid",
+            )
+        )
+        print("\n测试说明：")
+        print(f"- 本地模拟火山双向流式TTS服务，握手（TLS+鉴权）耗时{HANDSHAKE_DELAY * 1000:.0f}ms，收到文本后{FIRST_AUDIO_DELAY * 1000:.0f}ms返回首包")
+        print(f"- 模拟服务收到取消会话后{CANCEL_ACK_DELAY * 1000:.0f}ms才返回 SessionCanceled")
+        print(f"- {self.devices}台设备依次连接，每台进行{self.turns}轮完整会话，再进行一次打断后立即开始的新会话")
+        print("- 首包时延：从 start_session 开始到收到首个音频包")
+        print("- 握手次数：整组测试中服务端收到的WebSocket握手数（连接池不含启动时的预热）；")
+        print("  打断后连接池直接丢弃未结束会话的连接，由后台补充新的预热连接")
+
+    async def run(self):
+        async with serve(
+            self.server.handler,
+            HOST,
+            PORT,
+            process_request=self.server.process_request,
+            max_size=None,
+        ):
+            await self.test_pool()
+        self.print_results()
+
+
+async def main():
+    await WSPoolTester().run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())